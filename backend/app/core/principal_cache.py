@@ -0,0 +1,200 @@
+# backend/app/core/principal_cache.py
+"""
+Token -> principal cache used by the get_current_user dependencies.
+
+Entries are keyed by a SHA-256 of the bearer token and hold the decoded
+claims plus a detached snapshot of the User row, so an authenticated request
+can skip both jwt.decode and the user lookup. Snapshots are merged into the
+request's session with ``load=False``, which attaches them without a query.
+
+Entries are evicted when a User row is updated or deleted. In "redis" mode
+the eviction is also published on REDIS_URL so every worker drops its copy.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.models.models import User
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "principal-cache:invalidate"
+
+
+def token_key(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def snapshot_user(user: User) -> User:
+    """Copy the column state of ``user`` into a detached, session-free instance"""
+    snapshot = User(**{column.key: getattr(user, column.key) for column in User.__table__.columns})
+    make_transient_to_detached(snapshot)
+    return snapshot
+
+
+class PrincipalCache:
+    """Bounded TTL/LRU cache of token hash -> (claims, user snapshot)"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[str, Tuple[float, Dict[str, Any], User]]" = OrderedDict()
+        self._keys_by_user: Dict[int, set] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, token: str) -> Optional[Tuple[Dict[str, Any], User]]:
+        key = token_key(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, claims, snapshot = entry
+            if expires_at <= now:
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return claims, snapshot
+
+    def put(self, token: str, claims: Dict[str, Any], user: User):
+        key = token_key(token)
+        expires_at = time.time() + self.ttl_seconds
+        # Never outlive the token itself
+        if claims.get("exp"):
+            expires_at = min(expires_at, float(claims["exp"]))
+        snapshot = snapshot_user(user)
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (expires_at, claims, snapshot)
+            self._keys_by_user.setdefault(snapshot.id, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id = entry[2].id
+        keys = self._keys_by_user.get(user_id)
+        if keys is not None:
+            keys.discard(key)
+            if not keys:
+                del self._keys_by_user[user_id]
+
+    def evict_user(self, user_id: int):
+        with self._lock:
+            for key in list(self._keys_by_user.get(user_id, ())):
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._keys_by_user.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            size = len(self._entries)
+        return {"size": size, "max_entries": self.max_entries, "hits": self.hits, "misses": self.misses}
+
+
+class RedisInvalidator:
+    """Fans user evictions out to every worker over Redis pub/sub"""
+
+    def __init__(self, cache: PrincipalCache, redis_url: str):
+        import redis
+
+        self.cache = cache
+        self._client = redis.Redis.from_url(redis_url)
+        self._thread = None
+
+    def start(self):
+        pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{INVALIDATION_CHANNEL: self._on_message})
+        self._thread = pubsub.run_in_thread(sleep_time=1.0, daemon=True)
+
+    def stop(self):
+        if self._thread is not None:
+            self._thread.stop()
+            self._thread = None
+
+    def publish(self, user_id: int):
+        try:
+            self._client.publish(INVALIDATION_CHANNEL, json.dumps({"user_id": user_id}))
+        except Exception as e:
+            # Local eviction already happened; other workers fall back to the TTL
+            logger.error(f"Principal cache invalidation publish failed: {e}")
+
+    def _on_message(self, message):
+        try:
+            self.cache.evict_user(int(json.loads(message["data"])["user_id"]))
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed principal cache invalidation: {message!r}")
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.PRINCIPAL_CACHE_TTL
+)
+_invalidator: Optional[RedisInvalidator] = None
+
+
+def start_invalidation():
+    """Subscribe to shared invalidations when PRINCIPAL_CACHE_INVALIDATION is "redis" """
+    global _invalidator
+    if settings.PRINCIPAL_CACHE_INVALIDATION == "redis" and _invalidator is None:
+        _invalidator = RedisInvalidator(principal_cache, settings.REDIS_URL)
+        _invalidator.start()
+
+
+def stop_invalidation():
+    global _invalidator
+    if _invalidator is not None:
+        _invalidator.stop()
+        _invalidator = None
+
+
+def invalidate_user(user_id: int):
+    """Drop cached principals for ``user_id`` here and, if shared, on every worker"""
+    principal_cache.evict_user(user_id)
+    if _invalidator is not None:
+        _invalidator.publish(user_id)
+
+
+# Evict on commit rather than flush so a concurrent request cannot re-cache
+# the pre-commit row between the two.
+@event.listens_for(Session, "after_flush")
+def _collect_changed_users(session, flush_context):
+    changed = session.info.setdefault("principal_cache_users", set())
+    for obj in session.dirty:
+        # Membership appends touch User collections; only column changes matter
+        if isinstance(obj, User) and session.is_modified(obj, include_collections=False):
+            changed.add(obj.id)
+    for obj in session.deleted:
+        if isinstance(obj, User):
+            changed.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_changed_users(session):
+    for user_id in session.info.pop("principal_cache_users", ()):
+        invalidate_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_changed_users(session):
+    session.info.pop("principal_cache_users", None)
@@ -1,6 +1,12 @@
 # backend/app/core/security.py
 from datetime import datetime, timedelta
-from typing import Any, Union
+from typing import Any, Callable, Dict, Union
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import math
+import threading
+import time
 from jose import jwt
 from passlib.context import CryptContext
 from app.core.config import settings
@@ -26,6 +32,94 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
 def get_password_hash(password: str) -> str:
     return pwd_context.hash(password)
 
+class HashingPoolFull(Exception):
+    """Raised when the password hashing queue is at capacity"""
+
+class PasswordHashingPool:
+    """Bounded executor for bcrypt work.
+
+    bcrypt is deliberately slow, so running it on the shared request
+    threadpool lets a burst of logins starve every other endpoint. Jobs run
+    on a dedicated pool of ``max_workers`` threads; once ``max_queue`` jobs
+    are already waiting, new ones are rejected with HashingPoolFull.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, sample_size: int = 1000):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._running = 0
+        self._completed = 0
+        self._rejected = 0
+        self._durations = deque(maxlen=sample_size)
+
+    async def run(self, func: Callable, *args):
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self._rejected += 1
+                raise HashingPoolFull()
+            self._pending += 1
+        try:
+            future = self._executor.submit(self._timed, func, *args)
+        except BaseException:
+            self._release(None)
+            raise
+        # The slot is held until the job itself is done: a cancelled waiter
+        # only cancels a job that has not started, a running one keeps its slot
+        future.add_done_callback(self._release)
+        return await asyncio.wrap_future(future)
+
+    def _release(self, future):
+        with self._lock:
+            self._pending -= 1
+
+    def _timed(self, func: Callable, *args):
+        with self._lock:
+            self._running += 1
+        start = time.perf_counter()
+        try:
+            return func(*args)
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self._running -= 1
+                self._completed += 1
+                self._durations.append(elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            durations = sorted(self._durations)
+            running = self._running
+            queued = self._pending - self._running
+            completed = self._completed
+            rejected = self._rejected
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "running": running,
+            "queued": max(queued, 0),
+            "completed": completed,
+            "rejected": rejected,
+            "avg_ms": round(sum(durations) / len(durations) * 1000, 2) if durations else 0,
+            "p95_ms": round(durations[max(0, math.ceil(0.95 * len(durations)) - 1)] * 1000, 2) if durations else 0,
+        }
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False)
+
+password_hashing_pool = PasswordHashingPool(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE
+)
+
+async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+    return await password_hashing_pool.run(verify_password, plain_password, hashed_password)
+
+async def get_password_hash_async(password: str) -> str:
+    return await password_hashing_pool.run(get_password_hash, password)
+
 def validate_password(password: str) -> bool:
     """Validate password meets security requirements"""
     if len(password) < settings.PASSWORD_MIN_LENGTH:
@@ -0,0 +1,31 @@
+# backend/app/db/async_session.py
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from app.core.config import settings
+
+# Async drivers used in place of the sync DBAPI named in DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+def get_async_database_url(url: str) -> str:
+    """Rewrite a sync database URL to use the matching async driver"""
+    scheme, separator, rest = url.partition("://")
+    dialect = scheme.split("+")[0]
+    if dialect in ASYNC_DRIVERS:
+        return f"{ASYNC_DRIVERS[dialect]}{separator}{rest}"
+    return url
+
+ASYNC_DATABASE_URL = settings.ASYNC_DATABASE_URL or get_async_database_url(settings.DATABASE_URL)
+
+if ASYNC_DATABASE_URL.startswith("sqlite"):
+    async_engine = create_async_engine(ASYNC_DATABASE_URL)
+else:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        pool_size=10,
+        max_overflow=20
+    )
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
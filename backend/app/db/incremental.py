@@ -0,0 +1,45 @@
+# backend/app/db/incremental.py
+"""
+Helpers shared by the counters and rollups that are maintained by delta.
+
+Flush listeners work out what a row counted as before a change from its
+attribute history, which only holds the replaced value if the attribute has
+active history; track_previous_values turns that on, once per attribute
+however many modules ask for it. UPSERTS maps a dialect to its INSERT ...
+ON CONFLICT construct; other dialects fall back to UPDATE, then INSERT.
+"""
+
+from typing import Set, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.dialects.postgresql import insert as postgresql_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+
+UPSERTS = {"postgresql": postgresql_insert, "sqlite": sqlite_insert}
+
+_tracked: Set[Tuple[type, str]] = set()
+
+
+def _load_previous_value(target, value, oldvalue, initiator):
+    pass
+
+
+def track_previous_values(*attributes):
+    """Make assignment to ``attributes`` load the value it replaces"""
+    for attribute in attributes:
+        # (class, name): instrumented attributes overload == to build SQL
+        key = (attribute.class_, attribute.key)
+        if key in _tracked:
+            continue
+        _tracked.add(key)
+        event.listen(attribute, "set", _load_previous_value, active_history=True)
+
+
+def scalar_before_after(state, key: str):
+    history = state.attrs[key].history
+    if history.has_changes():
+        before = history.deleted[0] if history.deleted else None
+        after = history.added[0] if history.added else None
+        return before, after
+    value = getattr(state.obj(), key)
+    return value, value
@@ -0,0 +1,167 @@
+# backend/app/db/pagination.py
+"""
+Keyset (cursor) pagination.
+
+A page is requested with an opaque cursor that encodes the sort key of the
+last row the client saw. The next page is everything strictly after that key
+in the same order, so each page costs one index range scan, however deep the
+client has paged.
+
+The sort key must end with a unique column (normally the primary key) so the
+order is total. Columns may be wrapped in desc():
+
+    items, next_cursor = paginate(query, [Task.position, Task.created_at, Task.id], cursor, limit)
+"""
+
+import base64
+import json
+from datetime import date, datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import DateTime, and_, bindparam, or_
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql import operators
+from sqlalchemy.sql.elements import UnaryExpression
+from sqlalchemy.sql.functions import FunctionElement
+
+from app.core.config import settings
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded for the requested sort key"""
+
+
+def page_size(limit: Optional[int]) -> int:
+    """Clamp a client-supplied page size to the server maximum"""
+    if not limit or limit < 1:
+        return settings.DEFAULT_PAGE_SIZE
+    return min(limit, settings.MAX_PAGE_SIZE)
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    if isinstance(value, date):
+        return {"d": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict):
+        if "dt" in value:
+            return datetime.fromisoformat(value["dt"])
+        if "d" in value:
+            return date.fromisoformat(value["d"])
+        raise InvalidCursor("Unknown cursor value")
+    return value
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([_encode_value(v) for v in values], separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_count: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+    if not isinstance(values, list) or len(values) != key_count:
+        raise InvalidCursor("Cursor does not match this listing")
+    try:
+        return [_decode_value(v) for v in values]
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Malformed cursor") from e
+
+
+def _unwrap(key) -> Tuple[Any, bool]:
+    """Split an order key into (column, descending)"""
+    if isinstance(key, UnaryExpression) and key.modifier is operators.desc_op:
+        return key.element, True
+    if isinstance(key, UnaryExpression) and key.modifier is operators.asc_op:
+        return key.element, False
+    return key, False
+
+
+class comparable_time(FunctionElement):
+    """A datetime as keyset paging compares and orders it.
+
+    SQLite stores datetimes as text, and not uniformly: server_default
+    CURRENT_TIMESTAMP gives "...:52", a bound Python datetime "...:52.000000".
+    Compared as text, a cursor taken from the first never equals the row it
+    came from, and rows sharing its second are skipped. There the value is
+    compared as a julianday number; elsewhere it is the column itself.
+    """
+    name = "comparable_time"
+    type = DateTime()
+    inherit_cache = True
+
+
+@compiles(comparable_time)
+def _compile_comparable_time(element, compiler, **kw):
+    return compiler.process(element.clauses, **kw)
+
+
+@compiles(comparable_time, "sqlite")
+def _compile_comparable_time_sqlite(element, compiler, **kw):
+    return f"julianday({compiler.process(element.clauses, **kw)})"
+
+
+def _comparable(column, value=None):
+    """``column`` and the cursor ``value`` in the form they are compared and ordered in"""
+    if not isinstance(getattr(column, "type", None), DateTime):
+        return column, value
+    return comparable_time(column), comparable_time(bindparam(None, value, type_=column.type))
+
+
+def _attribute_name(column) -> str:
+    return getattr(column, "key", None) or column.name
+
+
+def after_key(keys: Sequence, values: Sequence[Any]):
+    """WHERE clause selecting rows that sort strictly after ``values``.
+
+    Expanded to (a > x) OR (a = x AND b > y) OR ... rather than a row-value
+    comparison so mixed ASC/DESC keys work on every backend.
+    """
+    compared = [(*_comparable(_unwrap(key)[0], value), _unwrap(key)[1]) for key, value in zip(keys, values)]
+    clauses = []
+    for i, (column, value, descending) in enumerate(compared):
+        equal_prefix = [c == v for c, v, _ in compared[:i]]
+        step = column < value if descending else column > value
+        clauses.append(and_(*equal_prefix, step))
+    return or_(*clauses)
+
+
+def key_values(item: Any, keys: Sequence) -> List[Any]:
+    return [getattr(item, _attribute_name(_unwrap(key)[0])) for key in keys]
+
+
+def apply_keyset(statement, keys: Sequence, cursor: Optional[str], limit: int):
+    """Add ordering, the cursor predicate and LIMIT to a Query or Select.
+
+    One extra row is fetched so the caller can tell whether a next page exists.
+    """
+    ordering = []
+    for key in keys:
+        column, descending = _unwrap(key)
+        column, _ = _comparable(column)
+        ordering.append(column.desc() if descending else column.asc())
+    if cursor:
+        statement = statement.filter(after_key(keys, decode_cursor(cursor, len(keys))))
+    return statement.order_by(*ordering).limit(limit + 1)
+
+
+def build_page(rows: List[Any], keys: Sequence, limit: int) -> Tuple[List[Any], Optional[str]]:
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(key_values(rows[-1], keys))
+
+
+def paginate(query, keys: Sequence, cursor: Optional[str], limit: int) -> Tuple[List[Any], Optional[str]]:
+    """Run a legacy ``Session.query`` one page at a time"""
+    rows = apply_keyset(query, keys, cursor, limit).all()
+    return build_page(rows, keys, limit)
+
@@ -9,29 +9,55 @@ from fastapi import (
     status,
     UploadFile,
     File,
+    Query,
+    BackgroundTasks,
+    Request,
 )
 from fastapi.security import OAuth2PasswordBearer, OAuth2PasswordRequestForm
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.staticfiles import StaticFiles
-from fastapi.responses import JSONResponse
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_, or_, desc, func, text
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse, StreamingResponse
+from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy import or_, desc, func, text, select
+from sqlalchemy.exc import IntegrityError
 from jose import JWTError, jwt
-from datetime import datetime, timedelta
+from datetime import datetime
 from typing import List, Optional, Dict, Any
+from collections import defaultdict
 import asyncio
 import json
 import logging
 import os
-import uuid
-import aiofiles
 from pathlib import Path
 
 from app.models import models
 from app.schemas import schemas
 from app.core.config import settings
-from app.core.security import verify_password, get_password_hash, create_access_token, validate_password
+from app.core.security import (
+    get_password_hash, create_access_token, validate_password,
+    verify_password_async, get_password_hash_async, password_hashing_pool, HashingPoolFull)
 from app.db.session import SessionLocal, engine
+from app.db.async_session import AsyncSessionLocal
+from app.db.pagination import InvalidCursor, page_size, paginate
+from app.core.principal_cache import principal_cache, start_invalidation, stop_invalidation
+from app.services.activity_log import activity_buffer, activity_entry
+from app.services.attachment_download import AttachmentFileResponse
+from app.services.attachment_storage import FileTooLarge, blob_path, receive_upload
+from app.services.notifications import insert_notifications, notification_recipients
+from app.services.realtime import manager, task_events
+from app.services.task_summary import get_task_summary
+from app.services import task_hours  # noqa: F401 -- keeps Task.actual_hours in step with time entries
+from app.services.thumbnails import THUMBNAIL_CONTENT_TYPE, has_thumbnails, pick_size, thumbnail_path, thumbnail_pool
+from app.services.project_analytics import project_analytics
+from app.services.task_export import MEDIA_TYPES, resume_after, stream_export
+from app.services.dependency_graph import find_cycle_async, validate_edges
+from app.services.task_readiness import blocker_chain, get_readiness, invalidate_readiness
+from app.services.bulk_tasks import bulk_create, bulk_delete, bulk_update
+from app.services.search import (
+    TARGETS as SEARCH_TARGETS, decode_offset, encode_offset, init_search, search as full_text_search)
+from app.services.access import (
+    can_access_project, can_access_workspace, can_access_project_async, can_access_workspace_async)
 
 
 # Import all models
@@ -78,42 +104,6 @@ app.add_middleware(
 upload_dir = Path(settings.UPLOAD_FOLDER)
 upload_dir.mkdir(exist_ok=True)
 
-# Serve uploaded files
-app.mount("/uploads", StaticFiles(directory=settings.UPLOAD_FOLDER), name="uploads")
-
-# WebSocket connection manager
-class ConnectionManager:
-    def __init__(self):
-        self.active_connections: Dict[str, List[WebSocket]] = {}
-
-    async def connect(self, websocket: WebSocket, room: str):
-        await websocket.accept()
-        if room not in self.active_connections:
-            self.active_connections[room] = []
-        self.active_connections[room].append(websocket)
-
-    def disconnect(self, websocket: WebSocket, room: str):
-        if room in self.active_connections:
-            if websocket in self.active_connections[room]:
-                self.active_connections[room].remove(websocket)
-            if not self.active_connections[room]:
-                del self.active_connections[room]
-
-    async def broadcast_to_room(self, message: dict, room: str):
-        if room in self.active_connections:
-            disconnected = []
-            for connection in self.active_connections[room]:
-                try:
-                    await connection.send_text(json.dumps(message))
-                except:
-                    disconnected.append(connection)
-            
-            # Remove disconnected connections
-            for conn in disconnected:
-                self.disconnect(conn, room)
-
-manager = ConnectionManager()
-
 # Database dependency
 def get_db():
     db = SessionLocal()
@@ -122,72 +112,96 @@ def get_db():
     finally:
         db.close()
 
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
 # Authentication dependencies
-async def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-    credentials_exception = HTTPException(
+def credentials_exception():
+    return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
         headers={"WWW-Authenticate": "Bearer"},
     )
+
+def decode_token(token: str) -> Dict[str, Any]:
+    """Decode an access token and make sure it names a user"""
     try:
         payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
         username: str = payload.get("sub")
         if username is None:
-            raise credentials_exception
+            raise credentials_exception()
     except JWTError:
-        raise credentials_exception
+        raise credentials_exception()
+    return payload
+
+def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return db.merge(cached[1], load=False)
     
-    user = db.query(User).filter(User.username == username).first()
+    payload = decode_token(token)
+    user = db.query(User).filter(User.username == payload["sub"]).first()
     if user is None:
-        raise credentials_exception
+        raise credentials_exception()
+    principal_cache.put(token, payload, user)
     return user
 
-def authenticate_user(db: Session, username: str, password: str):
-    user = db.query(User).filter(
+async def get_current_user_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    """Same as get_current_user, but loads the user through the request's AsyncSession"""
+    cached = principal_cache.get(token)
+    if cached is not None:
+        return await db.merge(cached[1], load=False)
+    
+    payload = decode_token(token)
+    result = await db.execute(select(User).where(User.username == payload["sub"]))
+    user = result.scalar_one_or_none()
+    if user is None:
+        raise credentials_exception()
+    principal_cache.put(token, payload, user)
+    return user
+
+async def authenticate_user(db: AsyncSession, username: str, password: str):
+    result = await db.execute(select(User).where(
         or_(User.username == username, User.email == username)
-    ).first()
+    ))
+    user = result.scalars().first()
     if not user:
         return False
-    if not verify_password(password, user.hashed_password):
+    if not await verify_password_async(password, user.hashed_password):
         return False
     return user
 
-async def log_activity(db: Session, user_id: int, action: str, entity_type: str, entity_id: int, old_value=None, new_value=None):
-    """Log user activity"""
-    activity = ActivityLog(
-        action=action,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        user_id=user_id,
-        old_value=old_value,
-        new_value=new_value
-    )
-    db.add(activity)
-    db.commit()
-
-async def create_notification(db: Session, user_id: int, title: str, message: str, entity_type: str = None, entity_id: int = None, action_url: str = None):
-    """Create a notification for a user"""
-    notification = Notification(
-        title=title,
-        message=message,
-        user_id=user_id,
-        entity_type=entity_type,
-        entity_id=entity_id,
-        action_url=action_url
-    )
-    db.add(notification)
-    db.commit()
-    
-    # Send real-time notification
-    await manager.broadcast_to_room({
-        "type": "notification",
-        "data": {
-            "id": notification.id,
-            "title": title,
-            "message": message,
-            "created_at": notification.created_at.isoformat()
-        }
-    }, f"user_{user_id}")
+async def to_response(db: AsyncSession, schema, obj):
+    """Validate an ORM object against ``schema`` inside the session's greenlet.
+
+    Response schemas walk relationships (owner, members, subtasks, ...) that
+    are not eagerly loaded; run_sync lets those lazy loads happen without
+    tripping the AsyncSession's implicit-IO guard.
+    """
+    return await db.run_sync(lambda _: schema.model_validate(obj))
+
+async def log_activity(user_id: int, action: str, entity_type: str, entity_id: int, old_value=None, new_value=None):
+    """Queue a user activity entry; written in batches by the activity buffer"""
+    await activity_buffer.put(activity_entry(
+        user_id, action, entity_type, entity_id,
+        old_values=json.dumps(old_value, default=str) if old_value is not None else None,
+        new_values=json.dumps(new_value, default=str) if new_value is not None else None
+    ))
+
+async def push_notifications(notifications: List[Dict[str, Any]]):
+    """Send each notification to its recipient's room, concurrently; call after commit"""
+    await asyncio.gather(*(
+        manager.broadcast_to_room({"type": "notification", "data": notification}, f"user_{notification['recipient_id']}")
+        for notification in notifications
+    ))
+
+async def fan_out_notifications(recipient_ids: List[int], *args, **kwargs):
+    """Insert and push a large fan-out on its own session, as a background task"""
+    async with AsyncSessionLocal() as db:
+        notifications = await insert_notifications(db, recipient_ids, *args, **kwargs)
+        await db.commit()
+    await push_notifications(notifications)
 
 # Create default account on startup
 @app.on_event("startup")
@@ -240,14 +254,52 @@ def create_default_user():
     finally:
         db.close()
 
+@app.on_event("startup")
+def start_principal_cache_invalidation():
+    start_invalidation()
+
+@app.on_event("startup")
+def select_search_backend():
+    # Only detects the index; migrate_database.py creates it
+    init_search(engine)
+
+@app.on_event("startup")
+async def start_activity_buffer():
+    activity_buffer.start()
+
+@app.on_event("shutdown")
+async def flush_activity_buffer():
+    await activity_buffer.stop()
+
+@app.on_event("startup")
+async def start_websocket_backplane():
+    await manager.start()
+
+@app.on_event("shutdown")
+async def stop_websocket_backplane():
+    await task_events.flush_all()
+    await manager.stop()
+
+@app.on_event("shutdown")
+def shutdown_password_hashing_pool():
+    password_hashing_pool.shutdown()
+
+@app.on_event("shutdown")
+def shutdown_thumbnail_pool():
+    thumbnail_pool.shutdown()
+
+@app.on_event("shutdown")
+def stop_principal_cache_invalidation():
+    stop_invalidation()
+
 # ========== AUTHENTICATION ENDPOINTS ==========
 
 @app.post("/api/v1/auth/register", response_model=schemas.User)
-def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
+async def register(user: schemas.UserCreate, db: AsyncSession = Depends(get_async_db)):
     # Check if user exists
-    if db.query(User).filter(User.email == user.email).first():
+    if (await db.execute(select(User.id).where(User.email == user.email))).first():
         raise HTTPException(status_code=400, detail="Email already registered")
-    if db.query(User).filter(User.username == user.username).first():
+    if (await db.execute(select(User.id).where(User.username == user.username))).first():
         raise HTTPException(status_code=400, detail="Username already taken")
     
     # Validate password
@@ -258,7 +310,7 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
         )
     
     # Create user
-    hashed_password = get_password_hash(user.password)
+    hashed_password = await get_password_hash_async(user.password)
     db_user = User(
         email=user.email,
         username=user.username,
@@ -266,14 +318,14 @@ def register(user: schemas.UserCreate, db: Session = Depends(get_db)):
         hashed_password=hashed_password
     )
     db.add(db_user)
-    db.commit()
-    db.refresh(db_user)
+    await db.commit()
+    await db.refresh(db_user)
     
     return db_user
 
 @app.post("/api/v1/auth/token", response_model=schemas.Token)
-def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depends(get_db)):
-    user = authenticate_user(db, form_data.username, form_data.password)
+async def login(form_data: OAuth2PasswordRequestForm = Depends(), db: AsyncSession = Depends(get_async_db)):
+    user = await authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -283,7 +335,7 @@ def login(form_data: OAuth2PasswordRequestForm = Depends(), db: Session = Depend
     
     # Update last login
     user.last_login = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     access_token = create_access_token(subject=user.username)
     return {"access_token": access_token, "token_type": "bearer"}
@@ -324,48 +376,7 @@ def get_dashboard(current_user: User = Depends(get_current_user), db: Session =
     ).order_by(desc(Task.updated_at)).limit(10).all()
     
     # Get task summary
-    total_tasks = db.query(Task).filter(
-        or_(
-            Task.creator_id == current_user.id,
-            Task.assignees.any(User.id == current_user.id)
-        ),
-        Task.is_active == True
-    ).count()
-    
-    completed_tasks = db.query(Task).filter(
-        or_(
-            Task.creator_id == current_user.id,
-            Task.assignees.any(User.id == current_user.id)
-        ),
-        Task.status == TaskStatus.DONE,
-        Task.is_active == True
-    ).count()
-    
-    in_progress_tasks = db.query(Task).filter(
-        or_(
-            Task.creator_id == current_user.id,
-            Task.assignees.any(User.id == current_user.id)
-        ),
-        Task.status == TaskStatus.IN_PROGRESS,
-        Task.is_active == True
-    ).count()
-    
-    overdue_tasks = db.query(Task).filter(
-        or_(
-            Task.creator_id == current_user.id,
-            Task.assignees.any(User.id == current_user.id)
-        ),
-        Task.due_date < datetime.utcnow(),
-        Task.status != TaskStatus.DONE,
-        Task.is_active == True
-    ).count()
-    
-    task_summary = schemas.TaskSummary(
-        total_tasks=total_tasks,
-        completed_tasks=completed_tasks,
-        in_progress_tasks=in_progress_tasks,
-        overdue_tasks=overdue_tasks
-    )
+    task_summary = schemas.TaskSummary(**get_task_summary(db, current_user.id))
     
     return schemas.DashboardData(
         workspaces=workspaces,
@@ -377,22 +388,20 @@ def get_dashboard(current_user: User = Depends(get_current_user), db: Session =
 # ========== WORKSPACE ENDPOINTS ==========
 
 @app.post("/api/v1/workspaces/", response_model=schemas.Workspace)
-async def create_workspace(workspace: schemas.WorkspaceCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_workspace(workspace: schemas.WorkspaceCreate, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
     db_workspace = Workspace(
         **workspace.dict(),
         owner_id=current_user.id
     )
-    db.add(db_workspace)
-    db.commit()
-    db.refresh(db_workspace)
-    
     # Add creator as member
     db_workspace.members.append(current_user)
-    db.commit()
-    
-    await log_activity(db, current_user.id, "created", "workspace", db_workspace.id)
-    
-    return db_workspace
+    db.add(db_workspace)
+    await db.commit()
+    await db.refresh(db_workspace)
+
+    await log_activity(current_user.id, "created", "workspace", db_workspace.id)
+
+    return await to_response(db, schemas.Workspace, db_workspace)
 
 @app.get("/api/v1/workspaces/", response_model=List[schemas.Workspace])
 def read_workspaces(current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -417,7 +426,7 @@ def read_workspace(workspace_id: int, current_user: User = Depends(get_current_u
         raise HTTPException(status_code=404, detail="Workspace not found")
     
     # Check if user is member
-    if current_user not in workspace.members and workspace.owner_id != current_user.id:
+    if not can_access_workspace(db, workspace_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this workspace")
     
     return workspace
@@ -425,24 +434,21 @@ def read_workspace(workspace_id: int, current_user: User = Depends(get_current_u
 # ========== PROJECT ENDPOINTS ==========
 
 @app.post("/api/v1/projects/", response_model=schemas.Project)
-async def create_project(project: schemas.ProjectCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_project(project: schemas.ProjectCreate, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
     # Check workspace access
-    workspace = db.query(Workspace).filter(Workspace.id == project.workspace_id).first()
-    if not workspace or (current_user not in workspace.members and workspace.owner_id != current_user.id):
+    if not await can_access_workspace_async(db, project.workspace_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this workspace")
-    
+
     db_project = Project(
         **project.dict(),
         owner_id=current_user.id
     )
-    db.add(db_project)
-    db.commit()
-    db.refresh(db_project)
-    
     # Add creator as member
     db_project.members.append(current_user)
-    db.commit()
-    
+    db.add(db_project)
+    await db.commit()
+    await db.refresh(db_project)
+
     # Create default task lists
     default_lists = [
         {"name": "To Do", "position": 0, "color": "#6b7280"},
@@ -460,11 +466,11 @@ async def create_project(project: schemas.ProjectCreate, current_user: User = De
         )
         db.add(task_list)
     
-    db.commit()
+    await db.commit()
     
-    await log_activity(db, current_user.id, "created", "project", db_project.id)
+    await log_activity(current_user.id, "created", "project", db_project.id)
     
-    return db_project
+    return await to_response(db, schemas.Project, db_project)
 
 @app.get("/api/v1/projects/", response_model=List[schemas.Project])
 def read_projects(workspace_id: Optional[int] = None, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -496,34 +502,52 @@ def read_project(project_id: int, current_user: User = Depends(get_current_user)
         raise HTTPException(status_code=404, detail="Project not found")
     
     # Check access
-    if current_user not in project.members and project.owner_id != current_user.id:
+    if not can_access_project(db, project_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this project")
     
     return project
 
+@app.get("/api/v1/projects/{project_id}/tasks/export")
+def export_project_tasks(
+    project_id: int,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    resume_token: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    # Check access
+    if not can_access_project(db, project_id, current_user.id):
+        raise HTTPException(status_code=403, detail="Not a member of this project")
+    
+    after_id = resume_after(resume_token)
+    
+    return StreamingResponse(
+        stream_export(SessionLocal, project_id, after_id, format),
+        media_type=MEDIA_TYPES[format],
+        headers={"Content-Disposition": f'attachment; filename="project-{project_id}-tasks.{format}"'}
+    )
+
 # ========== TASK LIST ENDPOINTS ==========
 
 @app.post("/api/v1/task-lists/", response_model=schemas.TaskList)
-async def create_task_list(task_list: schemas.TaskListCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_task_list(task_list: schemas.TaskListCreate, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
     # Check project access
-    project = db.query(Project).filter(Project.id == task_list.project_id).first()
-    if not project or (current_user not in project.members and project.owner_id != current_user.id):
+    if not await can_access_project_async(db, task_list.project_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this project")
     
     db_task_list = TaskList(**task_list.dict())
     db.add(db_task_list)
-    db.commit()
-    db.refresh(db_task_list)
+    await db.commit()
+    await db.refresh(db_task_list)
     
-    await log_activity(db, current_user.id, "created", "task_list", db_task_list.id)
+    await log_activity(current_user.id, "created", "task_list", db_task_list.id)
     
     return db_task_list
 
 @app.get("/api/v1/task-lists/", response_model=List[schemas.TaskList])
 def read_task_lists(project_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     # Check project access
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project or (current_user not in project.members and project.owner_id != current_user.id):
+    if not can_access_project(db, project_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this project")
     
     return db.query(TaskList).filter(
@@ -533,11 +557,16 @@ def read_task_lists(project_id: int, current_user: User = Depends(get_current_us
 
 # ========== TASK ENDPOINTS ==========
 
+# Keyset sort orders for paginated listings; each ends with the primary key
+TASK_PAGE_KEYS = [Task.position, Task.created_at, Task.id]
+TIME_ENTRY_PAGE_KEYS = [desc(TimeEntry.date), desc(TimeEntry.id)]
+COMMENT_PAGE_KEYS = [Comment.created_at, Comment.id]
+ATTACHMENT_PAGE_KEYS = [desc(Attachment.created_at), desc(Attachment.id)]
+
 @app.post("/api/v1/tasks/", response_model=schemas.Task)
-async def create_task(task: schemas.TaskCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_task(task: schemas.TaskCreate, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
     # Check project access
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-    if not project or (current_user not in project.members and project.owner_id != current_user.id):
+    if not await can_access_project_async(db, task.project_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this project")
     
     # Create task
@@ -548,57 +577,61 @@ async def create_task(task: schemas.TaskCreate, current_user: User = Depends(get
         **task_data,
         creator_id=current_user.id
     )
-    db.add(db_task)
-    db.commit()
-    db.refresh(db_task)
     
     # Add assignees
+    assignees = []
     if assignee_ids:
-        assignees = db.query(User).filter(User.id.in_(assignee_ids)).all()
+        result = await db.execute(select(User).where(User.id.in_(assignee_ids)))
+        assignees = result.scalars().all()
         db_task.assignees.extend(assignees)
-        db.commit()
-    
-    await log_activity(db, current_user.id, "created", "task", db_task.id)
-    
-    # Notify assignees
-    for assignee in db_task.assignees:
-        if assignee.id != current_user.id:
-            await create_notification(
-                db, assignee.id,
-                "New task assigned",
-                f"{current_user.full_name} assigned you to '{db_task.title}'",
-                "task", db_task.id,
-                f"/project/{project.id}?task={db_task.id}"
-            )
+    
+    db.add(db_task)
+    await db.flush()
+    
+    # Notify assignees in the same transaction, pushed once committed
+    notifications = await insert_notifications(
+        db, notification_recipients(assignees, exclude=current_user.id),
+        "New task assigned",
+        f"{current_user.full_name} assigned you to '{db_task.title}'",
+        "task_assigned", "task", db_task.id,
+        f"/project/{db_task.project_id}?task={db_task.id}"
+    )
+    await db.commit()
+    await db.refresh(db_task)
+    
+    await log_activity(current_user.id, "created", "task", db_task.id)
+    await push_notifications(notifications)
     
     # Broadcast to project room
     await manager.broadcast_to_room({
         "type": "task_created",
-        "data": {"task_id": db_task.id, "project_id": project.id}
-    }, f"project_{project.id}")
+        "data": {"task_id": db_task.id, "project_id": db_task.project_id}
+    }, f"project_{db_task.project_id}")
     
-    return db_task
+    return await to_response(db, schemas.Task, db_task)
 
-@app.get("/api/v1/tasks/", response_model=List[schemas.Task])
+@app.get("/api/v1/tasks/", response_model=schemas.Page[schemas.Task])
 def read_tasks(
     project_id: Optional[int] = None,
     task_list_id: Optional[int] = None,
     assignee_id: Optional[int] = None,
     status: Optional[TaskStatus] = None,
     priority: Optional[TaskPriority] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
+    # Collections are selectin-loaded so LIMIT applies to tasks, not joined rows
     query = db.query(Task).filter(Task.is_active == True).options(
         joinedload(Task.creator),
-        joinedload(Task.assignees),
-        joinedload(Task.watchers)
+        selectinload(Task.assignees),
+        selectinload(Task.watchers)
     )
     
     if project_id:
         # Check project access
-        project = db.query(Project).filter(Project.id == project_id).first()
-        if not project or (current_user not in project.members and project.owner_id != current_user.id):
+        if not can_access_project(db, project_id, current_user.id):
             raise HTTPException(status_code=403, detail="Not a member of this project")
         query = query.filter(Task.project_id == project_id)
     else:
@@ -620,7 +653,8 @@ def read_tasks(
     if priority:
         query = query.filter(Task.priority == priority)
     
-    return query.order_by(Task.position, Task.created_at).all()
+    items, next_cursor = paginate(query, TASK_PAGE_KEYS, cursor, page_size(limit))
+    return {"items": items, "next_cursor": next_cursor}
 
 @app.get("/api/v1/tasks/{task_id}", response_model=schemas.Task)
 def read_task(task_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
@@ -635,21 +669,22 @@ def read_task(task_id: int, current_user: User = Depends(get_current_user), db:
         raise HTTPException(status_code=404, detail="Task not found")
     
     # Check access
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-    if not project or (current_user not in project.members and project.owner_id != current_user.id):
+    if not can_access_project(db, task.project_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this project")
     
     return task
 
 @app.put("/api/v1/tasks/{task_id}", response_model=schemas.Task)
-async def update_task(task_id: int, task_update: schemas.TaskUpdate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    task = db.query(Task).filter(Task.id == task_id).first()
+async def update_task(task_id: int, task_update: schemas.TaskUpdate, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(
+        select(Task).where(Task.id == task_id).options(selectinload(Task.assignees))
+    )
+    task = result.scalar_one_or_none()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
     # Check access
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-    if not project or (current_user not in project.members and project.owner_id != current_user.id):
+    if not await can_access_project_async(db, task.project_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this project")
 
     
@@ -672,8 +707,8 @@ async def update_task(task_id: int, task_update: schemas.TaskUpdate, current_use
     if assignee_ids is not None:
         task.assignees.clear()
         if assignee_ids:
-            assignees = db.query(User).filter(User.id.in_(assignee_ids)).all()
-            task.assignees.extend(assignees)
+            result = await db.execute(select(User).where(User.id.in_(assignee_ids)))
+            task.assignees.extend(result.scalars().all())
     
     # Set completion time
     if task.status == TaskStatus.DONE and not task.completed_at:
@@ -682,37 +717,37 @@ async def update_task(task_id: int, task_update: schemas.TaskUpdate, current_use
         task.completed_at = None
     
     task.updated_at = datetime.utcnow()
-    db.commit()
-    db.refresh(task)
     
-    # Log activity
+    # Collected before commit so the assignee collection need not be reloaded
     new_values = {
         "title": task.title,
         "status": task.status,
         "priority": task.priority,
         "assignees": [a.id for a in task.assignees]
     }
-    await log_activity(db, current_user.id, "updated", "task", task.id, old_values, new_values)
     
-    # Broadcast update
-    await manager.broadcast_to_room({
-        "type": "task_updated",
-        "data": {"task_id": task.id, "project_id": task.project_id}
-    }, f"project_{task.project_id}")
+    await db.commit()
+    await db.refresh(task)
     
-    return task
+    # Log activity
+    await log_activity(current_user.id, "updated", "task", task.id, old_values, new_values)
+    
+    # Coalesced with other updates to the project's tasks (drag-and-drop bursts)
+    kinds = list(update_data) + (["assignees"] if assignee_ids is not None else [])
+    await task_events.add(f"project_{task.project_id}", {task.id: kinds or ["updated"]}, project_id=task.project_id)
+    
+    return await to_response(db, schemas.Task, task)
 
 # ========== TIME TRACKING ENDPOINTS ==========
 
 @app.post("/api/v1/time-entries/", response_model=schemas.TimeEntry)
-async def create_time_entry(time_entry: schemas.TimeEntryCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_time_entry(time_entry: schemas.TimeEntryCreate, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
     # Check task access
-    task = db.query(Task).filter(Task.id == time_entry.task_id).first()
+    task = await db.get(Task, time_entry.task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
 
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-    if not project or (current_user not in project.members and project.owner_id != current_user.id):
+    if not await can_access_project_async(db, task.project_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this project")
 
     db_time_entry = TimeEntry(
@@ -721,25 +756,22 @@ async def create_time_entry(time_entry: schemas.TimeEntryCreate, current_user: U
     )
     db.add(db_time_entry)
     
-    # Update task actual hours
-    total_hours = db.query(func.sum(TimeEntry.hours)).filter(
-        TimeEntry.task_id == time_entry.task_id
-    ).scalar() or 0
-    task.actual_hours = total_hours + time_entry.hours
-    
-    db.commit()
-    db.refresh(db_time_entry)
+    # task.actual_hours is incremented atomically when the entry is flushed (services/task_hours)
+    await db.commit()
+    await db.refresh(db_time_entry)
     
-    await log_activity(db, current_user.id, "created", "time_entry", db_time_entry.id)
+    await log_activity(current_user.id, "created", "time_entry", db_time_entry.id)
     
     return db_time_entry
 
-@app.get("/api/v1/time-entries/", response_model=List[schemas.TimeEntry])
+@app.get("/api/v1/time-entries/", response_model=schemas.Page[schemas.TimeEntry])
 def read_time_entries(
     task_id: Optional[int] = None,
     user_id: Optional[int] = None,
     start_date: Optional[datetime] = None,
     end_date: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -751,8 +783,7 @@ def read_time_entries(
         if not task:
             raise HTTPException(status_code=404, detail="Task not found")
         
-        project = db.query(Project).filter(Project.id == task.project_id).first()
-        if not project or (current_user not in project.members and project.owner_id != current_user.id):
+        if not can_access_project(db, task.project_id, current_user.id):
             raise HTTPException(status_code=403, detail="Not a member of this project")
         
         query = query.filter(TimeEntry.task_id == task_id)
@@ -767,19 +798,31 @@ def read_time_entries(
     if end_date:
         query = query.filter(TimeEntry.date <= end_date)
     
-    return query.order_by(desc(TimeEntry.date)).all()
+    items, next_cursor = paginate(query, TIME_ENTRY_PAGE_KEYS, cursor, page_size(limit))
+    return {"items": items, "next_cursor": next_cursor}
 
 # ========== COMMENT ENDPOINTS ==========
 
 @app.post("/api/v1/comments/", response_model=schemas.Comment)
-async def create_comment(comment: schemas.CommentCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_comment(
+    comment: schemas.CommentCreate,
+    background_tasks: BackgroundTasks,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
     # Check task access
-    task = db.query(Task).filter(Task.id == comment.task_id).first()
+    result = await db.execute(
+        select(Task).where(Task.id == comment.task_id).options(
+            selectinload(Task.creator),
+            selectinload(Task.assignees),
+            selectinload(Task.watchers)
+        )
+    )
+    task = result.scalar_one_or_none()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-    if not project or (current_user not in project.members and project.owner_id != current_user.id):
+    if not await can_access_project_async(db, task.project_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this project")
     
     db_comment = Comment(
@@ -787,23 +830,25 @@ async def create_comment(comment: schemas.CommentCreate, current_user: User = De
         author_id=current_user.id
     )
     db.add(db_comment)
-    db.commit()
-    db.refresh(db_comment)
-    
-    await log_activity(db, current_user.id, "commented", "task", task.id)
-    
-    # Notify task watchers and assignees
-    notified_users = set()
-    for user in task.watchers + task.assignees + [task.creator]:
-        if user.id != current_user.id and user.id not in notified_users:
-            await create_notification(
-                db, user.id,
-                "New comment",
-                f"{current_user.full_name} commented on '{task.title}'",
-                "task", task.id,
-                f"/project/{project.id}?task={task.id}"
-            )
-            notified_users.add(user.id)
+    
+    # Notify task watchers, assignees and creator once each
+    recipients = notification_recipients(task.watchers + task.assignees + [task.creator], exclude=current_user.id)
+    notification = (
+        "New comment",
+        f"{current_user.full_name} commented on '{task.title}'",
+        "comment_added", "task", task.id,
+        f"/project/{task.project_id}?task={task.id}"
+    )
+    notifications = []
+    if len(recipients) > settings.NOTIFICATION_BACKGROUND_THRESHOLD:
+        background_tasks.add_task(fan_out_notifications, recipients, *notification)
+    else:
+        notifications = await insert_notifications(db, recipients, *notification)
+    await db.commit()
+    await db.refresh(db_comment)
+    
+    await log_activity(current_user.id, "commented", "task", task.id)
+    await push_notifications(notifications)
     
     # Broadcast to project room
     await manager.broadcast_to_room({
@@ -811,26 +856,34 @@ async def create_comment(comment: schemas.CommentCreate, current_user: User = De
         "data": {"comment_id": db_comment.id, "task_id": task.id, "project_id": task.project_id}
     }, f"project_{task.project_id}")
     
-    return db_comment
+    return await to_response(db, schemas.Comment, db_comment)
 
-@app.get("/api/v1/comments/", response_model=List[schemas.Comment])
-def read_comments(task_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@app.get("/api/v1/comments/", response_model=schemas.Page[schemas.Comment])
+def read_comments(
+    task_id: int,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     # Check task access
     task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-    if not project or (current_user not in project.members and project.owner_id != current_user.id):
+    if not can_access_project(db, task.project_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this project")
     
-    return db.query(Comment).filter(
+    query = db.query(Comment).filter(
         Comment.task_id == task_id,
         Comment.is_active == True
     ).options(
         joinedload(Comment.author),
-        joinedload(Comment.replies)
-    ).order_by(Comment.created_at).all()
+        selectinload(Comment.replies)
+    )
+    
+    items, next_cursor = paginate(query, COMMENT_PAGE_KEYS, cursor, page_size(limit))
+    return {"items": items, "next_cursor": next_cursor}
 
 # ========== FILE UPLOAD ENDPOINTS ==========
 
@@ -838,91 +891,166 @@ def read_comments(task_id: int, current_user: User = Depends(get_current_user),
 async def upload_file(
     task_id: int,
     file: UploadFile = File(...),
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Check task access
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-    if not project or (current_user not in project.members and project.owner_id != current_user.id):
+    if not await can_access_project_async(db, task.project_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this project")
     
-    # Validate file
-    if file.size > settings.MAX_FILE_SIZE:
+    # Validate file; the size is enforced while streaming since clients need not send it
+    if file.size is not None and file.size > settings.MAX_FILE_SIZE:
         raise HTTPException(status_code=400, detail="File too large")
     
     file_extension = file.filename.split('.')[-1].lower() if '.' in file.filename else ''
     if file_extension not in settings.ALLOWED_FILE_EXTENSIONS:
         raise HTTPException(status_code=400, detail="File type not allowed")
     
-    # Generate unique filename
-    unique_filename = f"{uuid.uuid4()}.{file_extension}"
-    file_path = upload_dir / unique_filename
-    
-    # Save file
-    async with aiofiles.open(file_path, 'wb') as f:
-        content = await file.read()
-        await f.write(content)
+    try:
+        received = await receive_upload(file, upload_dir)
+    except FileTooLarge:
+        raise HTTPException(status_code=400, detail="File too large")
     
-    # Create attachment record
+    # Stored by content: identical files share one blob
     attachment = Attachment(
-        filename=unique_filename,
+        filename=received.sha256,
         original_filename=file.filename,
-        file_path=str(file_path),
-        file_size=file.size,
+        file_path=str(blob_path(upload_dir, received.sha256)),
+        file_size=received.size,
         content_type=file.content_type,
+        content_hash=received.sha256,
         task_id=task_id,
         uploaded_by_id=current_user.id
     )
     db.add(attachment)
-    db.commit()
-    db.refresh(attachment)
+    try:
+        # Flushing takes the blob reference first, so garbage collection cannot race the file move
+        await db.flush()
+        received.store_blob(upload_dir)
+    except BaseException:
+        received.discard()
+        raise
+    await db.commit()
+    await db.refresh(attachment)
     
-    await log_activity(db, current_user.id, "uploaded", "attachment", attachment.id)
+    await log_activity(current_user.id, "uploaded", "attachment", attachment.id)
     
-    return attachment
+    # Rendered in another process; the response does not wait for it
+    if has_thumbnails(attachment.content_type):
+        thumbnail_pool.schedule(attachment.file_path)
+    
+    return await to_response(db, schemas.Attachment, attachment)
 
-@app.get("/api/v1/tasks/{task_id}/attachments/", response_model=List[schemas.Attachment])
-def get_attachments(task_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+@app.get("/api/v1/tasks/{task_id}/attachments/", response_model=schemas.Page[schemas.Attachment])
+def get_attachments(
+    task_id: int,
+    cursor: Optional[str] = None,
+    limit: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
     # Check task access
     task = db.query(Task).filter(Task.id == task_id).first()
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-    if not project or (current_user not in project.members and project.owner_id != current_user.id):
+    if not can_access_project(db, task.project_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this project")
     
-    return db.query(Attachment).filter(Attachment.task_id == task_id).options(
+    query = db.query(Attachment).filter(Attachment.task_id == task_id).options(
         joinedload(Attachment.uploaded_by)
-    ).order_by(desc(Attachment.created_at)).all()
+    )
+    
+    items, next_cursor = paginate(query, ATTACHMENT_PAGE_KEYS, cursor, page_size(limit))
+    return {"items": items, "next_cursor": next_cursor}
+
+@app.get("/api/v1/attachments/{attachment_id}/download")
+async def download_attachment(
+    attachment_id: int,
+    request: Request,
+    inline: bool = False,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Serve an attachment's file; supports Range, ETag and If-Modified-Since"""
+    attachment = await db.get(Attachment, attachment_id)
+    if not attachment:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    
+    task = await db.get(Task, attachment.task_id)
+    if not await can_access_project_async(db, task.project_id, current_user.id):
+        raise HTTPException(status_code=403, detail="Not a member of this project")
+    
+    if not os.path.isfile(attachment.file_path):
+        raise HTTPException(status_code=404, detail="Attachment file is missing")
+    
+    return AttachmentFileResponse(
+        attachment.file_path,
+        request.headers,
+        content_type=attachment.content_type,
+        filename=attachment.original_filename,
+        content_hash=attachment.content_hash,
+        last_modified=attachment.created_at,
+        inline=inline
+    )
+
+@app.get("/api/v1/attachments/{attachment_id}/thumbnail")
+async def attachment_thumbnail(
+    attachment_id: int,
+    request: Request,
+    size: int = Query(256, ge=1),
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Serve the smallest thumbnail at least ``size`` pixels wide; 404 until it has been rendered"""
+    attachment = await db.get(Attachment, attachment_id)
+    if not attachment:
+        raise HTTPException(status_code=404, detail="Attachment not found")
+    
+    task = await db.get(Task, attachment.task_id)
+    if not await can_access_project_async(db, task.project_id, current_user.id):
+        raise HTTPException(status_code=403, detail="Not a member of this project")
+    
+    size = pick_size(size, settings.THUMBNAIL_SIZES)
+    path = thumbnail_path(attachment.file_path, size)
+    if not has_thumbnails(attachment.content_type) or not path.is_file():
+        raise HTTPException(status_code=404, detail="Thumbnail not available")
+    
+    return AttachmentFileResponse(
+        str(path),
+        request.headers,
+        content_type=THUMBNAIL_CONTENT_TYPE,
+        filename=f"{attachment.original_filename}.{size}.webp",
+        content_hash=f"{attachment.content_hash}-{size}" if attachment.content_hash else None,
+        inline=True
+    )
 
 # ========== CUSTOM FIELDS ENDPOINTS ==========
 
 @app.post("/api/v1/custom-fields/", response_model=schemas.CustomField)
-async def create_custom_field(custom_field: schemas.CustomFieldCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_custom_field(custom_field: schemas.CustomFieldCreate, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
     # Check workspace access
-    workspace = db.query(Workspace).filter(Workspace.id == custom_field.workspace_id).first()
+    workspace = await db.get(Workspace, custom_field.workspace_id)
     if not workspace or workspace.owner_id != current_user.id:
         raise HTTPException(status_code=403, detail="Only workspace owners can create custom fields")
     
     db_custom_field = CustomField(**custom_field.dict())
     db.add(db_custom_field)
-    db.commit()
-    db.refresh(db_custom_field)
+    await db.commit()
+    await db.refresh(db_custom_field)
     
-    await log_activity(db, current_user.id, "created", "custom_field", db_custom_field.id)
+    await log_activity(current_user.id, "created", "custom_field", db_custom_field.id)
     
     return db_custom_field
 
 @app.get("/api/v1/custom-fields/", response_model=List[schemas.CustomField])
 def read_custom_fields(workspace_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     # Check workspace access
-    workspace = db.query(Workspace).filter(Workspace.id == workspace_id).first()
-    if not workspace or (current_user not in workspace.members and workspace.owner_id != current_user.id):
+    if not can_access_workspace(db, workspace_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this workspace")
     
     return db.query(CustomField).filter(
@@ -932,10 +1060,9 @@ def read_custom_fields(workspace_id: int, current_user: User = Depends(get_curre
 # ========== GOALS ENDPOINTS ==========
 
 @app.post("/api/v1/goals/", response_model=schemas.Goal)
-async def create_goal(goal: schemas.GoalCreate, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+async def create_goal(goal: schemas.GoalCreate, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
     # Check workspace access
-    workspace = db.query(Workspace).filter(Workspace.id == goal.workspace_id).first()
-    if not workspace or (current_user not in workspace.members and workspace.owner_id != current_user.id):
+    if not await can_access_workspace_async(db, goal.workspace_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this workspace")
     
     db_goal = Goal(
@@ -943,18 +1070,17 @@ async def create_goal(goal: schemas.GoalCreate, current_user: User = Depends(get
         owner_id=current_user.id
     )
     db.add(db_goal)
-    db.commit()
-    db.refresh(db_goal)
+    await db.commit()
+    await db.refresh(db_goal)
     
-    await log_activity(db, current_user.id, "created", "goal", db_goal.id)
+    await log_activity(current_user.id, "created", "goal", db_goal.id)
     
-    return db_goal
+    return await to_response(db, schemas.Goal, db_goal)
 
 @app.get("/api/v1/goals/", response_model=List[schemas.Goal])
 def read_goals(workspace_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
     # Check workspace access
-    workspace = db.query(Workspace).filter(Workspace.id == workspace_id).first()
-    if not workspace or (current_user not in workspace.members and workspace.owner_id != current_user.id):
+    if not can_access_workspace(db, workspace_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this workspace")
     
     return db.query(Goal).filter(
@@ -971,62 +1097,58 @@ def read_notifications(current_user: User = Depends(get_current_user), db: Sessi
     ).order_by(desc(Notification.created_at)).limit(50).all()
 
 @app.put("/api/v1/notifications/{notification_id}/read")
-async def mark_notification_read(notification_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
-    notification = db.query(Notification).filter(
+async def mark_notification_read(notification_id: int, current_user: User = Depends(get_current_user_async), db: AsyncSession = Depends(get_async_db)):
+    result = await db.execute(select(Notification).where(
         Notification.id == notification_id,
         Notification.user_id == current_user.id
-    ).first()
+    ))
+    notification = result.scalar_one_or_none()
     
     if not notification:
         raise HTTPException(status_code=404, detail="Notification not found")
     
     notification.status = "read"
     notification.read_at = datetime.utcnow()
-    db.commit()
+    await db.commit()
     
     return {"message": "Notification marked as read"}
 
 @app.get("/api/v1/notifications/unread-count")
 async def get_unread_notifications_count(
-    current_user: User = Depends(get_current_user),
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
 ):
-    count = db.query(Notification).filter(
+    count = (await db.execute(select(func.count(Notification.id)).where(
         Notification.user_id == current_user.id,
         Notification.status == "unread"
-    ).count()
+    ))).scalar()
     return {"count": count}
 
 # ========== WEBSOCKET ENDPOINTS ==========
 
 @app.websocket("/api/v1/ws/{room}")
-async def websocket_endpoint(websocket: WebSocket, room: str, token: str, db: Session = Depends(get_db)):
+async def websocket_endpoint(websocket: WebSocket, room: str, token: str):
+    # Authenticate on a short-lived session so the socket does not hold a
+    # pooled database connection for as long as it stays open
     try:
-        # Authenticate user
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        username = payload.get("sub")
-        user = db.query(User).filter(User.username == username).first()
-        if not user:
-            await websocket.close(code=1008)
-            return
-        
-        await manager.connect(websocket, room)
-        
-        try:
-            while True:
-                # Send heartbeat every 30 seconds
-                await asyncio.sleep(30)
-                await websocket.send_text(json.dumps({"type": "heartbeat"}))
-                
-        except WebSocketDisconnect:
-            manager.disconnect(websocket, room)
-        except Exception as e:
-            logging.error(f"WebSocket error: {e}")
-            manager.disconnect(websocket, room)
-            
+        async with AsyncSessionLocal() as db:
+            await get_current_user_async(token, db)
     except Exception as e:
         logging.error(f"WebSocket authentication error: {e}")
         await websocket.close(code=1008)
+        return
+    
+    # Heartbeats come from the manager; reading here notices disconnects promptly
+    await manager.connect(websocket, room)
+    try:
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    except Exception as e:
+        logging.error(f"WebSocket error: {e}")
+    finally:
+        await manager.disconnect(websocket, room)
 
 # ========== SEARCH ENDPOINTS ==========
 
@@ -1035,77 +1157,32 @@ def search(
     q: str,
     type: Optional[str] = None,  # tasks, projects, comments
     project_id: Optional[int] = None,
+    cursor: Optional[str] = None,
+    limit: int = 10,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    results = {"tasks": [], "projects": [], "comments": []}
+    if type and type not in SEARCH_TARGETS:
+        raise HTTPException(status_code=400, detail="type must be one of: tasks, projects, comments")
+    # Each result list pages independently, so a cursor belongs to one type
+    if cursor and not type:
+        raise HTTPException(status_code=400, detail="cursor requires type")
+    if project_id and not can_access_project(db, project_id, current_user.id):
+        raise HTTPException(status_code=403, detail="Not a member of this project")
     
-    if not type or type == "tasks":
-        # Search tasks
-        task_query = db.query(Task).filter(
-            or_(
-                Task.title.ilike(f"%{q}%"),
-                Task.description.ilike(f"%{q}%")
-            ),
-            Task.is_active == True
-        ).options(
-            joinedload(Task.creator),
-            joinedload(Task.assignees)
-        )
-        
-        if project_id:
-            task_query = task_query.filter(Task.project_id == project_id)
-        else:
-            # Only show tasks user has access to
-            task_query = task_query.filter(
-                or_(
-                    Task.creator_id == current_user.id,
-                    Task.assignees.any(User.id == current_user.id),
-                    Task.watchers.any(User.id == current_user.id)
-                )
-            )
-        
-        results["tasks"] = task_query.limit(10).all()
+    limit = page_size(limit)
+    offset = decode_offset(cursor)
+    found = full_text_search(
+        db, q, current_user.id, [type] if type else list(SEARCH_TARGETS), project_id, limit + 1, offset
+    )
     
-    if not type or type == "projects":
-        # Search projects
-        project_query = db.query(Project).filter(
-            or_(
-                Project.name.ilike(f"%{q}%"),
-                Project.description.ilike(f"%{q}%")
-            ),
-            Project.is_active == True,
-            or_(
-                Project.owner_id == current_user.id,
-                Project.members.any(User.id == current_user.id)
-            )
-        ).options(
-            joinedload(Project.workspace),
-            joinedload(Project.owner)
-        )
-        
-        results["projects"] = project_query.limit(10).all()
-    
-    if not type or type == "comments":
-        # Search comments
-        comment_query = db.query(Comment).filter(
-            Comment.content.ilike(f"%{q}%"),
-            Comment.is_active == True
-        ).join(Task).filter(
-            or_(
-                Task.creator_id == current_user.id,
-                Task.assignees.any(User.id == current_user.id),
-                Task.watchers.any(User.id == current_user.id)
-            )
-        ).options(
-            joinedload(Comment.author),
-            joinedload(Comment.task)
-        )
-        
-        if project_id:
-            comment_query = comment_query.filter(Task.project_id == project_id)
-        
-        results["comments"] = comment_query.limit(10).all()
+    results = {name: [] for name in SEARCH_TARGETS}
+    next_cursor = {}
+    for name, items in found.items():
+        results[name] = items[:limit]
+        if len(items) > limit:
+            next_cursor[name] = encode_offset(offset + limit)
+    results["next_cursor"] = next_cursor
     
     return results
 
@@ -1115,95 +1192,139 @@ def search(
 async def add_task_dependency(
     task_id: int, 
     depends_on_id: int, 
-    current_user: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async), 
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Check if both tasks exist and user has access
-    task = db.query(Task).filter(Task.id == task_id).first()
-    depends_on_task = db.query(Task).filter(Task.id == depends_on_id).first()
+    task = await db.get(Task, task_id)
+    depends_on_task = await db.get(Task, depends_on_id)
     
     if not task or not depends_on_task:
         raise HTTPException(status_code=404, detail="Task not found")
     
     # Check project access for both tasks
     for t in [task, depends_on_task]:
-        project = db.query(Project).filter(Project.id == t.project_id).first()
-        if not project or (current_user not in project.members and project.owner_id != current_user.id):
+        if not await can_access_project_async(db, t.project_id, current_user.id):
             raise HTTPException(status_code=403, detail="Not a member of this project")
     
+    if task_id == depends_on_id:
+        raise HTTPException(status_code=400, detail="A task cannot depend on itself")
+    
     # Check if dependency already exists
-    existing = db.query(TaskDependency).filter(
-        TaskDependency.task_id == task_id,
-        TaskDependency.depends_on_id == depends_on_id
-    ).first()
+    existing = (await db.execute(select(TaskDependency).where(
+        TaskDependency.successor_id == task_id,
+        TaskDependency.predecessor_id == depends_on_id
+    ))).scalar_one_or_none()
     
     if existing:
         raise HTTPException(status_code=400, detail="Dependency already exists")
     
     # Check for circular dependencies
-    def has_circular_dependency(start_task_id, target_task_id, visited=None):
-        if visited is None:
-            visited = set()
-        
-        if start_task_id in visited:
-            return True
-        
-        if start_task_id == target_task_id:
-            return True
-        
-        visited.add(start_task_id)
-        
-        dependencies = db.query(TaskDependency).filter(
-            TaskDependency.depends_on_id == start_task_id
-        ).all()
-        
-        for dep in dependencies:
-            if has_circular_dependency(dep.task_id, target_task_id, visited.copy()):
-                return True
-        
-        return False
-    
-    if has_circular_dependency(depends_on_id, task_id):
+    cycle = await find_cycle_async(
+        db, [(depends_on_id, task_id)],
+        {task_id: task.project_id, depends_on_id: depends_on_task.project_id}
+    )
+    if cycle:
         raise HTTPException(status_code=400, detail="This would create a circular dependency")
     
     # Create dependency
-    dependency = TaskDependency(task_id=task_id, depends_on_id=depends_on_id)
+    dependency = TaskDependency(predecessor_id=depends_on_id, successor_id=task_id)
     db.add(dependency)
-    db.commit()
+    await db.commit()
     
-    await log_activity(db, current_user.id, "added_dependency", "task", task_id)
+    await log_activity(current_user.id, "added_dependency", "task", task_id)
     
     return {"message": "Dependency added successfully"}
 
+@app.post("/api/v1/dependencies/bulk/")
+async def add_task_dependencies_bulk(
+    payload: schemas.BulkDependencyCreate,
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Add many dependencies at once; either all are added or none"""
+    edges = [(d.depends_on_id, d.task_id) for d in payload.dependencies]
+    if not edges:
+        return {"created_count": 0}
+    
+    # Check that every task exists and the user has access to its project
+    task_ids = {task_id for edge in edges for task_id in edge}
+    project_of = dict((await db.execute(
+        select(Task.id, Task.project_id).where(Task.id.in_(task_ids))
+    )).all())
+    missing = task_ids - project_of.keys()
+    if missing:
+        raise HTTPException(status_code=404, detail=f"Tasks not found: {sorted(missing)}")
+    
+    for project_id in set(project_of.values()):
+        if not await can_access_project_async(db, project_id, current_user.id):
+            raise HTTPException(status_code=403, detail="Not a member of this project")
+    
+    existing = set((await db.execute(
+        select(TaskDependency.predecessor_id, TaskDependency.successor_id).where(
+            TaskDependency.predecessor_id.in_({edge[0] for edge in edges}),
+            TaskDependency.successor_id.in_({edge[1] for edge in edges})
+        )
+    )).all())
+    errors = [
+        {"index": i, "task_id": edge[1], "depends_on_id": edge[0], "error": error}
+        for i, (edge, error) in enumerate(zip(edges, validate_edges(edges, existing)))
+        if error
+    ]
+    if errors:
+        raise HTTPException(status_code=400, detail={"message": "Invalid dependencies", "errors": errors})
+    
+    cycle = await find_cycle_async(db, edges, project_of)
+    if cycle:
+        raise HTTPException(
+            status_code=400,
+            detail={"message": "This would create a circular dependency", "cycle": cycle}
+        )
+    
+    db.add_all([
+        TaskDependency(predecessor_id=d.depends_on_id, successor_id=d.task_id, dependency_type=d.dependency_type)
+        for d in payload.dependencies
+    ])
+    await db.commit()
+    
+    # One entry per dependent task, as when dependencies are added one at a time
+    predecessors = defaultdict(list)
+    for depends_on_id, task_id in edges:
+        predecessors[task_id].append(depends_on_id)
+    for task_id, depends_on_ids in predecessors.items():
+        await log_activity(current_user.id, "added_dependency", "task", task_id,
+                           new_value={"depends_on_ids": depends_on_ids})
+    
+    return {"created_count": len(edges)}
+
 @app.delete("/api/v1/tasks/{task_id}/dependencies/{depends_on_id}")
 async def remove_task_dependency(
     task_id: int, 
     depends_on_id: int, 
-    current_user: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async), 
+    db: AsyncSession = Depends(get_async_db)
 ):
     # Check task access
-    task = db.query(Task).filter(Task.id == task_id).first()
+    task = await db.get(Task, task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-    if not project or (current_user not in project.members and project.owner_id != current_user.id):
+    if not await can_access_project_async(db, task.project_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this project")
     
     # Remove dependency
-    dependency = db.query(TaskDependency).filter(
-        TaskDependency.task_id == task_id,
-        TaskDependency.depends_on_id == depends_on_id
-    ).first()
+    dependency = (await db.execute(select(TaskDependency).where(
+        TaskDependency.successor_id == task_id,
+        TaskDependency.predecessor_id == depends_on_id
+    ))).scalar_one_or_none()
     
     if not dependency:
         raise HTTPException(status_code=404, detail="Dependency not found")
     
-    db.delete(dependency)
-    db.commit()
+    await db.delete(dependency)
+    await db.commit()
     
-    await log_activity(db, current_user.id, "removed_dependency", "task", task_id)
+    await log_activity(current_user.id, "removed_dependency", "task", task_id)
     
     return {"message": "Dependency removed successfully"}
 
@@ -1214,25 +1335,54 @@ def get_task_dependencies(task_id: int, current_user: User = Depends(get_current
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
-    project = db.query(Project).filter(Project.id == task.project_id).first()
-    if not project or (current_user not in project.members and project.owner_id != current_user.id):
+    if not can_access_project(db, task.project_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this project")
     
     # Get dependencies (tasks this task depends on)
     dependencies = db.query(Task).join(
-        TaskDependency, TaskDependency.depends_on_id == Task.id
-    ).filter(TaskDependency.task_id == task_id).all()
+        TaskDependency, TaskDependency.predecessor_id == Task.id
+    ).filter(TaskDependency.successor_id == task_id).all()
     
     # Get blocking tasks (tasks that depend on this task)
     blocking = db.query(Task).join(
-        TaskDependency, TaskDependency.task_id == Task.id
-    ).filter(TaskDependency.depends_on_id == task_id).all()
+        TaskDependency, TaskDependency.successor_id == Task.id
+    ).filter(TaskDependency.predecessor_id == task_id).all()
     
     return {
         "dependencies": dependencies,
         "blocking": blocking
     }
 
+@app.get("/api/v1/tasks/{task_id}/blockers/")
+def get_task_blockers(task_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Every open task transitively blocking this one"""
+    task = db.query(Task).filter(Task.id == task_id).first()
+    if not task:
+        raise HTTPException(status_code=404, detail="Task not found")
+    
+    if not can_access_project(db, task.project_id, current_user.id):
+        raise HTTPException(status_code=403, detail="Not a member of this project")
+    
+    return blocker_chain(db, task)
+
+@app.get("/api/v1/projects/{project_id}/tasks/ready")
+def get_ready_tasks(project_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Open tasks whose predecessors are all finished"""
+    if not can_access_project(db, project_id, current_user.id):
+        raise HTTPException(status_code=403, detail="Not a member of this project")
+    
+    readiness = get_readiness(db, project_id)
+    return {"project_id": project_id, "tasks": readiness.ready}
+
+@app.get("/api/v1/projects/{project_id}/tasks/blocked")
+def get_blocked_tasks(project_id: int, current_user: User = Depends(get_current_user), db: Session = Depends(get_db)):
+    """Open tasks waiting on at least one open predecessor"""
+    if not can_access_project(db, project_id, current_user.id):
+        raise HTTPException(status_code=403, detail="Not a member of this project")
+    
+    readiness = get_readiness(db, project_id)
+    return {"project_id": project_id, "tasks": readiness.blocked}
+
 # ========== HEALTH CHECK ENDPOINT ==========
 
 @app.get("/health")
@@ -1243,6 +1393,12 @@ def health_check(db: Session = Depends(get_db)):
         return {
             "status": "healthy",
             "database": "connected",
+            "password_hashing": password_hashing_pool.stats(),
+            "principal_cache": principal_cache.stats(),
+            "activity_buffer": activity_buffer.stats(),
+            "websockets": manager.stats(),
+            "task_events": task_events.stats(),
+            "thumbnails": thumbnail_pool.stats(),
             "timestamp": datetime.utcnow().isoformat()
         }
     except Exception as e:
@@ -1258,85 +1414,102 @@ def health_check(db: Session = Depends(get_db)):
 
 # ========== BULK OPERATIONS ENDPOINTS ==========
 
+@app.post("/api/v1/tasks/bulk-create/")
+async def bulk_create_tasks(
+    tasks: List[schemas.TaskCreate],
+    current_user: User = Depends(get_current_user_async),
+    db: AsyncSession = Depends(get_async_db)
+):
+    """Create many tasks at once, e.g. when importing a project; reports the outcome of each row"""
+    rows = [task.model_dump() for task in tasks]
+    try:
+        results, by_project = await db.run_sync(lambda session: bulk_create(session, current_user.id, rows))
+    except IntegrityError:
+        await db.rollback()
+        raise HTTPException(status_code=400, detail="A task refers to a task list or parent task that does not exist")
+
+    # One notification per assignee and project instead of one per task
+    notifications = []
+    for project_id, batch in by_project.items():
+        notifications += await insert_notifications(
+            db, notification_recipients(sorted(batch["assignee_ids"]), exclude=current_user.id),
+            "New tasks assigned",
+            f"{current_user.full_name} assigned you to tasks in a bulk import",
+            "task_assigned", "project", project_id,
+            f"/project/{project_id}"
+        )
+    await db.commit()
+    invalidate_readiness(by_project)
+
+    for project_id, batch in by_project.items():
+        await log_activity(current_user.id, "bulk_created", "project", project_id,
+                           new_value={"task_ids": batch["task_ids"]})
+        await manager.broadcast_to_room({
+            "type": "tasks_created",
+            "data": {"project_id": project_id, "task_ids": batch["task_ids"]}
+        }, f"project_{project_id}")
+    await push_notifications(notifications)
+
+    return {
+        "created_count": sum(len(batch["task_ids"]) for batch in by_project.values()),
+        "results": results
+    }
+
 @app.post("/api/v1/tasks/bulk-update/")
 async def bulk_update_tasks(
-    task_updates: List[Dict[str, Any]], 
-    current_user: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    task_updates: List[schemas.BulkTaskUpdate],
+    current_user: User = Depends(get_current_user_async), 
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Bulk update multiple tasks"""
-    updated_tasks = []
-    
-    for update_data in task_updates:
-        task_id = update_data.get("id")
-        if not task_id:
-            continue
-            
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if not task:
-            continue
-        
-        # Check access
-        project = db.query(Project).filter(Project.id == task.project_id).first()
-        if not project or (current_user not in project.members and project.owner_id != current_user.id):
-            continue
-        
-        # Update fields
-        for field, value in update_data.items():
-            if field != "id" and hasattr(task, field):
-                setattr(task, field, value)
-        
-        task.updated_at = datetime.utcnow()
-        updated_tasks.append(task)
-    
-    db.commit()
-    
-    # Broadcast updates
-    for task in updated_tasks:
-        await manager.broadcast_to_room({
-            "type": "task_updated",
-            "data": {"task_id": task.id, "project_id": task.project_id}
-        }, f"project_{task.project_id}")
-    
-    await log_activity(db, current_user.id, "bulk_updated", "tasks", len(updated_tasks))
-    
-    return {"updated_count": len(updated_tasks)}
+    """Bulk update multiple tasks; reports the outcome of each entry"""
+    items = [update.model_dump(exclude_unset=True) for update in task_updates]
+    results, by_project = await db.run_sync(lambda session: bulk_update(session, current_user.id, items))
+    by_project = jsonable_encoder(by_project)  # changes may hold dates
+
+    await db.commit()
+    invalidate_readiness(by_project, [task_id for batch in by_project.values() for task_id in batch["task_ids"]])
+
+    for project_id, batch in by_project.items():
+        await log_activity(current_user.id, "bulk_updated", "project", project_id, new_value=batch)
+
+    # One event per project room rather than one per task, merged with other recent changes
+    for project_id, batch in by_project.items():
+        fields = sorted({field for changes in batch["changes"] for field in changes})
+        await task_events.add(
+            f"project_{project_id}", {task_id: fields for task_id in batch["task_ids"]}, project_id=project_id)
+
+    return {
+        "updated_count": sum(len(batch["task_ids"]) for batch in by_project.values()),
+        "results": results
+    }
 
 @app.post("/api/v1/tasks/bulk-delete/")
 async def bulk_delete_tasks(
     task_ids: List[int], 
-    current_user: User = Depends(get_current_user), 
-    db: Session = Depends(get_db)
+    current_user: User = Depends(get_current_user_async), 
+    db: AsyncSession = Depends(get_async_db)
 ):
-    """Bulk delete multiple tasks"""
-    deleted_count = 0
-    
-    for task_id in task_ids:
-        task = db.query(Task).filter(Task.id == task_id).first()
-        if not task:
-            continue
-        
-        # Check access
-        project = db.query(Project).filter(Project.id == task.project_id).first()
-        if not project or (current_user not in project.members and project.owner_id != current_user.id):
-            continue
-        
-        # Soft delete
-        task.is_active = False
-        task.updated_at = datetime.utcnow()
-        deleted_count += 1
-        
-        # Broadcast deletion
+    """Bulk soft-delete multiple tasks; reports the outcome of each id"""
+    results, by_project = await db.run_sync(lambda session: bulk_delete(session, current_user.id, task_ids))
+
+    await db.commit()
+    invalidate_readiness(by_project, [task_id for ids in by_project.values() for task_id in ids])
+
+    for project_id, deleted_ids in by_project.items():
+        await log_activity(current_user.id, "bulk_deleted", "project", project_id,
+                           new_value={"task_ids": deleted_ids})
+
+    # Only after commit, and one event per project room
+    for project_id, deleted_ids in by_project.items():
         await manager.broadcast_to_room({
-            "type": "task_deleted",
-            "data": {"task_id": task.id, "project_id": task.project_id}
-        }, f"project_{task.project_id}")
-    
-    db.commit()
-    
-    await log_activity(db, current_user.id, "bulk_deleted", "tasks", deleted_count)
-    
-    return {"deleted_count": deleted_count}
+            "type": "tasks_deleted",
+            "data": {"project_id": project_id, "task_ids": deleted_ids}
+        }, f"project_{project_id}")
+
+    return {
+        "deleted_count": sum(len(ids) for ids in by_project.values()),
+        "results": results
+    }
 
 # ========== ANALYTICS ENDPOINTS ==========
 
@@ -1349,82 +1522,10 @@ def get_project_analytics(
     db: Session = Depends(get_db)
 ):
     # Check project access
-    project = db.query(Project).filter(Project.id == project_id).first()
-    if not project or (current_user not in project.members and project.owner_id != current_user.id):
+    if not can_access_project(db, project_id, current_user.id):
         raise HTTPException(status_code=403, detail="Not a member of this project")
     
-    # Date range filter
-    date_filter = []
-    if start_date:
-        date_filter.append(Task.created_at >= start_date)
-    if end_date:
-        date_filter.append(Task.created_at <= end_date)
-    
-    # Task statistics
-    base_query = db.query(Task).filter(Task.project_id == project_id, Task.is_active == True)
-    if date_filter:
-        base_query = base_query.filter(and_(*date_filter))
-    
-    total_tasks = base_query.count()
-    completed_tasks = base_query.filter(Task.status == TaskStatus.DONE).count()
-    in_progress_tasks = base_query.filter(Task.status == TaskStatus.IN_PROGRESS).count()
-    overdue_tasks = base_query.filter(
-        Task.due_date < datetime.utcnow(),
-        Task.status != TaskStatus.DONE
-    ).count()
-    
-    # Task distribution by status
-    status_distribution = db.query(
-        Task.status, func.count(Task.id)
-    ).filter(
-        Task.project_id == project_id,
-        Task.is_active == True
-    ).group_by(Task.status).all()
-    
-    # Task distribution by priority
-    priority_distribution = db.query(
-        Task.priority, func.count(Task.id)
-    ).filter(
-        Task.project_id == project_id,
-        Task.is_active == True
-    ).group_by(Task.priority).all()
-    
-    # Time tracking statistics
-    time_stats = db.query(
-        func.sum(TimeEntry.hours).label('total_hours'),
-        func.avg(TimeEntry.hours).label('avg_hours')
-    ).join(Task).filter(
-        Task.project_id == project_id
-    ).first()
-    
-    # Completion rate over time (last 30 days)
-    thirty_days_ago = datetime.utcnow() - timedelta(days=30)
-    completion_timeline = db.query(
-        func.date(Task.completed_at).label('date'),
-        func.count(Task.id).label('count')
-    ).filter(
-        Task.project_id == project_id,
-        Task.completed_at >= thirty_days_ago,
-        Task.status == TaskStatus.DONE
-    ).group_by(func.date(Task.completed_at)).all()
-    
-    return {
-        "project_id": project_id,
-        "summary": {
-            "total_tasks": total_tasks,
-            "completed_tasks": completed_tasks,
-            "in_progress_tasks": in_progress_tasks,
-            "overdue_tasks": overdue_tasks,
-            "completion_rate": round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 2)
-        },
-        "status_distribution": [{"status": s, "count": c} for s, c in status_distribution],
-        "priority_distribution": [{"priority": p, "count": c} for p, c in priority_distribution],
-        "time_tracking": {
-            "total_hours": float(time_stats.total_hours) if time_stats.total_hours else 0,
-            "average_hours": float(time_stats.avg_hours) if time_stats.avg_hours else 0
-        },
-        "completion_timeline": [{"date": str(date), "count": count} for date, count in completion_timeline]
-    }
+    return project_analytics(db, project_id, start_date, end_date)
 
 # ========== ERROR HANDLERS ==========
 
@@ -1441,6 +1542,29 @@ async def not_found_handler(request, exc):
         }
     )
 
+@app.exception_handler(InvalidCursor)
+async def invalid_cursor_handler(request, exc):
+    return JSONResponse(
+        status_code=400,
+        content={
+            "detail": str(exc),
+            "status_code": 400,
+            "path": str(request.url.path)
+        }
+    )
+
+@app.exception_handler(HashingPoolFull)
+async def hashing_pool_full_handler(request, exc):
+    return JSONResponse(
+        status_code=503,
+        content={
+            "detail": "Authentication service is busy, please retry shortly",
+            "status_code": 503,
+            "path": str(request.url.path)
+        },
+        headers={"Retry-After": "1"}
+    )
+
 @app.exception_handler(500)
 async def internal_error_handler(request, exc):
     logging.error(f"Internal server error: {exc}")
@@ -1,5 +1,5 @@
 # backend/app/models/models.py
-from sqlalchemy import Boolean, Column, Integer, String, Text, DateTime, Float, ForeignKey, Table, func, UniqueConstraint, Index
+from sqlalchemy import Boolean, Column, Integer, String, Text, Date, DateTime, Float, ForeignKey, Table, func, UniqueConstraint, Index
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import relationship
 from sqlalchemy.dialects.postgresql import UUID
@@ -26,14 +26,16 @@ user_workspace_association = Table(
     'user_workspace_association',
     Base.metadata,
     Column('user_id', Integer, ForeignKey('users.id')),
-    Column('workspace_id', Integer, ForeignKey('workspaces.id'))
+    Column('workspace_id', Integer, ForeignKey('workspaces.id')),
+    Index('idx_workspace_member', 'workspace_id', 'user_id')
 )
 
 user_project_association = Table(
     'user_project_association',
     Base.metadata,
     Column('user_id', Integer, ForeignKey('users.id')),
-    Column('project_id', Integer, ForeignKey('projects.id'))
+    Column('project_id', Integer, ForeignKey('projects.id')),
+    Index('idx_project_member', 'project_id', 'user_id')
 )
 
 task_assignee_association = Table(
@@ -175,6 +177,7 @@ class Task(Base):
         Index('idx_task_project_status', 'project_id', 'status'),
         Index('idx_task_assignee', 'creator_id'),
         Index('idx_task_due_date', 'due_date'),
+        Index('idx_task_project_position', 'project_id', 'position', 'created_at', 'id'),
     )
 
 class Comment(Base):
@@ -195,6 +198,21 @@ class Comment(Base):
     author = relationship("User", back_populates="comments")
     parent_comment = relationship("Comment", remote_side=[id], back_populates="replies")
     replies = relationship("Comment", back_populates="parent_comment", cascade="all, delete-orphan")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_comment_task_created', 'task_id', 'created_at', 'id'),
+    )
+
+class AttachmentBlob(Base):
+    """Stored file content, shared by every attachment with the same SHA-256"""
+    __tablename__ = "attachment_blobs"
+    
+    sha256 = Column(String(64), primary_key=True)
+    size = Column(Integer, nullable=False)
+    ref_count = Column(Integer, nullable=False, default=0)  # attachments pointing here
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    released_at = Column(DateTime(timezone=True))  # last time ref_count dropped; garbage once 0 and old
 
 class Attachment(Base):
     __tablename__ = "attachments"
@@ -205,6 +223,7 @@ class Attachment(Base):
     file_path = Column(String, nullable=False)
     file_size = Column(Integer, nullable=False)
     content_type = Column(String, nullable=False)
+    content_hash = Column(String(64), ForeignKey("attachment_blobs.sha256"), index=True)  # NULL until deduplicated
     task_id = Column(Integer, ForeignKey("tasks.id"), nullable=False)
     uploaded_by_id = Column(Integer, ForeignKey("users.id"), nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
@@ -212,6 +231,11 @@ class Attachment(Base):
     # Relationships
     task = relationship("Task", back_populates="attachments")
     uploaded_by = relationship("User")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_attachment_task_created', 'task_id', 'created_at', 'id'),
+    )
 
 class TimeEntry(Base):
     __tablename__ = "time_entries"
@@ -230,6 +254,12 @@ class TimeEntry(Base):
     # Relationships
     task = relationship("Task", back_populates="time_entries")
     user = relationship("User", back_populates="time_entries")
+    
+    # Indexes
+    __table_args__ = (
+        Index('idx_time_entry_task_date', 'task_id', 'date', 'id'),
+        Index('idx_time_entry_user_date', 'user_id', 'date', 'id'),
+    )
 
 class Goal(Base):
     __tablename__ = "goals"
@@ -310,6 +340,31 @@ class TaskCustomField(Base):
     task = relationship("Task", back_populates="custom_field_values")
     field = relationship("CustomField", back_populates="values")
 
+class UserTaskSummary(Base):
+    __tablename__ = "user_task_summaries"
+    
+    user_id = Column(Integer, ForeignKey("users.id"), primary_key=True)
+    total_tasks = Column(Integer, nullable=False, default=0)
+    completed_tasks = Column(Integer, nullable=False, default=0)
+    in_progress_tasks = Column(Integer, nullable=False, default=0)  # overdue is time-dependent, counted live
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class ProjectDailyStat(Base):
+    __tablename__ = "project_daily_stats"
+    
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    day = Column(Date, primary_key=True)
+    # "tasks", "status:<status>", "priority:<priority>", "completed", "hours", "time_entries"
+    metric = Column(String, primary_key=True)
+    value = Column(Float, nullable=False, default=0)
+
+class ProjectAnalyticsCoverage(Base):
+    __tablename__ = "project_analytics_coverage"
+    
+    project_id = Column(Integer, ForeignKey("projects.id"), primary_key=True)
+    covered_from = Column(Date, nullable=False)  # rollups are complete for days >= covered_from
+    backfilled_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
 class TaskDependency(Base):
     __tablename__ = "task_dependencies"
     
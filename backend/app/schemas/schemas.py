@@ -1,9 +1,16 @@
 # backend/app/schemas/schemas.py
-from pydantic import BaseModel, EmailStr, ConfigDict
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, EmailStr, ConfigDict, model_validator
+from typing import List, Optional, Dict, Any, Generic, TypeVar
 from datetime import datetime
 from app.models.models import TaskStatus, TaskPriority
 
+T = TypeVar("T")
+
+# Pagination
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
 # User Schemas
 class UserBase(BaseModel):
     email: EmailStr
@@ -174,7 +181,6 @@ class TaskUpdate(BaseModel):
     priority: Optional[TaskPriority] = None
     position: Optional[int] = None
     estimated_hours: Optional[float] = None
-    actual_hours: Optional[float] = None
     due_date: Optional[datetime] = None
     start_date: Optional[datetime] = None
     task_list_id: Optional[int] = None
@@ -182,6 +188,31 @@ class TaskUpdate(BaseModel):
     tags: Optional[List[str]] = None
     custom_field_values: Optional[Dict[str, Any]] = None
 
+    @model_validator(mode="before")
+    @classmethod
+    def reject_actual_hours(cls, data: Any) -> Any:
+        # Other unknown fields are ignored, but this one would be lost silently
+        if isinstance(data, dict) and "actual_hours" in data:
+            raise ValueError("actual_hours is the total of the task's time entries and cannot be set")
+        return data
+
+class BulkTaskUpdate(BaseModel):
+    """One entry of a bulk update: the task id and the column fields to set"""
+    id: int
+    title: Optional[str] = None
+    description: Optional[str] = None
+    status: Optional[TaskStatus] = None
+    priority: Optional[TaskPriority] = None
+    position: Optional[int] = None
+    estimated_hours: Optional[float] = None
+    due_date: Optional[datetime] = None
+    start_date: Optional[datetime] = None
+    task_list_id: Optional[int] = None
+    tags: Optional[List[str]] = None
+
+    # actual_hours, the total of the time entries, is rejected like any unknown field
+    model_config = ConfigDict(extra="forbid")
+
 class TaskInDB(TaskBase):
     id: int
     project_id: int
@@ -339,6 +370,15 @@ class DashboardData(BaseModel):
     recent_tasks: List[Task]
     task_summary: TaskSummary
 
+# Dependency Schemas
+class DependencyCreate(BaseModel):
+    task_id: int
+    depends_on_id: int
+    dependency_type: str = "finish_to_start"
+
+class BulkDependencyCreate(BaseModel):
+    dependencies: List[DependencyCreate]
+
 # Token Schemas
 class Token(BaseModel):
     access_token: str
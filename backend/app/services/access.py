@@ -0,0 +1,198 @@
+# backend/app/services/access.py
+"""
+Project and workspace access checks.
+
+A user can access a project (or workspace) when they own it or appear in its
+member association table. Both are answered with a single EXISTS query on
+indexed columns instead of loading the whole member collection, and the
+answers are cached in-process for ACCESS_CACHE_TTL seconds.
+
+Cached answers are evicted after any commit that adds or removes members,
+changes an owner, or creates/deletes a project or workspace.
+"""
+
+import threading
+import time
+from itertools import chain
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from sqlalchemy import event, exists, inspect, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import (
+    Project, User, Workspace, user_project_association, user_workspace_association)
+
+PROJECT = "project"
+WORKSPACE = "workspace"
+
+CacheKey = Tuple[str, int, int]
+
+
+class MembershipCache:
+    """Bounded TTL cache of (scope, scope_id, user_id) -> allowed"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[CacheKey, Tuple[float, bool]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[bool]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[key]
+                return None
+            return entry[1]
+
+    def put(self, key: CacheKey, allowed: bool):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # Cheap bound: drop everything rather than track recency
+                self._entries.clear()
+            self._entries[key] = (time.time() + self.ttl_seconds, allowed)
+
+    def evict_scope(self, scope: str, scope_id: int):
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == scope and k[1] == scope_id]:
+                del self._entries[key]
+
+    def evict_user(self, user_id: int):
+        with self._lock:
+            for key in [k for k in self._entries if k[2] == user_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+membership_cache = MembershipCache(
+    max_entries=settings.ACCESS_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.ACCESS_CACHE_TTL
+)
+
+
+def project_access_query(project_id: int, user_id: int):
+    is_member = exists().where(
+        user_project_association.c.project_id == project_id,
+        user_project_association.c.user_id == user_id
+    )
+    is_owner = exists().where(Project.id == project_id, Project.owner_id == user_id)
+    return select(or_(is_member, is_owner))
+
+
+def workspace_access_query(workspace_id: int, user_id: int):
+    is_member = exists().where(
+        user_workspace_association.c.workspace_id == workspace_id,
+        user_workspace_association.c.user_id == user_id
+    )
+    is_owner = exists().where(Workspace.id == workspace_id, Workspace.owner_id == user_id)
+    return select(or_(is_member, is_owner))
+
+
+def can_access_project(db: Session, project_id: int, user_id: int) -> bool:
+    key = (PROJECT, project_id, user_id)
+    allowed = membership_cache.get(key)
+    if allowed is None:
+        allowed = bool(db.execute(project_access_query(project_id, user_id)).scalar())
+        membership_cache.put(key, allowed)
+    return allowed
+
+
+def accessible_projects(db: Session, project_ids: Iterable[int], user_id: int) -> Set[int]:
+    """The subset of ``project_ids`` the user can access; one query for every uncached id"""
+    allowed, unknown = set(), []
+    for project_id in set(project_ids):
+        cached = membership_cache.get((PROJECT, project_id, user_id))
+        if cached is None:
+            unknown.append(project_id)
+        elif cached:
+            allowed.add(project_id)
+    if unknown:
+        is_member = exists().where(
+            user_project_association.c.project_id == Project.id,
+            user_project_association.c.user_id == user_id
+        )
+        found = set(db.execute(
+            select(Project.id).where(Project.id.in_(unknown), or_(Project.owner_id == user_id, is_member))
+        ).scalars())
+        for project_id in unknown:
+            membership_cache.put((PROJECT, project_id, user_id), project_id in found)
+        allowed |= found
+    return allowed
+
+
+def can_access_workspace(db: Session, workspace_id: int, user_id: int) -> bool:
+    key = (WORKSPACE, workspace_id, user_id)
+    allowed = membership_cache.get(key)
+    if allowed is None:
+        allowed = bool(db.execute(workspace_access_query(workspace_id, user_id)).scalar())
+        membership_cache.put(key, allowed)
+    return allowed
+
+
+async def can_access_project_async(db: AsyncSession, project_id: int, user_id: int) -> bool:
+    key = (PROJECT, project_id, user_id)
+    allowed = membership_cache.get(key)
+    if allowed is None:
+        allowed = bool((await db.execute(project_access_query(project_id, user_id))).scalar())
+        membership_cache.put(key, allowed)
+    return allowed
+
+
+async def can_access_workspace_async(db: AsyncSession, workspace_id: int, user_id: int) -> bool:
+    key = (WORKSPACE, workspace_id, user_id)
+    allowed = membership_cache.get(key)
+    if allowed is None:
+        allowed = bool((await db.execute(workspace_access_query(workspace_id, user_id))).scalar())
+        membership_cache.put(key, allowed)
+    return allowed
+
+
+def _membership_changed(obj) -> bool:
+    state = inspect(obj)
+    return (
+        state.attrs.members.history.has_changes()
+        or state.attrs.owner_id.history.has_changes()
+    )
+
+
+# Evictions are applied on commit so a concurrent request cannot re-cache the
+# pre-commit answer after the flush.
+@event.listens_for(Session, "after_flush")
+def _collect_membership_changes(session, flush_context):
+    scopes = session.info.setdefault("access_cache_scopes", set())
+    users = session.info.setdefault("access_cache_users", set())
+    for obj in chain(session.new, session.deleted):
+        if isinstance(obj, Project):
+            scopes.add((PROJECT, obj.id))
+        elif isinstance(obj, Workspace):
+            scopes.add((WORKSPACE, obj.id))
+    for obj in session.dirty:
+        if isinstance(obj, Project) and _membership_changed(obj):
+            scopes.add((PROJECT, obj.id))
+        elif isinstance(obj, Workspace) and _membership_changed(obj):
+            scopes.add((WORKSPACE, obj.id))
+        elif isinstance(obj, User):
+            state = inspect(obj)
+            if state.attrs.projects.history.has_changes() or state.attrs.workspaces.history.has_changes():
+                users.add(obj.id)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_membership_changes(session):
+    for scope, scope_id in session.info.pop("access_cache_scopes", ()):
+        membership_cache.evict_scope(scope, scope_id)
+    for user_id in session.info.pop("access_cache_users", ()):
+        membership_cache.evict_user(user_id)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_membership_changes(session):
+    session.info.pop("access_cache_scopes", None)
+    session.info.pop("access_cache_users", None)
@@ -0,0 +1,151 @@
+# backend/app/services/activity_log.py
+"""
+Write-behind buffer for ActivityLog rows.
+
+log_activity used to add a row and commit, a second transaction on every
+write endpoint. Entries now go into a bounded in-process queue, and a
+background task inserts them in batches of up to ACTIVITY_FLUSH_BATCH_SIZE,
+at the latest ACTIVITY_FLUSH_INTERVAL seconds after the first entry of a
+batch was queued. A full queue makes callers wait (backpressure) rather
+than drop entries. Stopping the buffer flushes everything still queued.
+
+Activity rows therefore appear up to one flush interval after the request
+that caused them. Before start() and after stop() (scripts, shutdown) entries
+are written straight through.
+"""
+
+import asyncio
+import logging
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import insert
+
+from app.core.config import settings
+from app.db.async_session import AsyncSessionLocal
+from app.models.models import ActivityLog
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class ActivityBuffer:
+    """Bounded queue of ActivityLog rows drained by one flusher task"""
+
+    def __init__(self, max_size: int, batch_size: int, flush_interval: float):
+        self.max_size = max_size
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self.enqueued = 0
+        self.waited = 0  # puts that found the queue full
+        self.flushed = 0
+        self.failed = 0
+        self.batches = 0
+        self.last_flush_ms = 0.0
+        self.max_flush_ms = 0.0
+
+    def start(self):
+        if self._task is None:
+            self._queue = asyncio.Queue(maxsize=self.max_size)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Flush everything queued so far and stop the flusher"""
+        if self._task is None:
+            return
+        await self._queue.put(_STOP)
+        await self._task
+        self._task = None
+        self._queue = None
+
+    async def put(self, entry: Dict[str, Any]):
+        if self._queue is None:
+            await self._write([entry])
+            return
+        if self._queue.full():
+            self.waited += 1
+        await self._queue.put(entry)
+        self.enqueued += 1
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            entry = await self._queue.get()
+            if entry is _STOP:
+                break
+            batch = [entry]
+            deadline = loop.time() + self.flush_interval
+            while len(batch) < self.batch_size:
+                try:
+                    entry = self._queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        entry = await asyncio.wait_for(self._queue.get(), remaining)
+                    except asyncio.TimeoutError:
+                        break
+                if entry is _STOP:
+                    stopping = True
+                    break
+                batch.append(entry)
+            await self._flush(batch)
+
+    async def _flush(self, batch: List[Dict[str, Any]]):
+        started = time.perf_counter()
+        try:
+            await self._write(batch)
+        except Exception as e:
+            # The originating requests have already succeeded; count the loss and keep draining
+            self.failed += len(batch)
+            logger.error(f"Dropped {len(batch)} activity log entries: {e}")
+            return
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.flushed += len(batch)
+        self.batches += 1
+        self.last_flush_ms = round(elapsed_ms, 2)
+        self.max_flush_ms = max(self.max_flush_ms, self.last_flush_ms)
+
+    async def _write(self, batch: List[Dict[str, Any]]):
+        async with AsyncSessionLocal() as session:
+            await session.execute(insert(ActivityLog), batch)
+            await session.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_size": self.max_size,
+            "enqueued": self.enqueued,
+            "waited": self.waited,
+            "flushed": self.flushed,
+            "failed": self.failed,
+            "batches": self.batches,
+            "last_flush_ms": self.last_flush_ms,
+            "max_flush_ms": self.max_flush_ms,
+        }
+
+
+activity_buffer = ActivityBuffer(
+    max_size=settings.ACTIVITY_BUFFER_MAX_SIZE,
+    batch_size=settings.ACTIVITY_FLUSH_BATCH_SIZE,
+    flush_interval=settings.ACTIVITY_FLUSH_INTERVAL
+)
+
+
+def activity_entry(user_id: int, action: str, entity_type: str, entity_id: int, old_values: Optional[str] = None,
+                   new_values: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "user_id": user_id,
+        "action": action,
+        "entity_type": entity_type,
+        "entity_id": entity_id,
+        "old_values": old_values,
+        "new_values": new_values,
+        "created_at": datetime.utcnow(),  # when it happened, not when it was flushed
+    }
@@ -0,0 +1,151 @@
+# backend/app/services/attachment_download.py
+"""
+Attachment download responses.
+
+Blobs are content-addressed and never change, so the SHA-256 is a strong
+ETag and responses may be cached for a year ("private": access is checked
+per request). Conditional requests (If-None-Match, If-Modified-Since) get a
+304, single byte ranges (Range, If-Range) a 206, so interrupted downloads
+can resume.
+
+The body is handed to the server with the ASGI zero-copy send extension
+when the server offers it (the file descriptor goes straight to sendfile);
+otherwise it is read in ATTACHMENT_DOWNLOAD_CHUNK_SIZE pieces off the event
+loop.
+"""
+
+import os
+import re
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple
+from urllib.parse import quote
+
+import anyio
+from starlette.responses import Response
+from starlette.types import Receive, Scope, Send
+
+from app.core.config import settings
+
+ZERO_COPY_EXTENSION = "http.response.zerocopysend"
+IMMUTABLE_CACHE = "private, max-age=31536000, immutable"
+RANGE_PATTERN = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def entity_tag(content_hash: Optional[str], stat: os.stat_result) -> str:
+    if content_hash:
+        return f'"{content_hash}"'
+    # Files stored before deduplication: size and mtime stand in for the hash
+    return f'"{stat.st_size:x}-{stat.st_mtime_ns:x}"'
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    candidates = [tag.strip() for tag in header.split(",")]
+    return "*" in candidates or etag in candidates or f"W/{etag}" in candidates
+
+
+def _not_modified(headers, etag: str, last_modified: datetime) -> bool:
+    if_none_match = headers.get("if-none-match")
+    if if_none_match is not None:
+        return _etag_matches(if_none_match, etag)
+    if_modified_since = headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            return last_modified.replace(microsecond=0) <= parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+    return False
+
+
+def parse_range(header: Optional[str], size: int) -> Optional[Tuple[int, int]]:
+    """The (start, end inclusive) of a single-range header; None to send the whole file.
+
+    Raises ValueError when the range cannot be satisfied.
+    """
+    if not header:
+        return None
+    match = RANGE_PATTERN.match(header.strip())
+    if match is None:
+        return None  # multiple or non-byte ranges: answer with the full body
+    first, last = match.groups()
+    if not first:
+        if not last or int(last) == 0:
+            raise ValueError(header)
+        return max(size - int(last), 0), size - 1
+    start = int(first)
+    end = min(int(last), size - 1) if last else size - 1
+    if start >= size or start > end:
+        raise ValueError(header)
+    return start, end
+
+
+class AttachmentFileResponse(Response):
+    """Serves one stored file: conditional requests, a single byte range, zero-copy when possible"""
+
+    chunk_size = settings.ATTACHMENT_DOWNLOAD_CHUNK_SIZE
+
+    def __init__(self, path: str, request_headers, content_type: str, filename: str,
+                 content_hash: Optional[str], last_modified: Optional[datetime] = None, inline: bool = False):
+        self.path = path
+        stat = os.stat(path)
+        etag = entity_tag(content_hash, stat)
+        # A shared blob's mtime moves whenever a duplicate upload replaces it
+        if last_modified is None:
+            last_modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc)
+        elif last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        disposition = "inline" if inline else "attachment"
+        headers = {
+            "accept-ranges": "bytes",
+            "etag": etag,
+            "last-modified": format_datetime(last_modified, usegmt=True),
+            "cache-control": IMMUTABLE_CACHE if content_hash else "private, no-cache",
+            "content-disposition": f"{disposition}; filename*=UTF-8''{quote(filename)}",
+        }
+        self.start, self.length = 0, stat.st_size
+        status_code = 200
+        if _not_modified(request_headers, etag, last_modified):
+            status_code, self.length = 304, 0
+        else:
+            if_range = request_headers.get("if-range")
+            try:
+                byte_range = parse_range(request_headers.get("range"), stat.st_size)
+            except ValueError:
+                byte_range = None
+                status_code, self.length = 416, 0
+                headers["content-range"] = f"bytes */{stat.st_size}"
+            # A resumed download of a file that changed meanwhile starts over
+            if byte_range is not None and (if_range is None or if_range.strip() == etag):
+                start, end = byte_range
+                status_code, self.start, self.length = 206, start, end - start + 1
+                headers["content-range"] = f"bytes {start}-{end}/{stat.st_size}"
+        super().__init__(status_code=status_code, headers=headers, media_type=content_type)
+        self.headers["content-length"] = str(self.length)
+        if status_code == 304:
+            del self.headers["content-length"]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        await send({"type": "http.response.start", "status": self.status_code, "headers": self.raw_headers})
+        if self.length == 0 or scope.get("method") == "HEAD":
+            await send({"type": "http.response.body", "body": b"", "more_body": False})
+            return
+        async with await anyio.open_file(self.path, mode="rb") as file:
+            if ZERO_COPY_EXTENSION in scope.get("extensions", {}):
+                await send({
+                    "type": ZERO_COPY_EXTENSION,
+                    "file": file.wrapped,
+                    "offset": self.start,
+                    "count": self.length,
+                    "more_body": False,
+                })
+                return
+            await file.seek(self.start)
+            remaining = self.length
+            while remaining > 0:
+                chunk = await file.read(min(self.chunk_size, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                await send({"type": "http.response.body", "body": chunk, "more_body": remaining > 0})
+            if remaining > 0:
+                await send({"type": "http.response.body", "body": b"", "more_body": False})
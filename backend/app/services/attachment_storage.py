@@ -0,0 +1,209 @@
+# backend/app/services/attachment_storage.py
+"""
+Attachment file storage.
+
+Files are stored once per content, under UPLOAD_FOLDER/blobs/<2 hex>/<sha256>,
+and every Attachment row points at its blob through content_hash. The
+blob's ref_count is kept in step with the attachment rows by flush events,
+so uploading a file that is already stored costs one rename and a counter
+increment. Blobs whose count has been zero for ATTACHMENT_GC_GRACE_SECONDS
+are removed by collect_garbage (gc_attachments.py).
+
+Uploads are copied in UPLOAD_CHUNK_SIZE chunks into a temporary file inside
+UPLOAD_FOLDER, hashing and counting bytes as they go, and abandoned as soon
+as MAX_FILE_SIZE is exceeded. Only a complete upload is renamed into place;
+the rename is atomic because the temporary file lives on the same
+filesystem. Memory per upload is one chunk, whatever the file size.
+"""
+
+import hashlib
+import os
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict
+
+import aiofiles
+from fastapi import UploadFile
+from sqlalchemy import and_, delete, event, or_, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.incremental import UPSERTS
+from app.models.models import Attachment, AttachmentBlob
+
+PARTIAL_SUFFIX = ".part"
+BLOB_DIR = "blobs"
+HASH_CHUNK_SIZE = 1024 * 1024
+
+blob_table = AttachmentBlob.__table__
+
+
+def blob_path(upload_dir: Path, sha256: str) -> Path:
+    return Path(upload_dir) / BLOB_DIR / sha256[:2] / sha256
+
+
+def hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class FileTooLarge(Exception):
+    pass
+
+
+class ReceivedUpload:
+    """A fully received upload waiting in its temporary file"""
+
+    def __init__(self, temp_path: Path, size: int, sha256: str):
+        self.temp_path = temp_path
+        self.size = size
+        self.sha256 = sha256
+
+    def store_blob(self, upload_dir: Path) -> Path:
+        """Move the upload to its content address.
+
+        Call after the attachment is flushed, so the blob row is locked
+        against a concurrent collect_garbage. An existing copy is simply
+        replaced by this identical one.
+        """
+        path = blob_path(upload_dir, self.sha256)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        os.replace(self.temp_path, path)
+        return path
+
+    def discard(self):
+        try:
+            os.unlink(self.temp_path)
+        except FileNotFoundError:
+            pass
+
+
+async def receive_upload(upload: UploadFile, directory: Path, max_size: int = settings.MAX_FILE_SIZE,
+                         chunk_size: int = settings.UPLOAD_CHUNK_SIZE) -> ReceivedUpload:
+    """Copy ``upload`` to a temporary file in ``directory``; raises FileTooLarge past ``max_size``"""
+    fd, name = tempfile.mkstemp(dir=directory, suffix=PARTIAL_SUFFIX)
+    os.close(fd)
+    received = ReceivedUpload(Path(name), 0, "")
+    digest = hashlib.sha256()
+    try:
+        async with aiofiles.open(received.temp_path, "wb") as out:
+            while True:
+                chunk = await upload.read(chunk_size)
+                if not chunk:
+                    break
+                received.size += len(chunk)
+                if received.size > max_size:
+                    raise FileTooLarge()
+                digest.update(chunk)
+                await out.write(chunk)
+    except BaseException:
+        received.discard()
+        raise
+    received.sha256 = digest.hexdigest()
+    return received
+
+
+# ----- reference counts -----
+
+def acquire_blob(connection, sha256: str, size: int):
+    upsert = UPSERTS.get(connection.dialect.name)
+    if upsert is not None:
+        statement = upsert(blob_table).values(sha256=sha256, size=size, ref_count=1)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[blob_table.c.sha256],
+            set_={"ref_count": blob_table.c.ref_count + 1, "released_at": None}
+        ))
+        return
+    result = connection.execute(
+        update(blob_table).where(blob_table.c.sha256 == sha256)
+        .values(ref_count=blob_table.c.ref_count + 1, released_at=None)
+    )
+    if result.rowcount == 0:
+        connection.execute(blob_table.insert().values(sha256=sha256, size=size, ref_count=1))
+
+
+def release_blob(connection, sha256: str):
+    connection.execute(
+        update(blob_table).where(blob_table.c.sha256 == sha256)
+        .values(ref_count=blob_table.c.ref_count - 1, released_at=datetime.utcnow())
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _count_blob_references(session, flush_context, instances):
+    connection = None
+    for obj in list(session.new) + list(session.deleted):
+        if not isinstance(obj, Attachment) or obj.content_hash is None:
+            continue
+        connection = connection or session.connection()
+        if obj in session.new:
+            acquire_blob(connection, obj.content_hash, obj.file_size)
+        else:
+            release_blob(connection, obj.content_hash)
+
+
+# ----- garbage collection -----
+
+def collect_garbage(engine, upload_dir: Path, grace_seconds: int = settings.ATTACHMENT_GC_GRACE_SECONDS) -> Dict[str, int]:
+    """Delete blobs unreferenced for ``grace_seconds``, plus stray files older than that"""
+    cutoff = datetime.utcnow() - timedelta(seconds=grace_seconds)
+    stats = {"blobs_removed": 0, "bytes_freed": 0, "stray_files_removed": 0}
+    with engine.connect() as conn:
+        candidates = conn.execute(select(blob_table.c.sha256).where(
+            blob_table.c.ref_count <= 0,
+            or_(blob_table.c.released_at < cutoff,
+                and_(blob_table.c.released_at.is_(None), blob_table.c.created_at < cutoff))
+        )).scalars().all()
+
+    for sha256 in candidates:
+        # Unlink before committing the delete: an upload of the same content
+        # blocks on the deleted row until then and re-creates the file after
+        with engine.begin() as conn:
+            size = conn.execute(
+                delete(blob_table).where(blob_table.c.sha256 == sha256, blob_table.c.ref_count <= 0)
+                .returning(blob_table.c.size)
+            ).scalar()
+            if size is None:
+                continue  # referenced again meanwhile
+            path = blob_path(upload_dir, sha256)
+            # The blob and whatever was derived from it (thumbnails: <sha256>.<size>.webp)
+            for derived in [path, *path.parent.glob(f"{sha256}.*")]:
+                try:
+                    os.unlink(derived)
+                except FileNotFoundError:
+                    pass
+        stats["blobs_removed"] += 1
+        stats["bytes_freed"] += size
+
+    # Files no row accounts for: partial uploads of crashed requests, blobs of rolled back ones
+    oldest = time.time() - grace_seconds
+    root = Path(upload_dir)
+    strays = [path for path in root.glob(f"*{PARTIAL_SUFFIX}") if path.stat().st_mtime < oldest]
+    blobs: Dict[str, list] = {}
+    for path in (root / BLOB_DIR).glob("*/*"):
+        if path.stat().st_mtime < oldest:
+            blobs.setdefault(path.name.split(".")[0], []).append(path)
+    if blobs:
+        with engine.connect() as conn:
+            known = set()
+            names = list(blobs)
+            for start in range(0, len(names), 1000):
+                known.update(conn.execute(
+                    select(blob_table.c.sha256).where(blob_table.c.sha256.in_(names[start:start + 1000]))
+                ).scalars())
+        strays += [path for name, paths in blobs.items() if name not in known for path in paths]
+        # Interrupted thumbnail renders of blobs that are still in use
+        strays += [path for name, paths in blobs.items() if name in known
+                   for path in paths if path.name.endswith(PARTIAL_SUFFIX)]
+    for path in strays:
+        try:
+            os.unlink(path)
+            stats["stray_files_removed"] += 1
+        except FileNotFoundError:
+            pass
+    return stats
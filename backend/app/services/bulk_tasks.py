@@ -0,0 +1,346 @@
+# backend/app/services/bulk_tasks.py
+"""
+Set-based bulk task operations.
+
+Each operation reads the state of every requested task in one query, checks
+project access once per distinct project, and writes with a few grouped
+statements instead of one ORM round trip per task. Per-item outcomes are
+returned so callers can report partial failures.
+
+Bulk creation inserts with COPY on PostgreSQL (ids are reserved from the
+sequence first) and with batched INSERT ... RETURNING elsewhere.
+
+Set-based statements bypass the ORM flush events, so the derived data those
+events maintain (dashboard counters, analytics rollups) is updated here
+explicitly. The functions take a sync Session; async endpoints call them
+through AsyncSession.run_sync.
+"""
+
+import io
+import json
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy import func, insert, select, text, update
+from sqlalchemy.orm import Session
+
+from app.models.models import CustomField, Task, TaskCustomField, TaskPriority, TaskStatus, User, task_assignee_association
+from app.services.access import accessible_projects
+from app.services.project_analytics import apply_task_changes
+from app.services.task_summary import refresh_task_summaries
+
+DONE = TaskStatus.DONE.value
+
+# Ids per IN (...) list; keeps statements well under bind-parameter limits
+CHUNK_SIZE = 1000
+
+CREATED = "created"
+UPDATED = "updated"
+DELETED = "deleted"
+NOT_FOUND = "not_found"
+FORBIDDEN = "forbidden"
+DUPLICATE = "duplicate"
+
+# Columns whose change moves a task between dashboard / analytics buckets
+STATE_COLUMNS = (Task.id, Task.project_id, Task.created_at, Task.status, Task.priority,
+                 Task.is_active, Task.completed_at, Task.creator_id)
+
+
+def chunks(items: Sequence, size: int = CHUNK_SIZE) -> Iterable[Sequence]:
+    for start in range(0, len(items), size):
+        yield items[start:start + size]
+
+
+def _column_value(value: Any) -> Any:
+    if isinstance(value, list):
+        return json.dumps(value)  # tags are stored as a JSON string
+    return getattr(value, "value", value)
+
+
+def _analytics_key(row, **overrides) -> tuple:
+    values = {
+        "project_id": row.project_id, "created_at": row.created_at, "status": row.status,
+        "priority": row.priority, "is_active": row.is_active, "completed_at": row.completed_at,
+    }
+    values.update(overrides)
+    return (values["project_id"], values["created_at"], values["status"],
+            values["priority"], values["is_active"], values["completed_at"])
+
+
+def load_task_states(db: Session, task_ids: Iterable[int]) -> Dict[int, Any]:
+    """Current state rows of the active tasks among ``task_ids``"""
+    states = {}
+    for chunk in chunks(list(task_ids)):
+        states.update({row.id: row for row in db.execute(
+            select(*STATE_COLUMNS).where(Task.id.in_(chunk), Task.is_active == True)
+        )})
+    return states
+
+
+def involved_users(db: Session, task_ids: Sequence[int], states: Dict[int, Any]) -> set:
+    """Creators and assignees of ``task_ids``: the users whose dashboard counts they feed"""
+    users = {states[task_id].creator_id for task_id in task_ids}
+    for chunk in chunks(list(task_ids)):
+        users.update(db.execute(
+            select(task_assignee_association.c.user_id)
+            .where(task_assignee_association.c.task_id.in_(chunk))
+        ).scalars())
+    return users
+
+
+def check_tasks(db: Session, user_id: int, task_ids: Sequence[int]) -> Tuple[Dict[int, Any], List[Optional[str]]]:
+    """Split ``task_ids`` into writable task states and, per position, the failure if any.
+
+    The first occurrence of an id is checked and processed; repeats of it are
+    failed as DUPLICATE without affecting it.
+    """
+    states = load_task_states(db, task_ids)
+    allowed = accessible_projects(db, (row.project_id for row in states.values()), user_id)
+    failures: List[Optional[str]] = []
+    seen = set()
+    for task_id in task_ids:
+        if task_id in seen:
+            failures.append(DUPLICATE)
+        elif task_id not in states:
+            failures.append(NOT_FOUND)
+        elif states[task_id].project_id not in allowed:
+            failures.append(FORBIDDEN)
+        else:
+            failures.append(None)
+        seen.add(task_id)
+    writable = {task_id for task_id, failure in zip(task_ids, failures) if failure is None}
+    return {task_id: row for task_id, row in states.items() if task_id in writable}, failures
+
+
+def bulk_update(db: Session, user_id: int, items: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[int, Dict[str, Any]]]:
+    """Apply ``items`` ({"id": ..., <field>: <value>, ...}) with one UPDATE per distinct change set.
+
+    Returns the per-item results and, per project, the updated task ids and
+    the change sets applied to them. The caller commits.
+    """
+    states, failures = check_tasks(db, user_id, [item["id"] for item in items])
+    now = datetime.utcnow()
+
+    # Group tasks that receive exactly the same changes; of a task listed
+    # twice only the first entry applies
+    groups: Dict[tuple, List[int]] = defaultdict(list)
+    for item, failure in zip(items, failures):
+        if failure is None:
+            changes = tuple(sorted((field, _column_value(value)) for field, value in item.items() if field != "id"))
+            groups[changes].append(item["id"])
+
+    analytics_changes = []
+    status_changed = []
+    by_project: Dict[int, Dict[str, Any]] = defaultdict(lambda: {"task_ids": [], "changes": []})
+    for changes, ids in groups.items():
+        values = dict(changes)
+        statement_values = {**values, "updated_at": now}
+        if "status" in values:
+            # Same rule as update_task: stamp completion once, clear it when reopened
+            done = values["status"] == DONE
+            statement_values["completed_at"] = func.coalesce(Task.completed_at, now) if done else None
+        for chunk in chunks(ids):
+            db.execute(
+                update(Task).where(Task.id.in_(chunk)).values(**statement_values)
+                .execution_options(synchronize_session=False)
+            )
+
+        for task_id in ids:
+            row = states[task_id]
+            by_project[row.project_id]["task_ids"].append(task_id)
+            if "status" not in values and "priority" not in values:
+                continue
+            status = values.get("status", row.status)
+            completed_at = row.completed_at
+            if "status" in values:
+                completed_at = (row.completed_at or now) if status == DONE else None
+                if status != row.status:
+                    status_changed.append(task_id)
+            analytics_changes.append((
+                _analytics_key(row),
+                _analytics_key(row, status=status, priority=values.get("priority", row.priority),
+                               completed_at=completed_at)
+            ))
+        for project_id in {states[task_id].project_id for task_id in ids}:
+            by_project[project_id]["changes"].append(values)
+
+    connection = db.connection()
+    if analytics_changes:
+        apply_task_changes(connection, analytics_changes)
+    if status_changed:
+        refresh_task_summaries(connection, involved_users(db, status_changed, states))
+
+    results = [
+        {"id": item["id"], "status": failure or UPDATED}
+        for item, failure in zip(items, failures)
+    ]
+    return results, dict(by_project)
+
+
+def bulk_delete(db: Session, user_id: int, task_ids: List[int]) -> Tuple[List[Dict[str, Any]], Dict[int, List[int]]]:
+    """Soft-delete ``task_ids`` with one UPDATE per project.
+
+    Returns the per-id results and the deleted task ids of each project. The
+    caller commits.
+    """
+    states, failures = check_tasks(db, user_id, task_ids)
+    now = datetime.utcnow()
+
+    by_project: Dict[int, List[int]] = defaultdict(list)
+    for task_id, row in states.items():
+        by_project[row.project_id].append(task_id)
+    for project_id, ids in by_project.items():
+        for chunk in chunks(sorted(ids)):
+            db.execute(
+                update(Task).where(Task.project_id == project_id, Task.id.in_(chunk))
+                .values(is_active=False, updated_at=now)
+                .execution_options(synchronize_session=False)
+            )
+
+    if states:
+        connection = db.connection()
+        apply_task_changes(connection, [
+            (_analytics_key(row), _analytics_key(row, is_active=False)) for row in states.values()
+        ])
+        refresh_task_summaries(connection, involved_users(db, list(states), states))
+
+    results = [{"id": task_id, "status": failure or DELETED} for task_id, failure in zip(task_ids, failures)]
+    return results, dict(by_project)
+
+
+# Columns written by bulk_create, in COPY order
+CREATE_COLUMNS = (
+    "id", "title", "description", "status", "priority", "position", "estimated_hours", "actual_hours",
+    "due_date", "start_date", "project_id", "task_list_id", "parent_task_id", "creator_id",
+    "is_active", "is_archived", "tags", "created_at",
+)
+
+
+def _copy_text(value: Any) -> str:
+    """A value in COPY text format"""
+    if value is None:
+        return "\\N"
+    return (str(value).replace("\\", "\\\\").replace("\t", "\\t")
+            .replace("\n", "\\n").replace("\r", "\\r"))
+
+
+def copy_rows(db: Session, table_name: str, columns: Sequence[str], rows: List[tuple]):
+    """COPY ``rows`` into ``table_name`` on the session's own connection and transaction"""
+    raw = db.connection().connection.dbapi_connection
+    if hasattr(raw, "run_async"):
+        # asyncpg behind an AsyncSession
+        raw.run_async(lambda conn: conn.copy_records_to_table(table_name, columns=list(columns), records=rows))
+        return
+    buffer = io.StringIO()
+    for row in rows:
+        buffer.write("\t".join(_copy_text(value) for value in row) + "\n")
+    buffer.seek(0)
+    with raw.cursor() as cursor:
+        cursor.copy_expert(f"COPY {table_name} ({', '.join(columns)}) FROM STDIN", buffer)
+
+
+def _insert_tasks(db: Session, rows: List[Dict[str, Any]]) -> List[int]:
+    """Insert ``rows`` in CHUNK_SIZE batches and return their ids in order"""
+    ids: List[int] = []
+    postgres = db.get_bind().dialect.name == "postgresql"
+    for chunk in chunks(rows):
+        if postgres:
+            chunk_ids = list(db.execute(
+                text("SELECT nextval(pg_get_serial_sequence('tasks', 'id')) FROM generate_series(1, :n)"),
+                {"n": len(chunk)}
+            ).scalars())
+            copy_rows(db, Task.__tablename__, CREATE_COLUMNS, [
+                tuple(task_id if column == "id" else row[column] for column in CREATE_COLUMNS)
+                for task_id, row in zip(chunk_ids, chunk)
+            ])
+        else:
+            chunk_ids = list(db.execute(
+                insert(Task).returning(Task.id, sort_by_parameter_order=True), list(chunk)
+            ).scalars())
+        ids.extend(chunk_ids)
+    return ids
+
+
+def _field_value(value: Any) -> str:
+    return value if isinstance(value, str) else json.dumps(value)
+
+
+def bulk_create(db: Session, user_id: int, tasks: List[Dict[str, Any]]) -> Tuple[List[Dict[str, Any]], Dict[int, Dict[str, Any]]]:
+    """Create ``tasks`` (TaskCreate dicts) in batches.
+
+    Unknown assignees and custom fields are skipped, as in create_task.
+    Returns a result per input row (by index) and, per project, the created
+    task ids and the users assigned to them. The caller commits.
+    """
+    allowed = accessible_projects(db, (task["project_id"] for task in tasks), user_id)
+    assignee_ids = {a for task in tasks for a in task.get("assignee_ids") or ()}
+    field_ids = {int(f) for task in tasks for f in (task.get("custom_field_values") or {}) if str(f).isdigit()}
+    known_users = set()
+    for chunk in chunks(sorted(assignee_ids)):
+        known_users.update(db.execute(select(User.id).where(User.id.in_(chunk))).scalars())
+    known_fields = set()
+    for chunk in chunks(sorted(field_ids)):
+        known_fields.update(db.execute(select(CustomField.id).where(CustomField.id.in_(chunk))).scalars())
+
+    now = datetime.utcnow()
+    indexes, rows = [], []
+    for index, task in enumerate(tasks):
+        if task["project_id"] not in allowed:
+            continue
+        indexes.append(index)
+        rows.append({
+            "title": task["title"],
+            "description": task.get("description"),
+            "status": _column_value(task.get("status") or TaskStatus.TODO),
+            "priority": _column_value(task.get("priority") or TaskPriority.MEDIUM),
+            "position": task.get("position") or 0,
+            "estimated_hours": task.get("estimated_hours"),
+            "actual_hours": 0,
+            "due_date": task.get("due_date"),
+            "start_date": task.get("start_date"),
+            "project_id": task["project_id"],
+            "task_list_id": task.get("task_list_id"),
+            "parent_task_id": task.get("parent_task_id"),
+            "creator_id": user_id,
+            "is_active": True,
+            "is_archived": False,
+            "tags": _column_value(task.get("tags") or []),
+            "created_at": now,
+        })
+    ids = _insert_tasks(db, rows)
+
+    assignments, field_values = [], []
+    by_project: Dict[int, Dict[str, Any]] = defaultdict(lambda: {"task_ids": [], "assignee_ids": set()})
+    for index, task_id, row in zip(indexes, ids, rows):
+        task = tasks[index]
+        batch = by_project[row["project_id"]]
+        batch["task_ids"].append(task_id)
+        for assignee_id in dict.fromkeys(task.get("assignee_ids") or ()):
+            if assignee_id in known_users:
+                assignments.append({"task_id": task_id, "user_id": assignee_id})
+                batch["assignee_ids"].add(assignee_id)
+        for field_id, value in (task.get("custom_field_values") or {}).items():
+            if str(field_id).isdigit() and int(field_id) in known_fields:
+                field_values.append({"task_id": task_id, "field_id": int(field_id), "value": _field_value(value)})
+    for chunk in chunks(assignments):
+        db.execute(insert(task_assignee_association), list(chunk))
+    for chunk in chunks(field_values):
+        db.execute(insert(TaskCustomField), list(chunk))
+
+    if rows:
+        connection = db.connection()
+        apply_task_changes(connection, [
+            (None, (row["project_id"], row["created_at"], row["status"], row["priority"], True, None))
+            for row in rows
+        ])
+        users = {user_id}.union(*(batch["assignee_ids"] for batch in by_project.values()))
+        refresh_task_summaries(connection, users)
+
+    created = dict(zip(indexes, ids))
+    results = [
+        {"index": index, "status": CREATED, "id": created[index]} if index in created
+        else {"index": index, "status": FORBIDDEN}
+        for index in range(len(tasks))
+    ]
+    return results, dict(by_project)
@@ -0,0 +1,262 @@
+# backend/app/services/dependency_graph.py
+"""
+Task dependency graph.
+
+An edge predecessor -> successor means the successor depends on (is blocked
+by) the predecessor. A project's graph is every edge touching one of its
+tasks, loaded with a single query together with the project of each
+endpoint. Traversals that step onto another project's task load that
+project's edges too, so dependencies across projects are followed without
+a query per node.
+
+Cycle checks are one iterative three-colour DFS over the union of the
+existing edges and the proposed ones: O(V + E) however many edges are added
+at once. Write paths always validate against freshly loaded edges; the
+per-project cache (DEPENDENCY_GRAPH_CACHE_TTL) serves reads and is evicted
+after any commit that adds or removes an edge.
+"""
+
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import event, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, aliased
+
+from app.core.config import settings
+from app.models.models import Task, TaskDependency
+
+# (predecessor_id, successor_id, predecessor_project_id, successor_project_id)
+EdgeRow = Tuple[int, int, int, int]
+Edge = Tuple[int, int]
+
+WHITE, GRAY, BLACK = 0, 1, 2
+
+
+class DependencyGraph:
+    """Adjacency sets for the edges of one or more projects"""
+
+    def __init__(self):
+        self.successors: Dict[int, Set[int]] = defaultdict(set)
+        self.predecessors: Dict[int, Set[int]] = defaultdict(set)
+        self.project_of: Dict[int, int] = {}
+        self.projects: Set[int] = set()
+
+    def add_project(self, project_id: int, rows: Iterable[EdgeRow]):
+        self.projects.add(project_id)
+        for predecessor_id, successor_id, predecessor_project, successor_project in rows:
+            self.project_of[predecessor_id] = predecessor_project
+            self.project_of[successor_id] = successor_project
+            self.add_edge(predecessor_id, successor_id)
+
+    def add_edge(self, predecessor_id: int, successor_id: int):
+        self.successors[predecessor_id].add(successor_id)
+        self.predecessors[successor_id].add(predecessor_id)
+
+    def has_edge(self, predecessor_id: int, successor_id: int) -> bool:
+        return successor_id in self.successors.get(predecessor_id, ())
+
+    def missing_project(self, node: int) -> Optional[int]:
+        """Project whose edges must be loaded before ``node``'s neighbours are known"""
+        project_id = self.project_of.get(node)
+        if project_id is not None and project_id not in self.projects:
+            return project_id
+        return None
+
+
+class _NeedProject(Exception):
+    def __init__(self, project_id: int):
+        self.project_id = project_id
+
+
+def _find_cycle(graph: DependencyGraph, starts: Iterable[int]) -> Optional[List[int]]:
+    """Iterative three-colour DFS from ``starts``; returns one cycle as a node path"""
+    color: Dict[int, int] = defaultdict(int)
+    parent: Dict[int, int] = {}
+    for start in starts:
+        if color[start] != WHITE:
+            continue
+        color[start] = GRAY
+        stack = [(start, iter(_neighbours(graph, start)))]
+        while stack:
+            node, children = stack[-1]
+            for child in children:
+                if color[child] == WHITE:
+                    color[child] = GRAY
+                    parent[child] = node
+                    stack.append((child, iter(_neighbours(graph, child))))
+                    break
+                if color[child] == GRAY:
+                    # Back edge node -> child closes a cycle
+                    cycle = [node]
+                    while cycle[-1] != child:
+                        cycle.append(parent[cycle[-1]])
+                    cycle.reverse()
+                    return cycle + [child]
+            else:
+                color[node] = BLACK
+                stack.pop()
+    return None
+
+
+def _neighbours(graph: DependencyGraph, node: int) -> List[int]:
+    missing = graph.missing_project(node)
+    if missing is not None:
+        raise _NeedProject(missing)
+    return list(graph.successors.get(node, ()))
+
+
+# ----- loading -----
+
+def project_edges_query(project_id: int):
+    predecessor = aliased(Task)
+    successor = aliased(Task)
+    return (
+        select(
+            TaskDependency.predecessor_id, TaskDependency.successor_id,
+            predecessor.project_id, successor.project_id)
+        .join(predecessor, predecessor.id == TaskDependency.predecessor_id)
+        .join(successor, successor.id == TaskDependency.successor_id)
+        .where(or_(predecessor.project_id == project_id, successor.project_id == project_id))
+    )
+
+
+def load_project_edges(db: Session, project_id: int) -> List[EdgeRow]:
+    rows = [tuple(row) for row in db.execute(project_edges_query(project_id))]
+    graph_cache.put(project_id, rows)
+    return rows
+
+
+async def load_project_edges_async(db: AsyncSession, project_id: int) -> List[EdgeRow]:
+    rows = [tuple(row) for row in await db.execute(project_edges_query(project_id))]
+    graph_cache.put(project_id, rows)
+    return rows
+
+
+def project_graph(db: Session, project_id: int) -> DependencyGraph:
+    """Cached graph of ``project_id`` plus any projects its edges lead into"""
+    graph = DependencyGraph()
+    pending = [project_id]
+    while pending:
+        current = pending.pop()
+        if current in graph.projects:
+            continue
+        rows = graph_cache.get(current)
+        if rows is None:
+            rows = load_project_edges(db, current)
+        graph.add_project(current, rows)
+        pending.extend({p for row in rows for p in row[2:]} - graph.projects)
+    return graph
+
+
+# ----- validation -----
+
+async def find_cycle_async(db: AsyncSession, edges: List[Edge], project_of: Dict[int, int]) -> Optional[List[int]]:
+    """First cycle that adding ``edges`` would create, against freshly loaded edges.
+
+    ``project_of`` maps every endpoint of ``edges`` to its project.
+    """
+    graph = DependencyGraph()
+    graph.project_of.update(project_of)
+    for project_id in {project_of[node] for edge in edges for node in edge}:
+        graph.add_project(project_id, await load_project_edges_async(db, project_id))
+    for predecessor_id, successor_id in edges:
+        graph.add_edge(predecessor_id, successor_id)
+    # Any new cycle runs through a new edge, hence through its predecessor
+    starts = [predecessor_id for predecessor_id, _ in edges]
+    while True:
+        try:
+            return _find_cycle(graph, starts)
+        except _NeedProject as need:
+            graph.add_project(need.project_id, await load_project_edges_async(db, need.project_id))
+
+
+def validate_edges(edges: List[Edge], existing: Set[Edge]) -> List[Optional[str]]:
+    """Per-edge errors that do not need the graph: self loops and duplicates"""
+    errors: List[Optional[str]] = []
+    seen: Set[Edge] = set()
+    for edge in edges:
+        if edge[0] == edge[1]:
+            errors.append("A task cannot depend on itself")
+        elif edge in existing:
+            errors.append("Dependency already exists")
+        elif edge in seen:
+            errors.append("Duplicate dependency in request")
+        else:
+            errors.append(None)
+        seen.add(edge)
+    return errors
+
+
+# ----- cache -----
+
+class GraphCache:
+    """Bounded TTL cache of project_id -> edge rows"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, Tuple[float, List[EdgeRow]]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, project_id: int) -> Optional[List[EdgeRow]]:
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                del self._entries[project_id]
+                return None
+            return entry[1]
+
+    def put(self, project_id: int, rows: List[EdgeRow]):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[project_id] = (time.time() + self.ttl_seconds, rows)
+
+    def evict_projects(self, project_ids: Iterable[int]):
+        with self._lock:
+            for project_id in project_ids:
+                self._entries.pop(project_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+graph_cache = GraphCache(
+    max_entries=settings.DEPENDENCY_GRAPH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.DEPENDENCY_GRAPH_CACHE_TTL
+)
+
+
+def invalidate_projects(project_ids: Iterable[int]):
+    """Drop cached graphs; for code that changes dependencies with set-based statements"""
+    graph_cache.evict_projects(project_ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_dependency_changes(session, flush_context):
+    task_ids = set()
+    for obj in list(session.new) + list(session.deleted):
+        if isinstance(obj, TaskDependency):
+            task_ids.update((obj.predecessor_id, obj.successor_id))
+    if not task_ids:
+        return
+    projects = session.info.setdefault("dependency_graph_projects", set())
+    projects.update(session.connection().execute(
+        select(Task.project_id).where(Task.id.in_(task_ids))
+    ).scalars())
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_dependency_graphs(session):
+    invalidate_projects(session.info.pop("dependency_graph_projects", ()))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_dependency_changes(session):
+    session.info.pop("dependency_graph_projects", None)
@@ -0,0 +1,71 @@
+# backend/app/services/notifications.py
+"""
+Notification fan-out.
+
+The recipients of an event are deduplicated once and all their
+Notification rows are inserted with a single statement in the caller's
+transaction. Pushing to the recipients' WebSocket rooms happens after the
+commit and concurrently (see push_notifications in main). Fan-outs larger
+than NOTIFICATION_BACKGROUND_THRESHOLD recipients are meant to run after the
+response, on their own session.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.models import Notification
+
+
+def notification_recipients(users: Iterable[Any], exclude: Optional[int] = None) -> List[int]:
+    """Distinct ids of ``users`` (objects or ids) in first-seen order, without ``exclude``"""
+    ids = (getattr(user, "id", user) for user in users if user is not None)
+    return [user_id for user_id in dict.fromkeys(ids) if user_id != exclude]
+
+
+async def insert_notifications(
+    db: AsyncSession,
+    recipient_ids: List[int],
+    title: str,
+    message: str,
+    type: str,
+    entity_type: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    action_url: Optional[str] = None
+) -> List[Dict[str, Any]]:
+    """Insert one notification per recipient; returns the push payloads. The caller commits."""
+    if not recipient_ids:
+        return []
+    created_at = datetime.utcnow()
+    ids = (await db.execute(
+        insert(Notification).returning(Notification.id, sort_by_parameter_order=True),
+        [
+            {
+                "recipient_id": recipient_id,
+                "title": title,
+                "message": message,
+                "type": type,
+                "entity_type": entity_type,
+                "entity_id": entity_id,
+                "is_read": False,
+                "created_at": created_at,
+            }
+            for recipient_id in recipient_ids
+        ]
+    )).scalars().all()
+    return [
+        {
+            "recipient_id": recipient_id,
+            "id": notification_id,
+            "title": title,
+            "message": message,
+            "type": type,
+            "entity_type": entity_type,
+            "entity_id": entity_id,
+            "action_url": action_url,
+            "created_at": created_at.isoformat(),
+        }
+        for recipient_id, notification_id in zip(recipient_ids, ids)
+    ]
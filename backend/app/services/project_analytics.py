@@ -0,0 +1,434 @@
+# backend/app/services/project_analytics.py
+"""
+Daily analytics rollups per project.
+
+project_daily_stats holds one row per (project, day, metric):
+
+    tasks, status:<status>, priority:<priority>
+        active tasks, bucketed by the day they were created
+    completed
+        done tasks, bucketed by the day they were completed
+    hours, time_entries
+        logged time, bucketed by the entry date
+
+Rows are adjusted by delta on every flush that creates, deletes or changes a
+task or time entry, so analytics are sums over a handful of rows instead of
+scans of the project's tasks.
+
+project_analytics_coverage records, per project, the first day from which the
+rollups are complete. New projects are covered from the start; existing ones
+become covered when backfilled (see backfill_analytics.py). Anything before
+that day is answered with a live scan, so analytics stay correct while a
+backfill is pending.
+"""
+
+from collections import Counter, defaultdict
+from datetime import date, datetime, time, timedelta
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import and_, event, func, inspect, select, text, update
+from sqlalchemy.orm import Session
+
+from app.db.incremental import UPSERTS, scalar_before_after, track_previous_values
+from app.models.models import (
+    Project, ProjectAnalyticsCoverage, ProjectDailyStat, Task, TaskPriority, TaskStatus, TimeEntry)
+
+TASKS = "tasks"
+COMPLETED = "completed"
+HOURS = "hours"
+TIME_ENTRIES = "time_entries"
+
+DONE = TaskStatus.DONE.value
+IN_PROGRESS = TaskStatus.IN_PROGRESS.value
+
+stat_table = ProjectDailyStat.__table__
+coverage_table = ProjectAnalyticsCoverage.__table__
+
+DayRange = Tuple[Optional[date], Optional[date]]  # [since, until), None is unbounded
+StatKey = Tuple[int, date, str]
+
+
+
+def _enum_value(value):
+    return getattr(value, "value", value)
+
+
+def status_metric(status) -> str:
+    return f"status:{_enum_value(status) or TaskStatus.TODO.value}"
+
+
+def priority_metric(priority) -> str:
+    return f"priority:{_enum_value(priority) or TaskPriority.MEDIUM.value}"
+
+
+def _as_date(value) -> Optional[date]:
+    """Normalise datetimes and SQLite's func.date() strings to a date"""
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, str):
+        return date.fromisoformat(value[:10])
+    return value
+
+
+def _today() -> date:
+    return datetime.utcnow().date()
+
+
+def _day_bounds(column, since: Optional[date], until: Optional[date]) -> List[Any]:
+    clauses = []
+    if since is not None:
+        clauses.append(column >= datetime.combine(since, time.min))
+    if until is not None:
+        clauses.append(column < datetime.combine(until, time.min))
+    return clauses
+
+
+def _split(since: Optional[date], until: Optional[date], covered_from: Optional[date]):
+    """Split [since, until) into the part served by rollups and the part scanned live"""
+    if covered_from is None:
+        return None, (since, until)
+    lower = since or date.min
+    live = None
+    if lower < covered_from and (until is None or lower < until):
+        live = (since, covered_from if until is None else min(until, covered_from))
+    rollup_since = max(lower, covered_from)
+    rollup = (rollup_since, until) if until is None or rollup_since < until else None
+    return rollup, live
+
+
+# ----- reads -----
+
+def get_coverage(db: Session, project_id: int) -> Optional[date]:
+    return _as_date(db.execute(
+        select(coverage_table.c.covered_from).where(coverage_table.c.project_id == project_id)
+    ).scalar())
+
+
+def rollup_metrics(db: Session, project_id: int, since: Optional[date], until: Optional[date]) -> Counter:
+    statement = select(stat_table.c.metric, func.sum(stat_table.c.value)).where(
+        stat_table.c.project_id == project_id,
+        stat_table.c.day >= since
+    )
+    if until is not None:
+        statement = statement.where(stat_table.c.day < until)
+    return Counter({metric: value for metric, value in db.execute(statement.group_by(stat_table.c.metric))})
+
+
+def live_task_metrics(db: Session, project_id: int, since: Optional[date], until: Optional[date]) -> Counter:
+    metrics = Counter()
+    rows = db.execute(
+        select(Task.status, Task.priority, func.count(Task.id))
+        .where(Task.project_id == project_id, Task.is_active == True, *_day_bounds(Task.created_at, since, until))
+        .group_by(Task.status, Task.priority)
+    )
+    for status, priority, count in rows:
+        metrics[TASKS] += count
+        metrics[status_metric(status)] += count
+        metrics[priority_metric(priority)] += count
+    return metrics
+
+
+def live_time_metrics(db: Session, project_id: int, since: Optional[date], until: Optional[date]) -> Counter:
+    hours, entries = db.execute(
+        select(func.coalesce(func.sum(TimeEntry.hours), 0), func.count(TimeEntry.id))
+        .join(Task, TimeEntry.task_id == Task.id)
+        .where(Task.project_id == project_id, *_day_bounds(TimeEntry.date, since, until))
+    ).one()
+    return Counter({HOURS: float(hours), TIME_ENTRIES: entries})
+
+
+def project_metrics(db: Session, project_id: int, since: Optional[date], until: Optional[date],
+                    covered_from: Optional[date], include_time: bool = True) -> Counter:
+    rollup, live = _split(since, until, covered_from)
+    metrics = Counter()
+    if rollup is not None:
+        metrics.update(rollup_metrics(db, project_id, *rollup))
+    if live is not None:
+        metrics.update(live_task_metrics(db, project_id, *live))
+        if include_time:
+            metrics.update(live_time_metrics(db, project_id, *live))
+    return metrics
+
+
+def completion_timeline(db: Session, project_id: int, since: date, covered_from: Optional[date]) -> List[Tuple[date, int]]:
+    rollup, live = _split(since, None, covered_from)
+    counts: Dict[date, float] = defaultdict(float)
+    if rollup is not None:
+        rows = db.execute(select(stat_table.c.day, stat_table.c.value).where(
+            stat_table.c.project_id == project_id,
+            stat_table.c.metric == COMPLETED,
+            stat_table.c.day >= rollup[0]
+        ))
+        for day, value in rows:
+            counts[_as_date(day)] += value
+    if live is not None:
+        day = func.date(Task.completed_at)
+        rows = db.execute(
+            select(day, func.count(Task.id))
+            .where(Task.project_id == project_id, Task.status == DONE, *_day_bounds(Task.completed_at, *live))
+            .group_by(day)
+        )
+        for value, count in rows:
+            counts[_as_date(value)] += count
+    return [(day, int(round(count))) for day, count in sorted(counts.items()) if round(count)]
+
+
+def overdue_count(db: Session, project_id: int, since: Optional[date], until: Optional[date]) -> int:
+    return db.execute(select(func.count(Task.id)).where(
+        Task.project_id == project_id,
+        Task.is_active == True,
+        Task.due_date < datetime.utcnow(),
+        Task.status != DONE,
+        *_day_bounds(Task.created_at, since, until)
+    )).scalar()
+
+
+def _distribution(metrics: Counter, prefix: str, label: str) -> List[Dict[str, Any]]:
+    return [
+        {label: metric[len(prefix):], "count": int(round(value))}
+        for metric, value in sorted(metrics.items())
+        if metric.startswith(prefix) and round(value)
+    ]
+
+
+def project_analytics(db: Session, project_id: int, start_date: Optional[datetime] = None,
+                      end_date: Optional[datetime] = None) -> Dict[str, Any]:
+    """Analytics for a project; the summary is limited to tasks created in [start_date, end_date]"""
+    covered_from = get_coverage(db, project_id)
+    since = start_date.date() if start_date else None
+    until = end_date.date() + timedelta(days=1) if end_date else None
+
+    overall = project_metrics(db, project_id, None, None, covered_from)
+    if since is None and until is None:
+        ranged = overall
+    else:
+        ranged = project_metrics(db, project_id, since, until, covered_from, include_time=False)
+
+    total_tasks = int(round(ranged[TASKS]))
+    completed_tasks = int(round(ranged[status_metric(DONE)]))
+    hours, entries = overall[HOURS], overall[TIME_ENTRIES]
+    timeline = completion_timeline(db, project_id, _today() - timedelta(days=30), covered_from)
+
+    return {
+        "project_id": project_id,
+        "summary": {
+            "total_tasks": total_tasks,
+            "completed_tasks": completed_tasks,
+            "in_progress_tasks": int(round(ranged[status_metric(IN_PROGRESS)])),
+            "overdue_tasks": overdue_count(db, project_id, since, until),
+            "completion_rate": round((completed_tasks / total_tasks * 100) if total_tasks > 0 else 0, 2)
+        },
+        "status_distribution": _distribution(overall, "status:", "status"),
+        "priority_distribution": _distribution(overall, "priority:", "priority"),
+        "time_tracking": {
+            "total_hours": float(hours),
+            "average_hours": float(hours / entries) if entries else 0
+        },
+        "completion_timeline": [{"date": str(day), "count": count} for day, count in timeline]
+    }
+
+
+# ----- backfill -----
+
+def backfill_project(connection, project_id: int, since: Optional[date] = None) -> int:
+    """Recompute the rollups of ``project_id`` for days >= ``since`` (all history when None)
+    and mark them covered. Returns the number of rows written.
+
+    On PostgreSQL the stats table is locked against concurrent deltas for the
+    duration of the transaction, so writes racing the backfill are applied on
+    top of it rather than lost.
+    """
+    if connection.dialect.name == "postgresql":
+        connection.execute(text("LOCK TABLE project_daily_stats IN SHARE ROW EXCLUSIVE MODE"))
+
+    delete = stat_table.delete().where(stat_table.c.project_id == project_id)
+    if since is not None:
+        delete = delete.where(stat_table.c.day >= since)
+    connection.execute(delete)
+
+    values: Dict[Tuple[date, str], float] = defaultdict(float)
+
+    created = func.date(Task.created_at)
+    rows = connection.execute(
+        select(created, Task.status, Task.priority, func.count(Task.id))
+        .where(Task.project_id == project_id, Task.is_active == True, *_day_bounds(Task.created_at, since, None))
+        .group_by(created, Task.status, Task.priority)
+    )
+    for day, status, priority, count in rows:
+        day = _as_date(day)
+        values[(day, TASKS)] += count
+        values[(day, status_metric(status))] += count
+        values[(day, priority_metric(priority))] += count
+
+    completed = func.date(Task.completed_at)
+    rows = connection.execute(
+        select(completed, func.count(Task.id))
+        .where(Task.project_id == project_id, Task.status == DONE, *_day_bounds(Task.completed_at, since, None))
+        .group_by(completed)
+    )
+    for day, count in rows:
+        values[(_as_date(day), COMPLETED)] += count
+
+    logged = func.date(TimeEntry.date)
+    rows = connection.execute(
+        select(logged, func.sum(TimeEntry.hours), func.count(TimeEntry.id))
+        .join(Task, TimeEntry.task_id == Task.id)
+        .where(Task.project_id == project_id, *_day_bounds(TimeEntry.date, since, None))
+        .group_by(logged)
+    )
+    for day, hours, count in rows:
+        values[(_as_date(day), HOURS)] += float(hours or 0)
+        values[(_as_date(day), TIME_ENTRIES)] += count
+
+    if values:
+        connection.execute(stat_table.insert(), [
+            {"project_id": project_id, "day": day, "metric": metric, "value": value}
+            for (day, metric), value in values.items()
+            if day is not None
+        ])
+
+    covered_from = since or date.min
+    existing = _as_date(connection.execute(
+        select(coverage_table.c.covered_from).where(coverage_table.c.project_id == project_id)
+    ).scalar())
+    if existing is None:
+        connection.execute(coverage_table.insert().values(project_id=project_id, covered_from=covered_from))
+    elif covered_from < existing:
+        connection.execute(
+            update(coverage_table)
+            .where(coverage_table.c.project_id == project_id)
+            .values(covered_from=covered_from)
+        )
+    return len(values)
+
+
+# ----- incremental maintenance -----
+
+TASK_KEYS = ("project_id", "created_at", "status", "priority", "is_active", "completed_at")
+ENTRY_KEYS = ("task_id", "date", "hours")
+
+
+# Flush-time history must say which bucket a row was counted in before the change
+track_previous_values(*(getattr(Task, key) for key in TASK_KEYS), *(getattr(TimeEntry, key) for key in ENTRY_KEYS))
+
+
+def _task_contribution(project_id, created_at, status, priority, active, completed_at) -> Dict[StatKey, float]:
+    contribution: Dict[StatKey, float] = defaultdict(float)
+    if project_id is None:
+        return contribution
+    if active is not False:
+        # created_at is a server default, so a task being inserted is dated today
+        day = _as_date(created_at) or _today()
+        for metric in (TASKS, status_metric(status), priority_metric(priority)):
+            contribution[(project_id, day, metric)] += 1
+    if _enum_value(status) == DONE and completed_at is not None:
+        contribution[(project_id, _as_date(completed_at), COMPLETED)] += 1
+    return contribution
+
+
+def _entry_contribution(session, task, task_id, logged_at, hours) -> Dict[StatKey, float]:
+    if task is None and task_id is not None:
+        task = session.get(Task, task_id)
+    if task is None or task.project_id is None:
+        return {}
+    day = _as_date(logged_at) or _today()
+    return {(task.project_id, day, HOURS): float(hours or 0), (task.project_id, day, TIME_ENTRIES): 1}
+
+
+def _row_change(session, obj, keys):
+    state = inspect(obj)
+    deleted = obj in session.deleted
+    if not (state.pending or deleted or any(state.attrs[key].history.has_changes() for key in keys)):
+        return None
+    values = [scalar_before_after(state, key) for key in keys]
+    before = None if state.pending else [value[0] for value in values]
+    after = None if deleted else [value[1] for value in values]
+    return state, before, after
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_rollup_deltas(session, flush_context, instances):
+    deltas: Dict[StatKey, float] = session.info.setdefault("analytics_deltas", defaultdict(float))
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if isinstance(obj, Task):
+            change = _row_change(session, obj, TASK_KEYS)
+            if change is None:
+                continue
+            _, before, after = change
+            before = _task_contribution(*before) if before else {}
+            after = _task_contribution(*after) if after else {}
+        elif isinstance(obj, TimeEntry):
+            change = _row_change(session, obj, ENTRY_KEYS)
+            if change is None:
+                continue
+            state, before, after = change
+            before = _entry_contribution(session, None, *before) if before else {}
+            # An entry added together with its task has no task_id until the flush
+            task = state.dict.get("task") if after and after[0] is None else None
+            after = _entry_contribution(session, task, *after) if after else {}
+        else:
+            continue
+        for key, value in before.items():
+            deltas[key] -= value
+        for key, value in after.items():
+            deltas[key] += value
+
+
+def _add_to_stat(connection, project_id: int, day: date, metric: str, delta: float):
+    upsert = UPSERTS.get(connection.dialect.name)
+    if upsert is not None:
+        statement = upsert(stat_table).values(project_id=project_id, day=day, metric=metric, value=delta)
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[stat_table.c.project_id, stat_table.c.day, stat_table.c.metric],
+            set_={"value": stat_table.c.value + statement.excluded.value}
+        ))
+        return
+    result = connection.execute(
+        update(stat_table)
+        .where(and_(stat_table.c.project_id == project_id, stat_table.c.day == day, stat_table.c.metric == metric))
+        .values(value=stat_table.c.value + delta)
+    )
+    if result.rowcount == 0:
+        connection.execute(stat_table.insert().values(project_id=project_id, day=day, metric=metric, value=delta))
+
+
+def _apply_deltas(connection, deltas: Dict[StatKey, float]):
+    for (project_id, day, metric), delta in deltas.items():
+        if delta:
+            _add_to_stat(connection, project_id, day, metric, delta)
+
+
+def apply_task_changes(connection, changes: Iterable[Tuple[Optional[tuple], Optional[tuple]]]):
+    """Update rollups for tasks written by set-based statements, which bypass the ORM events.
+
+    Each change is a (before, after) pair of TASK_KEYS value tuples; before is
+    None for an inserted task and after is None for a deleted one.
+    """
+    deltas: Dict[StatKey, float] = defaultdict(float)
+    for before, after in changes:
+        for key, value in (_task_contribution(*before) if before else {}).items():
+            deltas[key] -= value
+        for key, value in (_task_contribution(*after) if after else {}).items():
+            deltas[key] += value
+    _apply_deltas(connection, deltas)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_rollup_deltas(session, flush_context):
+    deltas = session.info.pop("analytics_deltas", None)
+    new_projects = [obj.id for obj in session.new if isinstance(obj, Project)]
+    if not deltas and not new_projects:
+        return
+    connection = session.connection()
+    for project_id in new_projects:
+        # Nothing predates a new project, so its rollups are complete from the start
+        connection.execute(coverage_table.insert().values(project_id=project_id, covered_from=date.min))
+    _apply_deltas(connection, deltas or {})
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rollup_deltas(session):
+    session.info.pop("analytics_deltas", None)
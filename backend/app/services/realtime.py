@@ -0,0 +1,463 @@
+# backend/app/services/realtime.py
+"""
+WebSocket rooms and the backplane that spans workers.
+
+ConnectionManager keeps the sockets connected to this worker, grouped by
+room. A broadcast is encoded once, delivered to the local sockets of the
+room and published on the backplane, which hands it to every other worker
+that has sockets in that room. Workers subscribe to a room when its first
+local socket connects and unsubscribe when the last one leaves.
+
+WS_BACKPLANE selects the backplane:
+
+    memory  single process; workers sharing an InProcessHub see each other (tests)
+    redis   Redis pub/sub on REDIS_URL, one channel per room
+    socket  a hub process on the Unix socket WS_BACKPLANE_SOCKET (python ws_hub.py)
+
+A backplane never echoes a message back to the worker that published it.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import uuid
+from collections import defaultdict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Set
+
+from fastapi import WebSocket
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+Deliver = Callable[[str, str], Awaitable[None]]
+
+CHANNEL_PREFIX = "ws:room:"
+CONTROL_CHANNEL = "ws:control"
+
+
+class Backplane:
+    """Carries room messages between workers"""
+
+    async def start(self, deliver: Deliver):
+        """Begin passing messages published by other workers to ``deliver(room, data)``"""
+
+    async def stop(self):
+        pass
+
+    async def subscribe(self, room: str):
+        pass
+
+    async def unsubscribe(self, room: str):
+        pass
+
+    async def publish(self, room: str, data: str):
+        pass
+
+
+class InProcessHub:
+    """Routes messages between InProcessBackplanes of the same process"""
+
+    def __init__(self):
+        self.rooms: Dict[str, Set["InProcessBackplane"]] = defaultdict(set)
+
+
+class InProcessBackplane(Backplane):
+    """Backplane for a single worker; several sharing one hub stand in for workers in tests"""
+
+    def __init__(self, hub: Optional[InProcessHub] = None):
+        self.hub = hub or InProcessHub()
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver):
+        self._deliver = deliver
+
+    async def stop(self):
+        for members in self.hub.rooms.values():
+            members.discard(self)
+
+    async def subscribe(self, room: str):
+        self.hub.rooms[room].add(self)
+
+    async def unsubscribe(self, room: str):
+        members = self.hub.rooms.get(room)
+        if members is not None:
+            members.discard(self)
+            if not members:
+                del self.hub.rooms[room]
+
+    async def publish(self, room: str, data: str):
+        for member in list(self.hub.rooms.get(room, ())):
+            if member is not self and member._deliver is not None:
+                await member._deliver(room, data)
+
+
+class RedisBackplane(Backplane):
+    """Redis pub/sub; each message is prefixed with the publishing worker's id to skip echoes"""
+
+    def __init__(self, redis_url: str):
+        import redis.asyncio as redis
+
+        self._client = redis.Redis.from_url(redis_url)
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+        self._origin = uuid.uuid4().hex
+        self._listener: Optional[asyncio.Task] = None
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver):
+        self._deliver = deliver
+        # get_message needs a subscribed connection; rooms come and go, this channel stays
+        await self._pubsub.subscribe(CONTROL_CHANNEL)
+        self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            self._listener = None
+        await self._pubsub.aclose()
+        await self._client.aclose()
+
+    async def subscribe(self, room: str):
+        await self._pubsub.subscribe(CHANNEL_PREFIX + room)
+
+    async def unsubscribe(self, room: str):
+        await self._pubsub.unsubscribe(CHANNEL_PREFIX + room)
+
+    async def publish(self, room: str, data: str):
+        try:
+            await self._client.publish(CHANNEL_PREFIX + room, f"{self._origin}|{data}")
+        except Exception as e:
+            # Local sockets already have the message; other workers miss this one
+            logger.error(f"WebSocket backplane publish failed: {e}")
+
+    async def _listen(self):
+        while True:
+            try:
+                message = await self._pubsub.get_message(timeout=1.0)
+                if message is None:
+                    continue
+                channel = message["channel"].decode()
+                if not channel.startswith(CHANNEL_PREFIX):
+                    continue
+                origin, _, data = message["data"].decode().partition("|")
+                if origin != self._origin:
+                    await self._deliver(channel[len(CHANNEL_PREFIX):], data)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"WebSocket backplane receive failed: {e}")
+                await asyncio.sleep(1)
+
+
+class SocketBackplane(Backplane):
+    """Client of the Unix socket hub; newline-delimited JSON both ways"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._writer: Optional[asyncio.StreamWriter] = None
+        self._reader_task: Optional[asyncio.Task] = None
+        self._deliver: Optional[Deliver] = None
+
+    async def start(self, deliver: Deliver):
+        self._deliver = deliver
+        reader, self._writer = await asyncio.open_unix_connection(self.path)
+        self._reader_task = asyncio.create_task(self._read(reader))
+
+    async def stop(self):
+        if self._reader_task is not None:
+            self._reader_task.cancel()
+            self._reader_task = None
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    async def _send(self, frame: dict):
+        self._writer.write(json.dumps(frame).encode() + b"\n")
+        await self._writer.drain()
+
+    async def subscribe(self, room: str):
+        await self._send({"op": "subscribe", "room": room})
+
+    async def unsubscribe(self, room: str):
+        await self._send({"op": "unsubscribe", "room": room})
+
+    async def publish(self, room: str, data: str):
+        try:
+            await self._send({"op": "publish", "room": room, "data": data})
+        except (ConnectionError, AttributeError) as e:
+            logger.error(f"WebSocket backplane publish failed: {e}")
+
+    async def _read(self, reader: asyncio.StreamReader):
+        while True:
+            line = await reader.readline()
+            if not line:
+                logger.error("WebSocket backplane hub closed the connection")
+                return
+            frame = json.loads(line)
+            await self._deliver(frame["room"], frame["data"])
+
+
+class SocketHub:
+    """Relays published messages to the other clients subscribed to the room"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.rooms: Dict[str, Set[asyncio.StreamWriter]] = defaultdict(set)
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    async def start(self):
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        self._server = await asyncio.start_unix_server(self._serve, path=self.path)
+
+    async def stop(self):
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _serve(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                frame = json.loads(line)
+                room = frame["room"]
+                if frame["op"] == "subscribe":
+                    self.rooms[room].add(writer)
+                elif frame["op"] == "unsubscribe":
+                    self.rooms[room].discard(writer)
+                elif frame["op"] == "publish":
+                    out = json.dumps({"room": room, "data": frame["data"]}).encode() + b"\n"
+                    for peer in list(self.rooms.get(room, ())):
+                        if peer is not writer:
+                            peer.write(out)
+        except (ConnectionError, ValueError, KeyError) as e:
+            logger.warning(f"WebSocket backplane hub dropped a client: {e}")
+        finally:
+            for members in self.rooms.values():
+                members.discard(writer)
+            writer.close()
+
+
+def create_backplane(kind: str) -> Backplane:
+    if kind == "redis":
+        return RedisBackplane(settings.REDIS_URL)
+    if kind == "socket":
+        return SocketBackplane(settings.WS_BACKPLANE_SOCKET)
+    return InProcessBackplane()
+
+
+class Outbox:
+    """Bounded outbound queue of one socket, drained by its own writer task"""
+
+    def __init__(self, websocket: WebSocket, room: str, max_size: int):
+        self.websocket = websocket
+        self.room = room
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_size)
+        self.writer: Optional[asyncio.Task] = None
+
+    def offer(self, data: str) -> bool:
+        try:
+            self.queue.put_nowait(data)
+            return True
+        except asyncio.QueueFull:
+            return False
+
+    def replace_with(self, data: str) -> int:
+        """Swap everything queued for ``data``; returns how many messages were discarded"""
+        discarded = 0
+        while not self.queue.empty():
+            self.queue.get_nowait()
+            discarded += 1
+        self.queue.put_nowait(data)
+        return discarded
+
+
+class ConnectionManager:
+    """Local sockets by room; broadcasts are encoded once and queued per socket.
+
+    A socket whose queue is full is a slow consumer. With
+    WS_SLOW_CONSUMER_POLICY "resync" its backlog is replaced by a single
+    resync message (the client refetches); with "disconnect" it is closed so
+    it reconnects and refetches.
+    """
+
+    def __init__(self, backplane: Backplane, queue_size: int, slow_consumer_policy: str, heartbeat_interval: float):
+        self.active_connections: Dict[str, Dict[WebSocket, Outbox]] = {}
+        self.backplane = backplane
+        self.queue_size = queue_size
+        self.slow_consumer_policy = slow_consumer_policy
+        self.heartbeat_interval = heartbeat_interval
+        self._heartbeat: Optional[asyncio.Task] = None
+        self.sent = 0
+        self.dropped = 0  # messages discarded for slow consumers
+        self.resyncs = 0
+        self.slow_disconnects = 0
+
+    async def start(self):
+        await self.backplane.start(self._deliver_local)
+        self._heartbeat = asyncio.create_task(self._send_heartbeats())
+
+    async def stop(self):
+        if self._heartbeat is not None:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        await self.backplane.stop()
+
+    async def _send_heartbeats(self):
+        """One timer for every local socket instead of a sleeping coroutine per socket"""
+        data = json.dumps({"type": "heartbeat"})
+        while True:
+            await asyncio.sleep(self.heartbeat_interval)
+            for connections in list(self.active_connections.values()):
+                for outbox in list(connections.values()):
+                    # A socket with a full queue is already getting traffic
+                    outbox.offer(data)
+
+    async def connect(self, websocket: WebSocket, room: str):
+        await websocket.accept()
+        if room not in self.active_connections:
+            self.active_connections[room] = {}
+            await self.backplane.subscribe(room)
+        outbox = Outbox(websocket, room, self.queue_size)
+        outbox.writer = asyncio.create_task(self._write(outbox))
+        self.active_connections[room][websocket] = outbox
+
+    async def disconnect(self, websocket: WebSocket, room: str):
+        connections = self.active_connections.get(room)
+        if connections is None:
+            return
+        outbox = connections.pop(websocket, None)
+        if outbox is not None and outbox.writer is not asyncio.current_task():
+            outbox.writer.cancel()
+        if not connections:
+            del self.active_connections[room]
+            await self.backplane.unsubscribe(room)
+
+    async def broadcast_to_room(self, message: dict, room: str):
+        data = json.dumps(message)
+        await self._deliver_local(room, data)
+        await self.backplane.publish(room, data)
+
+    async def _deliver_local(self, room: str, data: str):
+        for outbox in list(self.active_connections.get(room, {}).values()):
+            if not outbox.offer(data):
+                await self._overflow(outbox)
+
+    async def _overflow(self, outbox: Outbox):
+        if self.slow_consumer_policy == "disconnect":
+            self.dropped += outbox.queue.qsize() + 1
+            self.slow_disconnects += 1
+            await self.disconnect(outbox.websocket, outbox.room)
+            asyncio.create_task(self._close(outbox.websocket))
+        else:
+            self.dropped += outbox.replace_with(json.dumps({"type": "resync", "data": {"room": outbox.room}})) + 1
+            self.resyncs += 1
+
+    async def _close(self, websocket: WebSocket):
+        try:
+            await websocket.close(code=1013)  # try again later
+        except Exception:
+            pass
+
+    async def _write(self, outbox: Outbox):
+        while True:
+            data = await outbox.queue.get()
+            try:
+                await outbox.websocket.send_text(data)
+            except Exception:
+                await self.disconnect(outbox.websocket, outbox.room)
+                return
+            self.sent += 1
+
+    def stats(self) -> Dict[str, int]:
+        depths = [outbox.queue.qsize() for room in self.active_connections.values() for outbox in room.values()]
+        return {
+            "rooms": len(self.active_connections),
+            "connections": len(depths),
+            "queued": sum(depths),
+            "max_queue_depth": max(depths, default=0),
+            "queue_size": self.queue_size,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "resyncs": self.resyncs,
+            "slow_disconnects": self.slow_disconnects,
+        }
+
+
+class EventCoalescer:
+    """Merges bursts of task change events per room into one tasks_changed message.
+
+    The first event for a room opens a window of ``window`` seconds; every
+    event for that room arriving before it closes is folded in, with task ids
+    deduplicated and their change kinds (changed fields, "created", ...)
+    merged. A window of 0 sends each event straight away.
+    """
+
+    def __init__(self, manager: ConnectionManager, window: float):
+        self.manager = manager
+        self.window = window
+        self._pending: Dict[str, Dict[str, Any]] = {}
+        self._timers: Dict[str, asyncio.Task] = {}
+        self.events = 0
+        self.messages = 0
+
+    async def add(self, room: str, changes: Dict[int, Iterable[str]], **context):
+        """Queue ``changes`` (task id -> change kinds) for ``room``; ``context`` is sent along (project_id)"""
+        self.events += 1
+        pending = self._pending.setdefault(room, {"changes": defaultdict(set), "context": {}})
+        for task_id, kinds in changes.items():
+            pending["changes"][task_id].update(kinds)
+        pending["context"].update(context)
+        if self.window <= 0:
+            await self._flush(room)
+        elif room not in self._timers:
+            self._timers[room] = asyncio.create_task(self._flush_later(room))
+
+    async def _flush_later(self, room: str):
+        await asyncio.sleep(self.window)
+        self._timers.pop(room, None)
+        await self._flush(room)
+
+    async def _flush(self, room: str):
+        pending = self._pending.pop(room, None)
+        if not pending:
+            return
+        changes = pending["changes"]
+        self.messages += 1
+        await self.manager.broadcast_to_room({
+            "type": "tasks_changed",
+            "data": {
+                **pending["context"],
+                "task_ids": sorted(changes),
+                "changes": {task_id: sorted(kinds) for task_id, kinds in sorted(changes.items())},
+            }
+        }, room)
+
+    async def flush_all(self):
+        """Send everything still waiting; for shutdown"""
+        for timer in self._timers.values():
+            timer.cancel()
+        self._timers.clear()
+        for room in list(self._pending):
+            await self._flush(room)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "window_ms": int(self.window * 1000),
+            "pending_rooms": len(self._pending),
+            "events": self.events,
+            "messages": self.messages,
+        }
+
+
+manager = ConnectionManager(
+    create_backplane(settings.WS_BACKPLANE),
+    queue_size=settings.WS_SEND_QUEUE_SIZE,
+    slow_consumer_policy=settings.WS_SLOW_CONSUMER_POLICY,
+    heartbeat_interval=settings.WS_HEARTBEAT_INTERVAL
+)
+task_events = EventCoalescer(manager, window=settings.WS_COALESCE_WINDOW_MS / 1000)
@@ -0,0 +1,354 @@
+# backend/app/services/search.py
+"""
+Full-text search over tasks, projects and comments.
+
+Three interchangeable backends answer the same queries:
+
+    PostgresSearch  a generated, weighted tsvector column per table with a
+                    GIN index; ranked with ts_rank_cd, highlighted with
+                    ts_headline
+    SqliteSearch    external-content FTS5 tables kept in sync by triggers;
+                    ranked with bm25, highlighted with highlight()/snippet()
+    LikeSearch      the original ILIKE '%q%' scan, used when neither index is
+                    available (e.g. a SQLite build without FTS5)
+
+Both index backends are maintained by the database itself (generated
+columns, triggers), so every write path, including set-based statements,
+keeps them in sync. The index is created by migrate_database.py (step 12),
+never at startup: adding the generated column rewrites the table under an
+exclusive lock. At startup init_search() only checks that the index exists
+and chooses the backend, falling back to the scan until the migration has
+run; SEARCH_BACKEND=like forces the scan.
+
+Matches are wrapped in <mark></mark> in each result's "highlight" map. The
+highlighted text is not HTML-escaped.
+"""
+
+import logging
+import re
+from typing import Any, Dict, List, Optional, Sequence
+
+from sqlalchemy import bindparam, column, desc, exists, func, literal_column, or_, select, table, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.models.models import (
+    Comment, Project, Task, task_assignee_association, task_watcher_association, user_project_association)
+
+logger = logging.getLogger(__name__)
+
+MARK_START = "<mark>"
+MARK_END = "</mark>"
+TERM = re.compile(r"\w+", re.UNICODE)
+
+
+class SearchTarget:
+    """A searchable table: the columns matched (in weight order) and returned"""
+
+    def __init__(self, name: str, model, fields: Sequence[str], columns: Sequence[str]):
+        self.name = name
+        self.model = model
+        self.fields = list(fields)
+        self.columns = list(columns)
+
+    @property
+    def table_name(self) -> str:
+        return self.model.__tablename__
+
+    def output_columns(self):
+        return [getattr(self.model, name) for name in self.columns]
+
+
+TARGETS = {
+    "tasks": SearchTarget(
+        "tasks", Task, ("title", "description"),
+        ("id", "title", "description", "project_id", "status", "priority")),
+    "projects": SearchTarget(
+        "projects", Project, ("name", "description"),
+        ("id", "name", "description", "color", "workspace_id")),
+    "comments": SearchTarget(
+        "comments", Comment, ("content",),
+        ("id", "content", "task_id", "author_id", "created_at")),
+}
+
+
+def search_terms(q: str) -> List[str]:
+    return TERM.findall(q or "")
+
+
+def encode_offset(offset: int) -> str:
+    return encode_cursor([offset])
+
+
+def decode_offset(cursor: Optional[str]) -> int:
+    """Result offset carried by a search cursor; ranked results are paged by offset"""
+    if not cursor:
+        return 0
+    offset = decode_cursor(cursor, 1)[0]
+    if not isinstance(offset, int) or offset < 0:
+        raise InvalidCursor("Malformed cursor")
+    return offset
+
+
+# ----- visibility -----
+
+def _task_visibility(user_id: int, project_id: Optional[int]):
+    if project_id:
+        return [Task.project_id == project_id]
+    return [or_(
+        Task.creator_id == user_id,
+        exists().where(
+            task_assignee_association.c.task_id == Task.id,
+            task_assignee_association.c.user_id == user_id),
+        exists().where(
+            task_watcher_association.c.task_id == Task.id,
+            task_watcher_association.c.user_id == user_id),
+    )]
+
+
+def visibility(target: str, user_id: int, project_id: Optional[int]):
+    """WHERE clauses limiting ``target`` rows to what the user may see"""
+    if target == "tasks":
+        return _task_visibility(user_id, project_id)
+    if target == "projects":
+        return [or_(
+            Project.owner_id == user_id,
+            exists().where(
+                user_project_association.c.project_id == Project.id,
+                user_project_association.c.user_id == user_id),
+        )]
+    return [exists(select(Task.id).where(Task.id == Comment.task_id, *_task_visibility(user_id, project_id)))]
+
+
+def _result(row, target: SearchTarget, rank: float, highlight: Dict[str, Optional[str]]) -> Dict[str, Any]:
+    result = {name: getattr(row, name) for name in target.columns}
+    result["rank"] = float(rank or 0)
+    result["highlight"] = highlight
+    return result
+
+
+# ----- backends -----
+
+class LikeSearch:
+    """Unindexed substring scan; the behaviour before full-text search"""
+
+    name = "like"
+
+    def install(self, connection) -> bool:
+        return True
+
+    def installed(self, connection) -> bool:
+        return True
+
+    def search(self, db: Session, target: SearchTarget, q: str, filters, limit: int, offset: int) -> List[Dict[str, Any]]:
+        model = target.model
+        escaped = q.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+        pattern = f"%{escaped}%"
+        rows = db.execute(
+            select(*target.output_columns())
+            .where(
+                or_(*(getattr(model, field).ilike(pattern, escape="\\") for field in target.fields)),
+                model.is_active == True,
+                *filters)
+            .order_by(desc(model.id))
+            .limit(limit)
+            .offset(offset)
+        )
+        marker = re.compile(re.escape(q), re.IGNORECASE)
+        return [
+            _result(row, target, 0, {
+                field: marker.sub(lambda m: f"{MARK_START}{m.group(0)}{MARK_END}", getattr(row, field) or "")
+                for field in target.fields
+            })
+            for row in rows
+        ]
+
+
+class PostgresSearch:
+    """tsvector column + GIN index per table"""
+
+    name = "postgresql"
+    config = "english"
+    weights = "ABC"
+
+    def _vector_expression(self, target: SearchTarget) -> str:
+        return " || ".join(
+            f"setweight(to_tsvector('{self.config}', coalesce({field}, '')), '{self.weights[i]}')"
+            for i, field in enumerate(target.fields)
+        )
+
+    def install(self, connection) -> bool:
+        """Add the columns and indexes; rewrites the tables, so only run from migrate_database.py"""
+        for target in TARGETS.values():
+            connection.execute(text(
+                f"ALTER TABLE {target.table_name} ADD COLUMN IF NOT EXISTS search_vector tsvector "
+                f"GENERATED ALWAYS AS ({self._vector_expression(target)}) STORED"
+            ))
+            connection.execute(text(
+                f"CREATE INDEX IF NOT EXISTS idx_{target.table_name}_search "
+                f"ON {target.table_name} USING GIN (search_vector)"
+            ))
+        return True
+
+    def installed(self, connection) -> bool:
+        found = connection.execute(text(
+            "SELECT count(*) FROM information_schema.columns "
+            "WHERE table_schema = current_schema() AND column_name = 'search_vector' AND table_name IN :tables"
+        ).bindparams(bindparam("tables", expanding=True)), {"tables": [t.table_name for t in TARGETS.values()]}).scalar()
+        return found == len(TARGETS)
+
+    def search(self, db: Session, target: SearchTarget, q: str, filters, limit: int, offset: int) -> List[Dict[str, Any]]:
+        terms = search_terms(q)
+        if not terms:
+            return []
+        model = target.model
+        # Every term must match; the last one also as a prefix so partial words find results
+        query = func.to_tsquery(self.config, " & ".join(terms[:-1] + [f"{terms[-1]}:*"]))
+        vector = literal_column(f"{target.table_name}.search_vector")
+        rank = func.ts_rank_cd(vector, query)
+
+        # Rank and page on the index first; headlines are built for the page only
+        ranked = (
+            select(model.id, rank.label("rank"))
+            .where(vector.op("@@")(query), model.is_active == True, *filters)
+            .order_by(desc("rank"), desc(model.id))
+            .limit(limit)
+            .offset(offset)
+            .subquery()
+        )
+        headlines = [
+            func.ts_headline(
+                self.config, func.coalesce(getattr(model, field), ""), query,
+                f"StartSel={MARK_START}, StopSel={MARK_END}, "
+                + ("HighlightAll=true" if i == 0 else "MaxFragments=2, MaxWords=20, MinWords=8")
+            ).label(f"highlight_{field}")
+            for i, field in enumerate(target.fields)
+        ]
+        rows = db.execute(
+            select(*target.output_columns(), ranked.c.rank, *headlines)
+            .join(ranked, ranked.c.id == model.id)
+            .order_by(desc(ranked.c.rank), desc(model.id))
+        )
+        return [
+            _result(row, target, row.rank, {field: getattr(row, f"highlight_{field}") for field in target.fields})
+            for row in rows
+        ]
+
+
+class SqliteSearch:
+    """External-content FTS5 table per searched table, synced by triggers"""
+
+    name = "sqlite-fts5"
+    weights = (10.0, 1.0, 1.0)
+
+    def _fts_name(self, target: SearchTarget) -> str:
+        return f"{target.table_name}_fts"
+
+    def _statements(self, target: SearchTarget) -> List[str]:
+        table_name, fts = target.table_name, self._fts_name(target)
+        fields = ", ".join(target.fields)
+        new_values = ", ".join(f"new.{field}" for field in target.fields)
+        old_values = ", ".join(f"old.{field}" for field in target.fields)
+        insert = f"INSERT INTO {fts}(rowid, {fields}) VALUES (new.id, {new_values});"
+        delete = f"INSERT INTO {fts}({fts}, rowid, {fields}) VALUES ('delete', old.id, {old_values});"
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{fields}, content='{table_name}', content_rowid='id', tokenize='porter unicode61')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {table_name} BEGIN {insert} END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {table_name} BEGIN {delete} END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {fields} ON {table_name} "
+            f"BEGIN {delete} {insert} END",
+        ]
+
+    def install(self, connection) -> bool:
+        """Create the FTS tables and triggers and index existing rows; run from migrate_database.py"""
+        try:
+            for target in TARGETS.values():
+                fts = self._fts_name(target)
+                existed = connection.execute(
+                    text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"), {"name": fts}
+                ).first() is not None
+                for statement in self._statements(target):
+                    connection.execute(text(statement))
+                if not existed:
+                    # Index the rows written before the table existed
+                    connection.execute(text(f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"))
+        except OperationalError as e:
+            # Only the pysqlite3 build loaded by sitecustomize.py is guaranteed to ship FTS5
+            logger.warning(f"SQLite full-text search unavailable: {e}")
+            return False
+        return True
+
+    def installed(self, connection) -> bool:
+        try:
+            for target in TARGETS.values():
+                # Fails when the table is missing or this SQLite build lacks FTS5
+                connection.execute(text(f"SELECT 1 FROM {self._fts_name(target)} LIMIT 0"))
+        except OperationalError:
+            return False
+        return True
+
+    def search(self, db: Session, target: SearchTarget, q: str, filters, limit: int, offset: int) -> List[Dict[str, Any]]:
+        terms = search_terms(q)
+        if not terms:
+            return []
+        model = target.model
+        fts_name = self._fts_name(target)
+        fts = table(fts_name, column("rowid"))
+        fts_column = literal_column(fts_name)
+        # Quoted terms cannot be parsed as FTS5 operators; the last also matches as a prefix
+        match = " ".join(f'"{term}"' for term in terms) + "*"
+        bm25 = func.bm25(fts_column, *self.weights[:len(target.fields)])
+        highlights = [
+            (func.highlight(fts_column, i, MARK_START, MARK_END) if i == 0
+             else func.snippet(fts_column, i, MARK_START, MARK_END, "…", 16)).label(f"highlight_{field}")
+            for i, field in enumerate(target.fields)
+        ]
+        rows = db.execute(
+            select(*target.output_columns(), bm25.label("bm25"), *highlights)
+            .select_from(fts)
+            .join(model, model.id == fts.c.rowid)
+            .where(fts_column.op("MATCH")(match), model.is_active == True, *filters)
+            .order_by(bm25, desc(model.id))
+            .limit(limit)
+            .offset(offset)
+        )
+        # bm25 is lower-is-better; flip it so rank means the same on every backend
+        return [
+            _result(row, target, -row.bm25, {field: getattr(row, f"highlight_{field}") for field in target.fields})
+            for row in rows
+        ]
+
+
+BACKENDS = {"postgresql": PostgresSearch, "sqlite": SqliteSearch}
+
+search_backend = LikeSearch()
+
+
+def init_search(engine):
+    """Select the full-text backend for the engine's dialect if its index exists; never creates it"""
+    global search_backend
+    backend_class = BACKENDS.get(engine.dialect.name)
+    if settings.SEARCH_BACKEND == "like" or backend_class is None:
+        search_backend = LikeSearch()
+        return search_backend
+    backend = backend_class()
+    with engine.connect() as connection:
+        installed = backend.installed(connection)
+    if not installed:
+        logger.warning("Full-text search index not found; run migrate_database.py to create it")
+    search_backend = backend if installed else LikeSearch()
+    logger.info(f"Search backend: {search_backend.name}")
+    return search_backend
+
+
+def search(db: Session, q: str, user_id: int, targets: Sequence[str], project_id: Optional[int],
+           limit: int, offset: int = 0, backend=None) -> Dict[str, List[Dict[str, Any]]]:
+    """Up to ``limit`` ranked results per target, skipping the first ``offset``"""
+    backend = backend or search_backend
+    return {
+        name: backend.search(db, TARGETS[name], q, visibility(name, user_id, project_id), limit, offset)
+        for name in targets
+    }
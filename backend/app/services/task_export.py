@@ -0,0 +1,147 @@
+# backend/app/services/task_export.py
+"""
+Streaming export of a project's tasks as NDJSON or CSV.
+
+Tasks are read in id order through a server-side cursor, EXPORT_BATCH_SIZE
+rows at a time. Assignees and custom field values are fetched with one query
+per batch, and each batch is rendered and yielded before the next is read,
+so memory stays flat however large the project is.
+
+Every record carries a resume_token. Passing the token of the last record
+received back to the export continues from the task after it.
+"""
+
+import csv
+import json
+from collections import defaultdict
+from datetime import date, datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.pagination import decode_cursor, encode_cursor
+from app.models.models import CustomField, Task, TaskCustomField, User, task_assignee_association
+
+NDJSON = "ndjson"
+CSV = "csv"
+MEDIA_TYPES = {NDJSON: "application/x-ndjson", CSV: "text/csv"}
+
+TASK_COLUMNS = [
+    "id", "title", "description", "status", "priority", "position",
+    "estimated_hours", "actual_hours", "due_date", "start_date", "completed_at",
+    "task_list_id", "parent_task_id", "creator_id", "created_at", "updated_at",
+]
+CSV_HEADER = TASK_COLUMNS + ["tags", "assignees", "custom_fields", "resume_token"]
+
+
+def resume_after(token: Optional[str]) -> int:
+    """Task id an export resumes after; raises InvalidCursor for a bad token"""
+    if not token:
+        return 0
+    return int(decode_cursor(token, 1)[0])
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return value
+
+
+def _parse_tags(tags: Optional[str]) -> List[Any]:
+    if not tags:
+        return []
+    try:
+        return json.loads(tags)
+    except ValueError:
+        return [tags]
+
+
+def _assignees_by_task(db: Session, task_ids: List[int]) -> Dict[int, List[Dict[str, Any]]]:
+    rows = db.execute(
+        select(task_assignee_association.c.task_id, User.id, User.username)
+        .join(User, User.id == task_assignee_association.c.user_id)
+        .where(task_assignee_association.c.task_id.in_(task_ids))
+    )
+    assignees = defaultdict(list)
+    for task_id, user_id, username in rows:
+        assignees[task_id].append({"id": user_id, "username": username})
+    return assignees
+
+
+def _custom_fields_by_task(db: Session, task_ids: List[int]) -> Dict[int, Dict[str, Any]]:
+    rows = db.execute(
+        select(TaskCustomField.task_id, CustomField.name, TaskCustomField.value)
+        .join(CustomField, CustomField.id == TaskCustomField.field_id)
+        .where(TaskCustomField.task_id.in_(task_ids))
+    )
+    values = defaultdict(dict)
+    for task_id, name, value in rows:
+        values[task_id][name] = value
+    return values
+
+
+def export_batches(db: Session, project_id: int, after_id: int = 0) -> Iterator[List[Dict[str, Any]]]:
+    """Yield the project's active tasks as lists of plain dicts, one batch at a time"""
+    statement = (
+        select(*(getattr(Task, column) for column in TASK_COLUMNS), Task.tags)
+        .where(Task.project_id == project_id, Task.is_active == True, Task.id > after_id)
+        .order_by(Task.id)
+        .execution_options(yield_per=settings.EXPORT_BATCH_SIZE)
+    )
+    for batch in db.execute(statement).partitions():
+        task_ids = [row.id for row in batch]
+        assignees = _assignees_by_task(db, task_ids)
+        custom_fields = _custom_fields_by_task(db, task_ids)
+        records = []
+        for row in batch:
+            record = {column: _json_value(getattr(row, column)) for column in TASK_COLUMNS}
+            record["tags"] = _parse_tags(row.tags)
+            record["assignees"] = assignees.get(row.id, [])
+            record["custom_fields"] = custom_fields.get(row.id, {})
+            record["resume_token"] = encode_cursor([row.id])
+            records.append(record)
+        yield records
+
+
+class _Echo:
+    """File-like object that hands csv.writer's output straight back"""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _ndjson_chunks(batches) -> Iterator[str]:
+    for records in batches:
+        yield "".join(json.dumps(record, separators=(",", ":")) + "\n" for record in records)
+
+
+def _csv_chunks(batches) -> Iterator[str]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(CSV_HEADER)
+    for records in batches:
+        yield "".join(
+            writer.writerow([
+                json.dumps(record[column]) if column in ("tags", "assignees", "custom_fields") else record[column]
+                for column in CSV_HEADER
+            ])
+            for record in records
+        )
+
+
+def stream_export(session_factory, project_id: int, after_id: int, export_format: str) -> Iterator[str]:
+    """Render an export chunk by chunk.
+
+    The response body outlives the request's own session, so the export
+    opens and closes its own.
+    """
+    db = session_factory()
+    try:
+        batches = export_batches(db, project_id, after_id)
+        if export_format == CSV:
+            yield from _csv_chunks(batches)
+        else:
+            yield from _ndjson_chunks(batches)
+    finally:
+        db.close()
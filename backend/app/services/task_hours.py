@@ -0,0 +1,128 @@
+# backend/app/services/task_hours.py
+"""
+Task.actual_hours, the total of the task's time entries.
+
+The total is adjusted by delta on every flush that creates, deletes or
+changes a time entry, with an atomic
+
+    UPDATE tasks SET actual_hours = coalesce(actual_hours, 0) + :delta
+
+in the flush's transaction, so concurrent entries for one task never lose
+each other's hours and no write scans the task's entries.
+
+Set-based statements on time_entries bypass the ORM events below. Those,
+and float rounding building up over many deltas, are what
+reconcile_task_hours (reconcile_task_hours.py) repairs: it recomputes every
+total in one statement and reports the tasks that had drifted.
+"""
+
+from collections import defaultdict
+from typing import List, Tuple
+
+from sqlalchemy import event, func, inspect, or_, select, update
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.db.incremental import scalar_before_after, track_previous_values
+from app.models.models import Task, TimeEntry
+
+DRIFT_TOLERANCE = 1e-6
+
+task_table = Task.__table__
+entry_table = TimeEntry.__table__
+
+
+# ----- incremental maintenance -----
+
+# Flush-time history must know which task an entry counted towards, and with how many hours
+track_previous_values(TimeEntry.task_id, TimeEntry.hours)
+
+
+def add_hours(connection, task_id: int, delta: float):
+    """Atomically add ``delta`` to the task's actual_hours; returns the new total when the database says"""
+    statement = (
+        update(task_table)
+        .where(task_table.c.id == task_id)
+        .values(actual_hours=func.coalesce(task_table.c.actual_hours, 0) + delta)
+    )
+    if connection.dialect.update_returning:
+        return connection.execute(statement.returning(task_table.c.actual_hours)).scalar()
+    connection.execute(statement)
+    return None
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_hour_deltas(session, flush_context, instances):
+    deltas = session.info.setdefault("task_hour_deltas", defaultdict(float))
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if not isinstance(obj, TimeEntry):
+            continue
+        state = inspect(obj)
+        deleted = obj in session.deleted
+        task_before, task_after = scalar_before_after(state, "task_id")
+        hours_before, hours_after = scalar_before_after(state, "hours")
+        if not state.pending:
+            deltas[task_before] -= hours_before or 0
+        if not deleted:
+            # An entry added together with its task has no task_id until the flush
+            deltas[task_after if task_after is not None else state.dict.get("task")] += hours_after or 0
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_hour_deltas(session, flush_context):
+    deltas = session.info.pop("task_hour_deltas", None)
+    if not deltas:
+        return
+    connection = session.connection()
+    for task, delta in deltas.items():
+        task_id = task.id if isinstance(task, Task) else task
+        if task_id is None or not delta:
+            continue
+        total = add_hours(connection, task_id, delta)
+        # Keep a loaded task in step with the row without reloading it
+        loaded = session.identity_map.get(session.identity_key(Task, task_id))
+        if loaded is not None and total is not None:
+            set_committed_value(loaded, "actual_hours", total)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_hour_deltas(session):
+    session.info.pop("task_hour_deltas", None)
+
+
+# ----- reconciliation -----
+
+def _logged_hours():
+    return (
+        select(func.coalesce(func.sum(entry_table.c.hours), 0))
+        .where(entry_table.c.task_id == task_table.c.id)
+        .scalar_subquery()
+    )
+
+
+def find_drift(connection) -> List[Tuple[int, float, float]]:
+    """(task id, stored actual_hours, logged hours) of every task whose total is off"""
+    logged = _logged_hours()
+    stored = func.coalesce(task_table.c.actual_hours, 0)
+    rows = connection.execute(
+        select(task_table.c.id, task_table.c.actual_hours, logged)
+        .where(or_(task_table.c.actual_hours.is_(None), func.abs(stored - logged) > DRIFT_TOLERANCE))
+        .order_by(task_table.c.id)
+    ).all()
+    return [(task_id, actual, float(total)) for task_id, actual, total in rows]
+
+
+def reconcile_task_hours(engine, dry_run: bool = False) -> List[Tuple[int, float, float]]:
+    """Recompute actual_hours of every drifted task from its entries; returns the drift found"""
+    with engine.begin() as conn:
+        drift = find_drift(conn)
+        if drift and not dry_run:
+            task_ids = [task_id for task_id, _, _ in drift]
+            for start in range(0, len(task_ids), 1000):
+                # Recomputed inside the UPDATE, so entries written since find_drift are counted too
+                conn.execute(
+                    update(task_table)
+                    .where(task_table.c.id.in_(task_ids[start:start + 1000]))
+                    .values(actual_hours=_logged_hours())
+                )
+    return drift
@@ -0,0 +1,213 @@
+# backend/app/services/task_readiness.py
+"""
+Which tasks of a project can be worked on now.
+
+A task is blocked while any of its predecessors is open (active and not
+done), and ready when it is open itself and none are. The blocker chain of
+a task is every open task reachable backwards through open predecessors.
+
+Both are computed from the in-memory dependency graph (one query per
+connected project, usually served from the graph cache) plus one query for
+the state of the tasks involved. Readiness is cached per project for
+READINESS_CACHE_TTL seconds and evicted after any commit that changes a
+task or dependency it was computed from.
+"""
+
+import threading
+import time
+from collections import defaultdict, deque
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.models import Task, TaskDependency, TaskStatus
+from app.services.dependency_graph import DependencyGraph, project_graph
+
+DONE = TaskStatus.DONE.value
+
+SUMMARY_COLUMNS = (Task.id, Task.title, Task.status, Task.priority, Task.due_date, Task.project_id, Task.is_active)
+
+
+class Readiness:
+    """Ready and blocked tasks of one project"""
+
+    def __init__(self, project_id: int, ready: List[Dict[str, Any]], blocked: List[Dict[str, Any]], nodes: Set[int]):
+        self.project_id = project_id
+        self.ready = ready
+        self.blocked = blocked
+        self.nodes = nodes  # every task the answer depends on
+
+
+def _summary(row) -> Dict[str, Any]:
+    return {
+        "id": row.id,
+        "title": row.title,
+        "status": row.status,
+        "priority": row.priority,
+        "due_date": row.due_date,
+        "project_id": row.project_id,
+    }
+
+
+def _is_open(row) -> bool:
+    return row is not None and row.is_active and row.status != DONE
+
+
+def _task_rows(db: Session, project_id: int, graph: DependencyGraph) -> Dict[int, Any]:
+    """State of the project's active tasks and of every task in its dependency graph"""
+    rows = {row.id: row for row in db.execute(
+        select(*SUMMARY_COLUMNS).where(Task.project_id == project_id, Task.is_active == True)
+    )}
+    outside = set(graph.project_of) - rows.keys()
+    if outside:
+        rows.update({row.id: row for row in db.execute(select(*SUMMARY_COLUMNS).where(Task.id.in_(outside)))})
+    return rows
+
+
+def compute_readiness(db: Session, project_id: int) -> Readiness:
+    graph = project_graph(db, project_id)
+    rows = _task_rows(db, project_id, graph)
+    ready, blocked = [], []
+    for task_id, row in sorted(rows.items()):
+        if row.project_id != project_id or not _is_open(row):
+            continue
+        blockers = sorted(p for p in graph.predecessors.get(task_id, ()) if _is_open(rows.get(p)))
+        if blockers:
+            blocked.append({**_summary(row), "blocked_by": blockers})
+        else:
+            ready.append(_summary(row))
+    return Readiness(project_id, ready, blocked, set(rows) | set(graph.project_of))
+
+
+def get_readiness(db: Session, project_id: int) -> Readiness:
+    readiness = readiness_cache.get(project_id)
+    if readiness is None:
+        readiness = compute_readiness(db, project_id)
+        readiness_cache.put(readiness)
+    return readiness
+
+
+def blocker_chain(db: Session, task: Task) -> Dict[str, Any]:
+    """Open tasks transitively blocking ``task``, nearest first"""
+    graph = project_graph(db, task.project_id)
+    rows = _task_rows(db, task.project_id, graph)
+    depth = {task.id: 0}
+    queue = deque([task.id])
+    chain = []
+    while queue:
+        node = queue.popleft()
+        for predecessor in sorted(graph.predecessors.get(node, ())):
+            # A finished predecessor no longer blocks, nor does anything behind it
+            if predecessor in depth or not _is_open(rows.get(predecessor)):
+                continue
+            depth[predecessor] = depth[node] + 1
+            queue.append(predecessor)
+            chain.append(predecessor)
+    return {
+        "task_id": task.id,
+        "is_blocked": bool(chain),
+        "blockers": [
+            {
+                **_summary(rows[task_id]),
+                "depth": depth[task_id],
+                "blocked_by": sorted(p for p in graph.predecessors.get(task_id, ()) if _is_open(rows.get(p))),
+            }
+            for task_id in chain
+        ],
+    }
+
+
+# ----- cache -----
+
+class ReadinessCache:
+    """Bounded TTL cache of project_id -> Readiness, indexed by the tasks each answer used"""
+
+    def __init__(self, max_entries: int, ttl_seconds: int):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: Dict[int, tuple] = {}
+        self._projects_by_task: Dict[int, Set[int]] = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def get(self, project_id: int) -> Optional[Readiness]:
+        with self._lock:
+            entry = self._entries.get(project_id)
+            if entry is None:
+                return None
+            if entry[0] <= time.time():
+                self._remove(project_id)
+                return None
+            return entry[1]
+
+    def put(self, readiness: Readiness):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+                self._projects_by_task.clear()
+            self._remove(readiness.project_id)
+            self._entries[readiness.project_id] = (time.time() + self.ttl_seconds, readiness)
+            for task_id in readiness.nodes:
+                self._projects_by_task[task_id].add(readiness.project_id)
+
+    def _remove(self, project_id: int):
+        entry = self._entries.pop(project_id, None)
+        if entry is None:
+            return
+        for task_id in entry[1].nodes:
+            projects = self._projects_by_task.get(task_id)
+            if projects is not None:
+                projects.discard(project_id)
+                if not projects:
+                    del self._projects_by_task[task_id]
+
+    def evict(self, project_ids: Iterable[int] = (), task_ids: Iterable[int] = ()):
+        with self._lock:
+            affected = set(project_ids)
+            for task_id in task_ids:
+                affected |= self._projects_by_task.get(task_id, set())
+            for project_id in affected:
+                self._remove(project_id)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._projects_by_task.clear()
+
+
+readiness_cache = ReadinessCache(
+    max_entries=settings.DEPENDENCY_GRAPH_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.READINESS_CACHE_TTL
+)
+
+
+def invalidate_readiness(project_ids: Iterable[int] = (), task_ids: Iterable[int] = ()):
+    """Drop cached readiness; for code that changes tasks with set-based statements"""
+    readiness_cache.evict(project_ids, task_ids)
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_readiness_changes(session, flush_context):
+    projects = session.info.setdefault("readiness_projects", set())
+    tasks = session.info.setdefault("readiness_tasks", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Task):
+            tasks.add(obj.id)
+            projects.add(obj.project_id)
+        elif isinstance(obj, TaskDependency):
+            tasks.update((obj.predecessor_id, obj.successor_id))
+
+
+@event.listens_for(Session, "after_commit")
+def _evict_readiness(session):
+    projects = session.info.pop("readiness_projects", ())
+    tasks = session.info.pop("readiness_tasks", ())
+    if projects or tasks:
+        invalidate_readiness(projects, tasks)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_readiness_changes(session):
+    session.info.pop("readiness_projects", None)
+    session.info.pop("readiness_tasks", None)
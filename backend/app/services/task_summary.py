@@ -0,0 +1,241 @@
+# backend/app/services/task_summary.py
+"""
+Per-user dashboard task counters.
+
+A user is counted on every active task they created or are assigned to.
+UserTaskSummary keeps total / completed / in-progress counts for each user
+and is adjusted by delta on every flush that creates, deletes, re-statuses,
+(de)activates or re-assigns a task, so the dashboard reads one row instead of
+scanning the user's tasks.
+
+Overdue depends on the clock rather than on writes, so it is still counted
+live, restricted to the user's open tasks that are past due.
+
+Set-based UPDATE/INSERT statements bypass the ORM events below; code that
+issues them must call refresh_task_summaries() for the affected users.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from sqlalchemy import and_, case, event, exists, func, inspect, or_, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.db.incremental import UPSERTS, scalar_before_after, track_previous_values
+from app.models.models import Task, TaskStatus, UserTaskSummary, task_assignee_association
+
+DONE = TaskStatus.DONE.value
+IN_PROGRESS = TaskStatus.IN_PROGRESS.value
+
+summary_table = UserTaskSummary.__table__
+
+
+def involves_user(user_id: int):
+    """Tasks the user created or is assigned to"""
+    return or_(
+        Task.creator_id == user_id,
+        exists().where(
+            task_assignee_association.c.task_id == Task.id,
+            task_assignee_association.c.user_id == user_id
+        )
+    )
+
+
+def task_summary_query(user_id: int, now: datetime = None):
+    """All four dashboard counts in one conditional-aggregation pass"""
+    now = now or datetime.utcnow()
+    return select(
+        func.count(Task.id),
+        func.coalesce(func.sum(case((Task.status == DONE, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((Task.status == IN_PROGRESS, 1), else_=0)), 0),
+        func.coalesce(func.sum(case((and_(Task.due_date < now, Task.status != DONE), 1), else_=0)), 0),
+    ).where(Task.is_active == True, involves_user(user_id))
+
+
+def overdue_count_query(user_id: int, now: datetime = None):
+    now = now or datetime.utcnow()
+    return select(func.count(Task.id)).where(
+        Task.is_active == True,
+        Task.due_date < now,
+        Task.status != DONE,
+        involves_user(user_id)
+    )
+
+
+COUNTERS = ("total_tasks", "completed_tasks", "in_progress_tasks")
+
+
+def _upsert_summary(connection, user_id: int, delta: Optional[Tuple[int, int, int]] = None):
+    """Seed the user's counters from the tasks table.
+
+    If a row exists by then (a concurrent seed committed first), it is
+    overwritten with the fresh counts, or, given ``delta``, has the delta
+    added instead: the other seed cannot have seen this transaction's
+    change. Either way a race on derived counters never fails the write.
+    """
+    total, completed, in_progress, _ = connection.execute(task_summary_query(user_id)).one()
+    seed = dict(zip(COUNTERS, (total, completed, in_progress)))
+    upsert = UPSERTS.get(connection.dialect.name)
+    if upsert is not None:
+        statement = upsert(summary_table).values(user_id=user_id, **seed)
+        if delta is None:
+            on_conflict = {key: statement.excluded[key] for key in COUNTERS}
+        else:
+            on_conflict = {key: summary_table.c[key] + value for key, value in zip(COUNTERS, delta)}
+        connection.execute(statement.on_conflict_do_update(
+            index_elements=[summary_table.c.user_id],
+            set_=on_conflict
+        ))
+        return
+    if delta is None:
+        result = connection.execute(
+            update(summary_table).where(summary_table.c.user_id == user_id).values(**seed)
+        )
+        if result.rowcount:
+            return
+    connection.execute(summary_table.insert().values(user_id=user_id, **seed))
+
+
+def refresh_task_summaries(connection, user_ids: Iterable[int]):
+    """Recompute the counters of ``user_ids`` from the tasks table"""
+    for user_id in set(user_ids):
+        _upsert_summary(connection, user_id)
+
+
+def get_task_summary(db: Session, user_id: int) -> Dict[str, int]:
+    row = db.execute(select(
+        summary_table.c.total_tasks,
+        summary_table.c.completed_tasks,
+        summary_table.c.in_progress_tasks
+    ).where(summary_table.c.user_id == user_id)).first()
+    if row is None:
+        # First dashboard view for this user: seed the counters in the same pass
+        total, completed, in_progress, overdue = db.execute(task_summary_query(user_id)).one()
+        try:
+            db.execute(summary_table.insert().values(
+                user_id=user_id,
+                total_tasks=total,
+                completed_tasks=completed,
+                in_progress_tasks=in_progress
+            ))
+            db.commit()
+        except IntegrityError:
+            # A concurrent request seeded the row first
+            db.rollback()
+    else:
+        total, completed, in_progress = row
+        overdue = db.execute(overdue_count_query(user_id)).scalar()
+    return {
+        "total_tasks": total,
+        "completed_tasks": completed,
+        "in_progress_tasks": in_progress,
+        "overdue_tasks": overdue,
+    }
+
+
+# ----- incremental maintenance -----
+
+# Flush-time history must know what a task was counted as before the change
+track_previous_values(Task.status, Task.is_active, Task.creator_id)
+
+
+def _status_value(status):
+    return getattr(status, "value", status)
+
+
+def _assignees_before_after(session, state) -> Tuple[Set[int], Set[int]]:
+    if state.pending:
+        added = state.attrs.assignees.history.added or ()
+        return set(), {u.id for u in added}
+    if "assignees" in state.dict:
+        history = state.attrs.assignees.history
+        unchanged = {u.id for u in history.unchanged or ()}
+        return (
+            unchanged | {u.id for u in history.deleted or ()},
+            unchanged | {u.id for u in history.added or ()}
+        )
+    # Collection never loaded, so it cannot have changed: read it once
+    ids = set(session.execute(
+        select(task_assignee_association.c.user_id).where(
+            task_assignee_association.c.task_id == state.obj().id)
+    ).scalars())
+    return ids, ids
+
+
+def _contribution(active, status) -> Tuple[int, int, int]:
+    if active is False:
+        return 0, 0, 0
+    status = _status_value(status)
+    return 1, int(status == DONE), int(status == IN_PROGRESS)
+
+
+def _relevant_change(state, deleted: bool) -> bool:
+    if state.pending or deleted:
+        return True
+    return any(
+        state.attrs[key].history.has_changes()
+        for key in ("status", "is_active", "creator_id", "assignees")
+    )
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_task_deltas(session, flush_context, instances):
+    deltas: Dict[int, List[int]] = session.info.setdefault("task_summary_deltas", defaultdict(lambda: [0, 0, 0]))
+    tasks = [obj for obj in list(session.new) + list(session.dirty) + list(session.deleted) if isinstance(obj, Task)]
+    for task in tasks:
+        state = inspect(task)
+        deleted = task in session.deleted
+        if not _relevant_change(state, deleted):
+            continue
+        status_before, status_after = scalar_before_after(state, "status")
+        active_before, active_after = scalar_before_after(state, "is_active")
+        creator_before, creator_after = scalar_before_after(state, "creator_id")
+        assignees_before, assignees_after = _assignees_before_after(session, state)
+
+        if state.pending:
+            before_users, before = set(), (0, 0, 0)
+        else:
+            before_users = assignees_before | {creator_before}
+            before = _contribution(active_before, status_before)
+        if deleted:
+            after_users, after = set(), (0, 0, 0)
+        else:
+            after_users = assignees_after | {creator_after}
+            after = _contribution(active_after, status_after)
+
+        for user_id in before_users - {None}:
+            for i in range(3):
+                deltas[user_id][i] -= before[i]
+        for user_id in after_users - {None}:
+            for i in range(3):
+                deltas[user_id][i] += after[i]
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_task_deltas(session, flush_context):
+    deltas = session.info.pop("task_summary_deltas", None)
+    if not deltas:
+        return
+    connection = session.connection()
+    for user_id, (total, completed, in_progress) in deltas.items():
+        if not (total or completed or in_progress):
+            continue
+        result = connection.execute(
+            update(summary_table)
+            .where(summary_table.c.user_id == user_id)
+            .values(
+                total_tasks=summary_table.c.total_tasks + total,
+                completed_tasks=summary_table.c.completed_tasks + completed,
+                in_progress_tasks=summary_table.c.in_progress_tasks + in_progress
+            )
+        )
+        if result.rowcount == 0:
+            # No counters yet; seeding from the flushed rows already includes this change
+            _upsert_summary(connection, user_id, (total, completed, in_progress))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_task_deltas(session):
+    session.info.pop("task_summary_deltas", None)
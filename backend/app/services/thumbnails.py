@@ -0,0 +1,140 @@
+# backend/app/services/thumbnails.py
+"""
+Thumbnails for image attachments.
+
+After an image upload commits, its thumbnails (THUMBNAIL_SIZES, longest
+side in pixels, WebP) are rendered in a separate process pool so decoding
+large images never competes with request handling, and the upload response
+never waits for them. Each thumbnail is stored next to its original as
+<original>.<size>.webp; since originals are content-addressed, identical
+uploads share their thumbnails too.
+
+Until a thumbnail exists the thumbnail endpoint answers 404 and clients
+fall back to the icon or the original.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Set
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_FORMAT = "WEBP"
+THUMBNAIL_CONTENT_TYPE = "image/webp"
+IMAGE_CONTENT_TYPES = {"image/jpeg", "image/png", "image/gif", "image/webp", "image/bmp", "image/tiff"}
+
+
+def has_thumbnails(content_type: Optional[str]) -> bool:
+    return (content_type or "").split(";")[0].strip().lower() in IMAGE_CONTENT_TYPES
+
+
+def thumbnail_path(original: str, size: int) -> Path:
+    original = Path(original)
+    return original.with_name(f"{original.name}.{size}.webp")
+
+
+def pick_size(requested: int, sizes: List[int]) -> int:
+    """Smallest configured size covering ``requested``, else the largest"""
+    for size in sorted(sizes):
+        if size >= requested:
+            return size
+    return max(sizes)
+
+
+def render_thumbnails(source: str, sizes: List[int]) -> List[int]:
+    """Write the missing thumbnails of ``source``; runs in a worker process"""
+    from PIL import Image, ImageOps
+
+    made = []
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image)
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "transparency" in image.info or image.mode in ("LA", "PA") else "RGB")
+        for size in sizes:
+            target = thumbnail_path(source, size)
+            if target.exists():
+                continue
+            thumbnail = image.copy()
+            thumbnail.thumbnail((size, size))
+            partial = target.with_name(target.name + ".part")
+            thumbnail.save(partial, THUMBNAIL_FORMAT, quality=80)
+            os.replace(partial, target)
+            made.append(size)
+    return made
+
+
+class ThumbnailPool:
+    """Fire-and-forget process pool for thumbnail rendering.
+
+    At most ``max_queue`` renders wait at a time; beyond that new requests
+    are skipped (their thumbnails simply stay missing) rather than queued
+    without bound.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, sizes: List[int]):
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.sizes = sizes
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._tasks: Set[asyncio.Task] = set()
+        self._completed = 0
+        self._failed = 0
+        self._skipped = 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                # spawn: never fork a process that is running an event loop and threads
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn"))
+            return self._executor
+
+    def schedule(self, path: str):
+        """Render the thumbnails of ``path`` in the background; returns immediately"""
+        if len(self._tasks) >= self.max_workers + self.max_queue:
+            self._skipped += 1
+            logger.warning(f"Thumbnail queue full, skipped {path}")
+            return
+        task = asyncio.create_task(self._render(path))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _render(self, path: str):
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self._get_executor(), render_thumbnails, path, self.sizes)
+            self._completed += 1
+        except Exception as e:
+            self._failed += 1
+            logger.error(f"Thumbnail generation failed for {path}: {e}")
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "pending": len(self._tasks),
+            "completed": self._completed,
+            "failed": self._failed,
+            "skipped": self._skipped,
+        }
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+
+thumbnail_pool = ThumbnailPool(
+    max_workers=settings.THUMBNAIL_WORKERS,
+    max_queue=settings.THUMBNAIL_MAX_QUEUE,
+    sizes=settings.THUMBNAIL_SIZES
+)
@@ -0,0 +1,55 @@
+# backend/backfill_analytics.py
+"""
+Backfill the daily project analytics rollups.
+
+Projects created after the rollups were introduced are covered automatically.
+Run this once for existing projects; until then their analytics fall back to
+a live scan. It is safe to re-run: each project's rollups are recomputed from
+the tasks and time entries tables.
+
+    python backfill_analytics.py                      # every project, all history
+    python backfill_analytics.py --project-id 3
+    python backfill_analytics.py --since 2024-01-01   # only days from this date on
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import date
+from sqlalchemy import select
+from app.db.session import engine
+from app.models.models import Project
+from app.services.project_analytics import backfill_project
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+def backfill_analytics(project_id=None, since=None):
+    """Recompute rollups project by project, one transaction each"""
+    with engine.connect() as conn:
+        if project_id is not None:
+            project_ids = [project_id]
+        else:
+            project_ids = list(conn.execute(select(Project.id).order_by(Project.id)).scalars())
+
+    logger.info(f"Backfilling analytics for {len(project_ids)} project(s)...")
+
+    for pid in project_ids:
+        with engine.begin() as conn:
+            rows = backfill_project(conn, pid, since)
+        logger.info(f"Project {pid}: {rows} rollup rows written")
+
+    logger.info("Analytics backfill completed!")
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Backfill project analytics rollups")
+    parser.add_argument('--project-id', type=int, help='Only backfill this project')
+    parser.add_argument('--since', type=date.fromisoformat, help='Only recompute days from this date (YYYY-MM-DD)')
+
+    args = parser.parse_args()
+
+    backfill_analytics(args.project_id, args.since)
@@ -0,0 +1,163 @@
+# backend/benchmarks/bench_concurrent_latency.py
+"""
+Measure latency percentiles for concurrent API requests against a running server.
+
+Run it once against a server started from the commit before a change and once
+after, saving each run with --output, then diff the two runs with --compare:
+
+    python benchmarks/bench_concurrent_latency.py --label before --output before.json
+    python benchmarks/bench_concurrent_latency.py --label after --output after.json
+    python benchmarks/bench_concurrent_latency.py --compare before.json after.json
+
+The default scenario mixes writes that go through the async endpoints
+(create_task, update_task, create_comment) with reads of /health, so a
+blocked event loop shows up as tail latency on every request type.
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+import uuid
+
+import httpx
+
+
+def percentile(samples, pct):
+    """Nearest-rank percentile of a list of samples"""
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, int(round(pct / 100 * len(ordered))) - 1))
+    return ordered[rank]
+
+
+def summarize(latencies):
+    return {
+        "count": len(latencies),
+        "mean_ms": round(statistics.mean(latencies) * 1000, 2) if latencies else 0,
+        "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+        "max_ms": round(max(latencies) * 1000, 2) if latencies else 0,
+    }
+
+
+async def login(client, username, password):
+    response = await client.post(
+        "/api/v1/auth/token", data={"username": username, "password": password}
+    )
+    response.raise_for_status()
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def first_project_id(client, headers):
+    response = await client.get("/api/v1/projects/", headers=headers)
+    response.raise_for_status()
+    projects = response.json()
+    if not projects:
+        raise SystemExit("The benchmark user needs at least one project")
+    return projects[0]["id"]
+
+
+async def run_scenario(client, headers, project_id, requests, concurrency):
+    latencies = {"create_task": [], "update_task": [], "create_comment": [], "health": []}
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def timed(kind, method, url, **kwargs):
+        nonlocal errors
+        async with semaphore:
+            start = time.perf_counter()
+            response = await client.request(method, url, headers=headers, **kwargs)
+            latencies[kind].append(time.perf_counter() - start)
+            if response.status_code >= 400:
+                errors += 1
+            return response
+
+    async def one_iteration(i):
+        created = await timed(
+            "create_task", "POST", "/api/v1/tasks/",
+            json={"title": f"bench-{uuid.uuid4().hex[:8]}", "project_id": project_id},
+        )
+        if created.status_code >= 400:
+            return
+        task_id = created.json()["id"]
+        await asyncio.gather(
+            timed("update_task", "PUT", f"/api/v1/tasks/{task_id}", json={"position": i}),
+            timed("create_comment", "POST", "/api/v1/comments/",
+                  json={"task_id": task_id, "content": "benchmark comment"}),
+            timed("health", "GET", "/health"),
+        )
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one_iteration(i) for i in range(requests)))
+    elapsed = time.perf_counter() - started
+
+    everything = [sample for samples in latencies.values() for sample in samples]
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "errors": errors,
+        "throughput_rps": round(len(everything) / elapsed, 1) if elapsed else 0,
+        "overall": summarize(everything),
+        "endpoints": {kind: summarize(samples) for kind, samples in latencies.items()},
+    }
+
+
+def print_report(label, report):
+    print(f"== {label} ==")
+    print(f"elapsed {report['elapsed_s']}s, {report['throughput_rps']} req/s, {report['errors']} errors")
+    rows = [("overall", report["overall"])] + list(report["endpoints"].items())
+    print(f"{'endpoint':<16}{'count':>8}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for name, stats in rows:
+        print(
+            f"{name:<16}{stats['count']:>8}{stats['p50_ms']:>10}"
+            f"{stats['p95_ms']:>10}{stats['p99_ms']:>10}{stats['max_ms']:>10}"
+        )
+
+
+def compare(before_path, after_path):
+    with open(before_path) as f:
+        before = json.load(f)
+    with open(after_path) as f:
+        after = json.load(f)
+    print(f"{'endpoint':<16}{'p99 before':>12}{'p99 after':>12}{'change':>10}")
+    names = ["overall"] + list(before["endpoints"])
+    for name in names:
+        old = before["overall"] if name == "overall" else before["endpoints"][name]
+        new = after["overall"] if name == "overall" else after["endpoints"].get(name, old)
+        change = ((new["p99_ms"] - old["p99_ms"]) / old["p99_ms"] * 100) if old["p99_ms"] else 0
+        print(f"{name:<16}{old['p99_ms']:>12}{new['p99_ms']:>12}{change:>9.1f}%")
+
+
+async def main(args):
+    async with httpx.AsyncClient(base_url=args.base_url, timeout=60) as client:
+        headers = await login(client, args.username, args.password)
+        project_id = args.project_id or await first_project_id(client, headers)
+        report = await run_scenario(client, headers, project_id, args.requests, args.concurrency)
+    report["label"] = args.label
+    report["concurrency"] = args.concurrency
+    print_report(args.label, report)
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--username", default="steve")
+    parser.add_argument("--password", default="welcome123")
+    parser.add_argument("--project-id", type=int)
+    parser.add_argument("--requests", type=int, default=200, help="scenario iterations (4 requests each)")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--label", default="run")
+    parser.add_argument("--output")
+    parser.add_argument("--compare", nargs=2, metavar=("BEFORE", "AFTER"))
+    args = parser.parse_args()
+
+    if args.compare:
+        compare(*args.compare)
+    else:
+        asyncio.run(main(args))
@@ -0,0 +1,97 @@
+# backend/dedupe_uploads.py
+"""
+Move existing attachments into content-addressed storage.
+
+Attachments uploaded before deduplication live under uuid names in
+UPLOAD_FOLDER and have no content_hash. This hashes each of those files,
+moves it to UPLOAD_FOLDER/blobs/<2 hex>/<sha256> (or deletes it when that
+content is already stored), and points the attachment at the blob with its
+reference counted. Run migrate_database.py first. Safe to re-run: only
+attachments without a content_hash are touched.
+
+    python dedupe_uploads.py
+    python dedupe_uploads.py --dry-run    # report what would be reclaimed
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from collections import Counter
+from pathlib import Path
+from sqlalchemy import func, select, update
+from app.core.config import settings
+from app.db.session import engine
+from app.models.models import Attachment
+from app.services.attachment_storage import acquire_blob, blob_path, hash_file
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+attachments = Attachment.__table__
+
+def dedupe_uploads(dry_run=False):
+    """One transaction per attachment; files are moved only alongside their row"""
+    upload_dir = Path(settings.UPLOAD_FOLDER)
+    with engine.connect() as conn:
+        rows = conn.execute(
+            select(attachments.c.id, attachments.c.file_path)
+            .where(attachments.c.content_hash.is_(None))
+            .order_by(attachments.c.id)
+        ).all()
+
+    logger.info(f"Deduplicating {len(rows)} attachment(s)...")
+    stats = Counter()
+    seen = set()
+    for attachment_id, file_path in rows:
+        path = Path(file_path)
+        if not path.exists():
+            logger.warning(f"Attachment {attachment_id}: {path} is missing, skipped")
+            stats["missing"] += 1
+            continue
+        sha256 = hash_file(path)
+        size = path.stat().st_size
+        target = blob_path(upload_dir, sha256)
+        duplicate = target.exists() or sha256 in seen
+        seen.add(sha256)
+        stats["duplicates" if duplicate else "blobs"] += 1
+        if duplicate:
+            stats["bytes_reclaimed"] += size
+        if dry_run:
+            continue
+
+        moved = False
+        try:
+            with engine.begin() as conn:
+                acquire_blob(conn, sha256, size)
+                conn.execute(update(attachments).where(attachments.c.id == attachment_id).values(
+                    content_hash=sha256, filename=sha256, file_path=str(target)))
+                shared = conn.execute(select(func.count()).select_from(attachments).where(
+                    attachments.c.file_path == file_path)).scalar()
+                if not target.exists():
+                    target.parent.mkdir(parents=True, exist_ok=True)
+                    os.replace(path, target)
+                    moved = True
+        except Exception:
+            if moved:
+                os.replace(target, path)
+            raise
+        if not moved and not shared:
+            # Content already stored and no other attachment uses the old file
+            os.unlink(path)
+
+    verb = "Would reclaim" if dry_run else "Reclaimed"
+    logger.info(
+        f"{stats['blobs']} distinct file(s), {stats['duplicates']} duplicate(s), {stats['missing']} missing. "
+        f"{verb} {stats['bytes_reclaimed']} bytes."
+    )
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Move attachments into content-addressed storage")
+    parser.add_argument('--dry-run', action='store_true', help='Only report duplicates')
+    args = parser.parse_args()
+
+    dedupe_uploads(dry_run=args.dry_run)
@@ -0,0 +1,38 @@
+# backend/gc_attachments.py
+"""
+Remove attachment blobs nothing refers to any more.
+
+Deletes blobs whose reference count has been zero for at least the grace
+period (ATTACHMENT_GC_GRACE_SECONDS by default), plus partial uploads and
+blob files without a database row that are older than that. Meant to run
+periodically, e.g. from cron:
+
+    python gc_attachments.py
+    python gc_attachments.py --grace-seconds 0    # everything unreferenced now
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from pathlib import Path
+from app.core.config import settings
+from app.db.session import engine
+from app.services.attachment_storage import collect_garbage
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Garbage-collect unreferenced attachment blobs")
+    parser.add_argument('--grace-seconds', type=int, default=settings.ATTACHMENT_GC_GRACE_SECONDS)
+    args = parser.parse_args()
+
+    stats = collect_garbage(engine, Path(settings.UPLOAD_FOLDER), args.grace_seconds)
+    logger.info(
+        f"Removed {stats['blobs_removed']} blob(s) ({stats['bytes_freed']} bytes) "
+        f"and {stats['stray_files_removed']} stray file(s)"
+    )
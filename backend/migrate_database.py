@@ -11,6 +11,7 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 from sqlalchemy import text, inspect
 from app.db.session import engine, SessionLocal
 from app.models.models import Base, User, Workspace, Project, Task, Comment, Attachment, TimeEntry, Goal
+from app.services.search import BACKENDS as SEARCH_BACKENDS
 import logging
 
 logging.basicConfig(level=logging.INFO)
@@ -155,7 +156,8 @@ def migrate_database():
                 'users', 'workspaces', 'projects', 'task_lists', 'tasks', 
                 'comments', 'attachments', 'time_entries', 'goals',
                 'activity_logs', 'notifications', 'custom_fields', 
-                'task_custom_fields', 'task_dependencies'
+                'task_custom_fields', 'task_dependencies', 'user_task_summaries',
+                'project_daily_stats', 'project_analytics_coverage', 'attachment_blobs'
             ]
             
             inspector = inspect(engine)
@@ -170,6 +172,31 @@ def migrate_database():
                 # Create all tables (this will only create missing ones)
                 Base.metadata.create_all(engine)
             
+            # 10. Indexes for membership checks
+            logger.info("Ensuring membership indexes exist...")
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_project_member ON user_project_association (project_id, user_id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_workspace_member ON user_workspace_association (workspace_id, user_id)"))
+            
+            # 11. Indexes backing keyset pagination
+            logger.info("Ensuring pagination indexes exist...")
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_task_project_position ON tasks (project_id, position, created_at, id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_comment_task_created ON comments (task_id, created_at, id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_attachment_task_created ON attachments (task_id, created_at, id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_time_entry_task_date ON time_entries (task_id, date, id)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS idx_time_entry_user_date ON time_entries (user_id, date, id)"))
+            
+            # 12. Full-text search index (tsvector + GIN on PostgreSQL, FTS5 on SQLite)
+            logger.info("Ensuring full-text search index exists...")
+            search_class = SEARCH_BACKENDS.get(engine.dialect.name)
+            if search_class is not None:
+                search_class().install(conn)
+            
+            # 13. Content-addressed attachments (run dedupe_uploads.py afterwards for existing files)
+            if check_table_exists('attachments') and not check_column_exists('attachments', 'content_hash'):
+                logger.info("Adding content_hash column to attachments table...")
+                conn.execute(text("ALTER TABLE attachments ADD COLUMN content_hash VARCHAR(64)"))
+            conn.execute(text("CREATE INDEX IF NOT EXISTS ix_attachments_content_hash ON attachments (content_hash)"))
+            
             # Commit the transaction
             trans.commit()
             logger.info("Database migration completed successfully!")
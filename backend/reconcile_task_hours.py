@@ -0,0 +1,36 @@
+# backend/reconcile_task_hours.py
+"""
+Recompute Task.actual_hours from the time entries and report drift.
+
+actual_hours is maintained incrementally as entries are written; this job
+catches whatever that misses (set-based statements, manual edits, float
+rounding) by recomputing every drifted total in bulk. Meant to run
+periodically, e.g. from cron:
+
+    python reconcile_task_hours.py
+    python reconcile_task_hours.py --dry-run    # only report the drift
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.session import engine
+from app.services.task_hours import reconcile_task_hours
+import logging
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Reconcile task actual hours with their time entries")
+    parser.add_argument('--dry-run', action='store_true', help="Report drift without fixing it")
+    args = parser.parse_args()
+
+    drift = reconcile_task_hours(engine, dry_run=args.dry_run)
+    for task_id, stored, logged in drift:
+        logger.warning(f"Task {task_id}: actual_hours {stored} but {logged} logged")
+    action = "found" if args.dry_run else "fixed"
+    logger.info(f"Drift {action} on {len(drift)} task(s)")
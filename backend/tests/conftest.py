@@ -0,0 +1,58 @@
+# backend/tests/conftest.py
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest
+
+
+@pytest.fixture
+def db():
+    """A session on a fresh in-memory SQLite database with every table created"""
+    pytest.importorskip("sqlalchemy")
+    pytest.importorskip("pydantic_settings")
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+    from sqlalchemy.pool import StaticPool
+
+    from app.models.models import Base
+
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def owner(db):
+    from app.models.models import User
+
+    user = User(email="owner@example.com", username="owner", full_name="Owner", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
+
+
+@pytest.fixture
+def project(db, owner):
+    from app.models.models import Project, Workspace
+
+    workspace = Workspace(name="Workspace", owner_id=owner.id)
+    db.add(workspace)
+    db.flush()
+    project = Project(name="Project", workspace_id=workspace.id, owner_id=owner.id)
+    db.add(project)
+    db.commit()
+    return project
+
+
+@pytest.fixture
+def member(db):
+    from app.models.models import User
+
+    user = User(email="member@example.com", username="member", full_name="Member", hashed_password="x")
+    db.add(user)
+    db.commit()
+    return user
@@ -0,0 +1,66 @@
+# backend/tests/test_access.py
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic_settings")
+
+from app.models.models import Project
+from app.services.access import (
+    accessible_projects, can_access_project, can_access_workspace, membership_cache)
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    # Every test database reuses the same ids
+    membership_cache.clear()
+    yield
+    membership_cache.clear()
+
+
+def test_project_members_added_or_removed_are_evicted(db, owner, member, project):
+    assert can_access_project(db, project.id, member.id) is False
+
+    project.members.append(member)
+    db.commit()
+    assert can_access_project(db, project.id, member.id) is True
+
+    # Removed from the user's side of the relationship
+    member.projects.remove(project)
+    db.commit()
+    assert can_access_project(db, project.id, member.id) is False
+    assert accessible_projects(db, [project.id], member.id) == set()
+
+
+def test_owner_change_is_evicted(db, owner, member, project):
+    assert accessible_projects(db, [project.id], member.id) == set()
+    assert can_access_project(db, project.id, owner.id) is True
+
+    project.owner_id = member.id
+    db.commit()
+
+    assert can_access_project(db, project.id, member.id) is True
+    assert can_access_project(db, project.id, owner.id) is False
+
+
+def test_workspace_members_are_evicted(db, owner, member, project):
+    workspace = project.workspace
+    assert can_access_workspace(db, workspace.id, member.id) is False
+
+    member.workspaces.append(workspace)
+    db.commit()
+    assert can_access_workspace(db, workspace.id, member.id) is True
+
+    workspace.members.remove(member)
+    db.commit()
+    assert can_access_workspace(db, workspace.id, member.id) is False
+
+
+def test_new_project_is_evicted(db, owner, member, project):
+    next_id = project.id + 1
+    assert can_access_project(db, next_id, member.id) is False
+
+    db.add(Project(name="New", workspace_id=project.workspace_id, owner_id=member.id))
+    db.commit()
+
+    assert can_access_project(db, next_id, member.id) is True
+
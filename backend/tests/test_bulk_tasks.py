@@ -0,0 +1,39 @@
+# backend/tests/test_bulk_tasks.py
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic_settings")
+
+from app.models.models import Task
+from app.services.bulk_tasks import DELETED, DUPLICATE, NOT_FOUND, UPDATED, bulk_delete, bulk_update
+
+
+@pytest.fixture
+def task(db, owner, project):
+    task = Task(title="Task", project_id=project.id, creator_id=owner.id)
+    db.add(task)
+    db.commit()
+    return task
+
+
+def test_bulk_delete_processes_first_occurrence_of_repeated_id(db, owner, task):
+    results, by_project = bulk_delete(db, owner.id, [task.id, task.id, 999])
+    db.commit()
+
+    assert results == [
+        {"id": task.id, "status": DELETED},
+        {"id": task.id, "status": DUPLICATE},
+        {"id": 999, "status": NOT_FOUND},
+    ]
+    assert by_project == {task.project_id: [task.id]}
+    db.refresh(task)
+    assert task.is_active is False
+
+
+def test_bulk_update_applies_first_entry_of_repeated_id(db, owner, task):
+    results, _ = bulk_update(db, owner.id, [{"id": task.id, "title": "First"}, {"id": task.id, "title": "Second"}])
+    db.commit()
+
+    assert [result["status"] for result in results] == [UPDATED, DUPLICATE]
+    db.refresh(task)
+    assert task.title == "First"
@@ -0,0 +1,122 @@
+# backend/tests/test_dependency_graph.py
+import asyncio
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic_settings")
+pytest.importorskip("aiosqlite")
+
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.models.models import Base, Project, Task, TaskDependency
+from app.services.dependency_graph import find_cycle_async, graph_cache, project_graph, validate_edges
+
+
+@pytest.fixture
+def db(tmp_path):
+    """File database, so find_cycle_async can read it through aiosqlite"""
+    path = tmp_path / "graph.db"
+    engine = create_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    session.info["async_url"] = f"sqlite+aiosqlite:///{path}"
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    # Every test database reuses the same ids
+    graph_cache.clear()
+    yield
+    graph_cache.clear()
+
+
+def _tasks(db, owner, project, count):
+    tasks = [Task(title=f"Task {i}", project_id=project.id, creator_id=owner.id) for i in range(count)]
+    db.add_all(tasks)
+    db.flush()
+    return [task.id for task in tasks]
+
+
+def _depend(db, *edges):
+    db.add_all([TaskDependency(predecessor_id=p, successor_id=s) for p, s in edges])
+    db.commit()
+
+
+def _find_cycle(db, edges, project_of):
+    async def run():
+        engine = create_async_engine(db.info["async_url"])
+        try:
+            async with AsyncSession(engine) as session:
+                return await find_cycle_async(session, edges, project_of)
+        finally:
+            await engine.dispose()
+
+    return asyncio.run(run())
+
+
+def test_validate_edges_flags_self_loops_and_duplicates():
+    edges = [(1, 1), (1, 2), (2, 3), (2, 3), (3, 4)]
+
+    assert validate_edges(edges, existing={(1, 2)}) == [
+        "A task cannot depend on itself",
+        "Dependency already exists",
+        None,
+        "Duplicate dependency in request",
+        None,
+    ]
+
+
+def test_find_cycle_closed_by_a_new_edge(db, owner, project):
+    a, b, c, d = _tasks(db, owner, project, 4)
+    _depend(db, (a, b), (b, c))
+    project_of = dict.fromkeys((a, b, c, d), project.id)
+
+    assert _find_cycle(db, [(c, d), (a, d)], project_of) is None
+    assert _find_cycle(db, [(c, a)], project_of) == [c, a, b, c]
+    # Closed only by two of the proposed edges together
+    assert _find_cycle(db, [(c, d), (d, a)], project_of) == [c, d, a, b, c]
+
+
+def test_find_cycle_follows_edges_into_other_projects(db, owner, project):
+    other = Project(name="Other", workspace_id=project.workspace_id, owner_id=owner.id)
+    db.add(other)
+    db.flush()
+    a, b = _tasks(db, owner, project, 2)
+    x, y = _tasks(db, owner, other, 2)
+    # x -> y touches only the other project, so is loaded once the search reaches x
+    _depend(db, (a, x), (x, y), (y, b))
+
+    assert _find_cycle(db, [(b, a)], {a: project.id, b: project.id}) == [b, a, x, y, b]
+
+
+def test_find_cycle_handles_chains_deeper_than_the_recursion_limit(db, owner, project):
+    ids = _tasks(db, owner, project, 1500)
+    _depend(db, *zip(ids, ids[1:]))
+
+    cycle = _find_cycle(db, [(ids[-1], ids[0])], dict.fromkeys(ids, project.id))
+
+    assert cycle == [ids[-1], *ids]
+
+
+def test_cached_graph_is_evicted_when_edges_change(db, owner, project):
+    a, b, c = _tasks(db, owner, project, 3)
+    _depend(db, (a, b))
+    assert project_graph(db, project.id).successors[a] == {b}
+    assert graph_cache.get(project.id) is not None
+
+    _depend(db, (b, c))
+
+    assert graph_cache.get(project.id) is None
+    assert project_graph(db, project.id).successors[b] == {c}
+
+    db.delete(db.query(TaskDependency).filter_by(predecessor_id=a).one())
+    db.commit()
+
+    assert graph_cache.get(project.id) is None
+    assert a not in project_graph(db, project.id).successors
@@ -0,0 +1,67 @@
+# backend/tests/test_pagination.py
+from datetime import datetime
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic_settings")
+
+from sqlalchemy import desc
+
+from app.db.pagination import InvalidCursor, paginate
+from app.models.models import Task, TimeEntry
+
+# As in main.py
+TASK_PAGE_KEYS = [Task.position, Task.created_at, Task.id]
+TIME_ENTRY_PAGE_KEYS = [desc(TimeEntry.date), desc(TimeEntry.id)]
+
+
+def _all_pages(query, keys, limit, max_pages=20):
+    ids, cursor, pages = [], None, 0
+    while pages < max_pages:  # a cursor that stops advancing must fail, not hang
+        items, cursor = paginate(query, keys, cursor, limit)
+        ids += [item.id for item in items]
+        pages += 1
+        if cursor is None:
+            break
+    return ids, pages
+
+
+def test_pages_rows_sharing_a_server_default_timestamp(db, owner, project):
+    # created_at comes from CURRENT_TIMESTAMP: whole seconds on SQLite
+    tasks = [Task(title=f"Task {i}", project_id=project.id, creator_id=owner.id) for i in range(10)]
+    db.add_all(tasks)
+    db.commit()
+
+    ids, pages = _all_pages(db.query(Task).filter(Task.project_id == project.id), TASK_PAGE_KEYS, 3)
+
+    assert ids == sorted(task.id for task in tasks)
+    assert pages == 4
+
+
+def test_pages_descending_keys_with_mixed_timestamp_precision(db, owner, project):
+    task = Task(title="Task", project_id=project.id, creator_id=owner.id)
+    db.add(task)
+    db.flush()
+    stamped = datetime(2024, 5, 1, 12, 0, 0)
+    entries = (
+        [TimeEntry(task_id=task.id, user_id=owner.id, hours=1) for _ in range(4)]  # server default
+        + [TimeEntry(task_id=task.id, user_id=owner.id, hours=1, date=stamped) for _ in range(3)]
+        + [TimeEntry(task_id=task.id, user_id=owner.id, hours=1, date=stamped.replace(microsecond=500)) for _ in range(2)]
+    )
+    db.add_all(entries)
+    db.commit()
+
+    ids, _ = _all_pages(db.query(TimeEntry), TIME_ENTRY_PAGE_KEYS, 2)
+
+    expected = sorted(entries, key=lambda entry: (entry.date, entry.id), reverse=True)
+    assert ids == [entry.id for entry in expected]
+
+
+def test_rejects_cursor_of_another_listing(db, owner, project):
+    db.add_all([Task(title=f"Task {i}", project_id=project.id, creator_id=owner.id) for i in range(3)])
+    db.commit()
+    _, cursor = paginate(db.query(Task), TASK_PAGE_KEYS, None, 1)
+
+    with pytest.raises(InvalidCursor):
+        paginate(db.query(TimeEntry), TIME_ENTRY_PAGE_KEYS, cursor, 1)
@@ -0,0 +1,101 @@
+# backend/tests/test_project_analytics.py
+from datetime import date, datetime, timedelta
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic_settings")
+
+from app.models.models import Project, Task, TaskPriority, TaskStatus, TimeEntry
+from app.services.project_analytics import COMPLETED, completion_timeline, get_coverage, project_metrics
+
+DONE = TaskStatus.DONE.value
+IN_PROGRESS = TaskStatus.IN_PROGRESS.value
+
+
+def _rollups(db, project_id):
+    # Completions are only read through the timeline, which is compared separately
+    metrics = project_metrics(db, project_id, None, None, get_coverage(db, project_id))
+    return {metric: value for metric, value in metrics.items() if value and metric != COMPLETED}
+
+
+def _live(db, project_id):
+    metrics = project_metrics(db, project_id, None, None, None)
+    return {metric: value for metric, value in metrics.items() if value}
+
+
+def _assert_rollups_match(db, *projects):
+    since = datetime.utcnow().date() - timedelta(days=30)
+    for project in projects:
+        assert get_coverage(db, project.id) == date.min
+        assert _rollups(db, project.id) == _live(db, project.id)
+        assert (completion_timeline(db, project.id, since, date.min)
+                == completion_timeline(db, project.id, since, None))
+
+
+@pytest.fixture
+def other_project(db, owner, project):
+    other = Project(name="Other", workspace_id=project.workspace_id, owner_id=owner.id)
+    db.add(other)
+    db.commit()
+    return other
+
+
+def test_rollups_follow_task_writes(db, owner, project, other_project):
+    first = Task(title="First", project_id=project.id, creator_id=owner.id)
+    second = Task(title="Second", project_id=project.id, creator_id=owner.id,
+                  status=IN_PROGRESS, priority=TaskPriority.HIGH.value)
+    third = Task(title="Third", project_id=project.id, creator_id=owner.id)
+    db.add_all([first, second, third])
+    db.commit()
+    _assert_rollups_match(db, project)
+    assert _rollups(db, project.id)["tasks"] == 3
+
+    # re-status, completion and priority
+    first.status = DONE
+    first.completed_at = datetime.utcnow() - timedelta(days=2)
+    second.priority = TaskPriority.LOW.value
+    db.commit()
+    _assert_rollups_match(db, project)
+    assert completion_timeline(db, project.id, date.min, date.min) == [(first.completed_at.date(), 1)]
+
+    # deactivate, move to another project, delete
+    second.is_active = False
+    third.project_id = other_project.id
+    db.commit()
+    _assert_rollups_match(db, project, other_project)
+    db.delete(first)
+    db.commit()
+    _assert_rollups_match(db, project, other_project)
+    assert _rollups(db, project.id) == {}
+
+
+def test_rollups_follow_time_entry_writes(db, owner, project, other_project):
+    task = Task(title="Task", project_id=project.id, creator_id=owner.id)
+    # Added together with its task, so without a task_id until the flush
+    task.time_entries.append(TimeEntry(user_id=owner.id, hours=1.5))
+    db.add(task)
+    db.commit()
+    other = Task(title="Other", project_id=other_project.id, creator_id=owner.id)
+    db.add(other)
+    db.flush()
+    entry = TimeEntry(task_id=task.id, user_id=owner.id, hours=2.25, date=datetime.utcnow() - timedelta(days=3))
+    db.add(entry)
+    db.commit()
+    _assert_rollups_match(db, project, other_project)
+    assert _rollups(db, project.id)["hours"] == 3.75
+
+    entry.hours = 4.0
+    entry.date = datetime.utcnow() - timedelta(days=5)
+    db.commit()
+    _assert_rollups_match(db, project, other_project)
+
+    entry.task_id = other.id
+    db.commit()
+    _assert_rollups_match(db, project, other_project)
+    assert _rollups(db, other_project.id)["hours"] == 4.0
+
+    db.delete(entry)
+    db.commit()
+    _assert_rollups_match(db, project, other_project)
+    assert _rollups(db, project.id)["time_entries"] == 1
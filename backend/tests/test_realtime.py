@@ -0,0 +1,64 @@
+# backend/tests/test_realtime.py
+import asyncio
+import logging
+
+import pytest
+
+pytest.importorskip("fastapi")
+redis = pytest.importorskip("redis.asyncio")
+
+from app.core.config import settings
+from app.services.realtime import RedisBackplane
+
+
+async def _backplanes(count: int):
+    """RedisBackplanes on fakeredis when installed, else on REDIS_URL; skips without either"""
+    try:
+        import fakeredis
+        import fakeredis.aioredis
+    except ImportError:
+        fakeredis = None
+    backplanes = [RedisBackplane(settings.REDIS_URL) for _ in range(count)]
+    if fakeredis is not None:
+        server = fakeredis.FakeServer()
+        for backplane in backplanes:
+            backplane._client = fakeredis.aioredis.FakeRedis(server=server)
+            backplane._pubsub = backplane._client.pubsub(ignore_subscribe_messages=True)
+        return backplanes
+    try:
+        await backplanes[0]._client.ping()
+    except Exception:
+        pytest.skip("Neither fakeredis nor a Redis server at REDIS_URL is available")
+    return backplanes
+
+
+def test_redis_backplane_idles_quietly_without_subscribers(caplog):
+    async def scenario():
+        backplane, other = await _backplanes(2)
+        delivered = []
+
+        async def deliver(room, data):
+            delivered.append((room, data))
+
+        async def ignore(room, data):
+            pass
+
+        await backplane.start(deliver)
+        await other.start(ignore)
+        try:
+            await asyncio.sleep(2.5)  # a few get_message timeouts with no rooms subscribed
+            await backplane.subscribe("project_1")
+            await asyncio.sleep(0.2)
+            await other.publish("project_1", "from other")
+            await backplane.publish("project_1", "own message")
+            await asyncio.sleep(1.5)
+        finally:
+            await backplane.stop()
+            await other.stop()
+        return delivered
+
+    with caplog.at_level(logging.ERROR, logger="app.services.realtime"):
+        delivered = asyncio.run(scenario())
+
+    assert delivered == [("project_1", "from other")]
+    assert not [record for record in caplog.records if "receive failed" in record.getMessage()]
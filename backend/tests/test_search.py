@@ -0,0 +1,30 @@
+# backend/tests/test_search.py
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic_settings")
+
+from sqlalchemy import text
+
+from app.services.search import LikeSearch, SqliteSearch, init_search
+
+
+def _fts_tables(engine):
+    with engine.connect() as connection:
+        return connection.execute(text("SELECT name FROM sqlite_master WHERE name LIKE '%_fts'")).scalars().all()
+
+
+def test_init_search_falls_back_without_creating_the_index(db):
+    engine = db.get_bind()
+
+    assert isinstance(init_search(engine), LikeSearch)
+    assert _fts_tables(engine) == []
+
+
+def test_init_search_selects_the_index_created_by_the_migration(db):
+    engine = db.get_bind()
+    with engine.begin() as connection:
+        if not SqliteSearch().install(connection):
+            pytest.skip("This SQLite build has no FTS5")
+
+    assert isinstance(init_search(engine), SqliteSearch)
@@ -0,0 +1,62 @@
+# backend/tests/test_security.py
+import asyncio
+import threading
+
+import pytest
+
+pytest.importorskip("jose")
+pytest.importorskip("passlib")
+pytest.importorskip("pydantic_settings")
+
+from app.core.security import HashingPoolFull, PasswordHashingPool
+
+
+@pytest.mark.parametrize("durations, p95_ms", [
+    ([i / 1000 for i in range(1, 101)], 95.0),   # nearest rank 95 of 100
+    ([i / 1000 for i in range(1, 21)], 19.0),    # nearest rank 19 of 20
+    ([0.001, 0.001, 0.001, 0.1], 100.0),         # small sample: the outlier, never below the mean
+    ([0.005], 5.0),
+])
+def test_stats_p95_uses_nearest_rank(durations, p95_ms):
+    pool = PasswordHashingPool(max_workers=1, max_queue=1)
+    try:
+        pool._durations.extend(reversed(durations))
+        stats = pool.stats()
+    finally:
+        pool.shutdown()
+    assert stats["p95_ms"] == p95_ms
+    assert stats["p95_ms"] >= stats["avg_ms"]
+
+
+def test_cancelled_waiters_keep_running_jobs_counted():
+    pool = PasswordHashingPool(max_workers=1, max_queue=1)
+    release = threading.Event()
+
+    async def scenario():
+        running = asyncio.ensure_future(pool.run(release.wait))
+        queued = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.1)
+        # The client gives up on both logins; only the queued job can be withdrawn
+        running.cancel()
+        queued.cancel()
+        await asyncio.sleep(0.1)
+        stats = pool.stats()
+
+        accepted = asyncio.ensure_future(pool.run(release.wait))
+        await asyncio.sleep(0.1)
+        with pytest.raises(HashingPoolFull):
+            await asyncio.wait_for(pool.run(release.wait), timeout=1)
+
+        release.set()
+        await accepted
+        return stats
+
+    try:
+        stats = asyncio.run(scenario())
+    finally:
+        release.set()
+        pool.shutdown()
+
+    assert stats["running"] == 1
+    assert stats["queued"] == 0
+    assert pool.stats()["rejected"] == 1
@@ -0,0 +1,90 @@
+# backend/tests/test_task_hours.py
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic_settings")
+
+from sqlalchemy import func, select, update
+
+from app.models.models import Task, TimeEntry
+from app.services.task_hours import find_drift, reconcile_task_hours
+
+
+def _logged(db, task):
+    return db.execute(select(func.coalesce(func.sum(TimeEntry.hours), 0)).where(TimeEntry.task_id == task.id)).scalar()
+
+
+def _assert_hours_match(db, *tasks):
+    for task in tasks:
+        db.refresh(task)
+        assert task.actual_hours == pytest.approx(_logged(db, task))
+
+
+@pytest.fixture
+def tasks(db, owner, project):
+    tasks = [Task(title=f"Task {i}", project_id=project.id, creator_id=owner.id) for i in range(2)]
+    db.add_all(tasks)
+    db.commit()
+    return tasks
+
+
+def test_actual_hours_follow_time_entry_writes(db, owner, project, tasks):
+    first, second = tasks
+    entries = [TimeEntry(task_id=first.id, user_id=owner.id, hours=hours) for hours in (1.5, 2.0)]
+    db.add_all(entries)
+    db.commit()
+    _assert_hours_match(db, first, second)
+    assert first.actual_hours == 3.5
+
+    entries[0].hours = 0.5
+    db.commit()
+    _assert_hours_match(db, first, second)
+
+    entries[1].task_id = second.id
+    db.commit()
+    _assert_hours_match(db, first, second)
+    assert second.actual_hours == 2.0
+
+    db.delete(entries[1])
+    db.commit()
+    _assert_hours_match(db, first, second)
+    assert second.actual_hours == 0
+
+
+def test_entry_added_with_its_task_counts_towards_it(db, owner, project):
+    task = Task(title="Task", project_id=project.id, creator_id=owner.id)
+    task.time_entries.append(TimeEntry(user_id=owner.id, hours=3.0))
+    db.add(task)
+    db.commit()
+
+    _assert_hours_match(db, task)
+    assert task.actual_hours == 3.0
+
+
+def test_loaded_task_sees_new_total_without_reload(db, owner, tasks):
+    task = tasks[0]
+    db.add(TimeEntry(task_id=task.id, user_id=owner.id, hours=1.25))
+    db.flush()
+
+    assert "actual_hours" in task.__dict__
+    assert task.actual_hours == 1.25
+
+
+def test_reconcile_repairs_set_based_writes(db, owner, tasks):
+    first, second = tasks
+    db.add_all([TimeEntry(task_id=task.id, user_id=owner.id, hours=1.0) for task in tasks])
+    db.commit()
+    # Bypasses the flush events
+    db.execute(update(TimeEntry).where(TimeEntry.task_id == first.id).values(hours=4.0))
+    db.commit()
+    engine = db.get_bind()
+
+    with engine.connect() as connection:
+        assert find_drift(connection) == [(first.id, 1.0, 4.0)]
+    assert reconcile_task_hours(engine, dry_run=True) == [(first.id, 1.0, 4.0)]
+    db.refresh(first)
+    assert first.actual_hours == 1.0
+
+    assert reconcile_task_hours(engine) == [(first.id, 1.0, 4.0)]
+    _assert_hours_match(db, first, second)
+    assert reconcile_task_hours(engine) == []
@@ -0,0 +1,106 @@
+# backend/tests/test_task_readiness.py
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic_settings")
+
+from app.models.models import Project, Task, TaskDependency, TaskStatus
+from app.services.dependency_graph import graph_cache
+from app.services.task_readiness import blocker_chain, get_readiness, readiness_cache
+
+DONE = TaskStatus.DONE.value
+
+
+@pytest.fixture(autouse=True)
+def empty_caches():
+    # Every test database reuses the same ids
+    graph_cache.clear()
+    readiness_cache.clear()
+    yield
+    graph_cache.clear()
+    readiness_cache.clear()
+
+
+@pytest.fixture
+def chain(db, owner, project):
+    """a -> b -> c, and d on its own"""
+    tasks = [Task(title=title, project_id=project.id, creator_id=owner.id) for title in "abcd"]
+    db.add_all(tasks)
+    db.flush()
+    a, b, c, _ = tasks
+    db.add_all([TaskDependency(predecessor_id=a.id, successor_id=b.id),
+                TaskDependency(predecessor_id=b.id, successor_id=c.id)])
+    db.commit()
+    return tasks
+
+
+def _ready(readiness):
+    return [task["id"] for task in readiness.ready]
+
+
+def _blocked(readiness):
+    return {task["id"]: task["blocked_by"] for task in readiness.blocked}
+
+
+def test_readiness_follows_task_changes(db, project, chain):
+    a, b, c, d = chain
+    readiness = get_readiness(db, project.id)
+    assert _ready(readiness) == [a.id, d.id]
+    assert _blocked(readiness) == {b.id: [a.id], c.id: [b.id]}
+    assert get_readiness(db, project.id) is readiness
+
+    a.status = DONE
+    db.commit()
+    readiness = get_readiness(db, project.id)
+    assert _ready(readiness) == [b.id, d.id]
+    assert _blocked(readiness) == {c.id: [b.id]}
+
+    # An inactive predecessor blocks nothing, nor is it ready itself
+    b.is_active = False
+    db.commit()
+    assert _ready(get_readiness(db, project.id)) == [c.id, d.id]
+
+
+def test_readiness_is_evicted_when_dependencies_change(db, project, chain):
+    a, b, c, d = chain
+    get_readiness(db, project.id)
+
+    db.add(TaskDependency(predecessor_id=d.id, successor_id=a.id))
+    db.commit()
+
+    assert _blocked(get_readiness(db, project.id)) == {a.id: [d.id], b.id: [a.id], c.id: [b.id]}
+
+
+def test_predecessor_in_another_project_blocks_and_evicts(db, owner, project, chain):
+    a = chain[0]
+    other = Project(name="Other", workspace_id=project.workspace_id, owner_id=owner.id)
+    db.add(other)
+    db.flush()
+    outside = Task(title="outside", project_id=other.id, creator_id=owner.id)
+    db.add(outside)
+    db.flush()
+    db.add(TaskDependency(predecessor_id=outside.id, successor_id=a.id))
+    db.commit()
+    assert _blocked(get_readiness(db, project.id))[a.id] == [outside.id]
+
+    # Only the other project's task changes; the cached answer used it
+    outside.status = DONE
+    db.commit()
+
+    assert a.id in _ready(get_readiness(db, project.id))
+
+
+def test_blocker_chain_stops_at_finished_tasks(db, chain):
+    a, b, c, _ = chain
+
+    chain_of_c = blocker_chain(db, c)
+    assert chain_of_c["is_blocked"] is True
+    assert [(blocker["id"], blocker["depth"], blocker["blocked_by"]) for blocker in chain_of_c["blockers"]] == [
+        (b.id, 1, [a.id]),
+        (a.id, 2, []),
+    ]
+
+    b.status = DONE
+    db.commit()
+    assert blocker_chain(db, c) == {"task_id": c.id, "is_blocked": False, "blockers": []}
+    assert [blocker["id"] for blocker in blocker_chain(db, b)["blockers"]] == [a.id]
@@ -0,0 +1,82 @@
+# backend/tests/test_task_summary.py
+import pytest
+
+pytest.importorskip("sqlalchemy")
+pytest.importorskip("pydantic_settings")
+
+from sqlalchemy import select
+
+from app.models.models import Task, TaskStatus, UserTaskSummary
+from app.services.task_summary import get_task_summary, task_summary_query
+
+DONE = TaskStatus.DONE.value
+IN_PROGRESS = TaskStatus.IN_PROGRESS.value
+TODO = TaskStatus.TODO.value
+
+
+def _stored(db, user):
+    return tuple(db.execute(select(
+        UserTaskSummary.total_tasks, UserTaskSummary.completed_tasks, UserTaskSummary.in_progress_tasks
+    ).where(UserTaskSummary.user_id == user.id)).one())
+
+
+def _live(db, user):
+    return tuple(db.execute(task_summary_query(user.id)).one()[:3])
+
+
+def _assert_counters_match(db, *users):
+    for user in users:
+        assert _stored(db, user) == _live(db, user)
+
+
+def test_counters_follow_task_writes(db, owner, member, project):
+    get_task_summary(db, owner.id)  # owner has a row from the start, member is seeded by the first flush
+    first = Task(title="First", project_id=project.id, creator_id=owner.id)
+    second = Task(title="Second", project_id=project.id, creator_id=owner.id, status=IN_PROGRESS, assignees=[member])
+    third = Task(title="Third", project_id=project.id, creator_id=owner.id, status=DONE)
+    db.add_all([first, second, third])
+    db.commit()
+    _assert_counters_match(db, owner, member)
+    assert _stored(db, owner) == (3, 1, 1)
+    assert _stored(db, member) == (1, 0, 1)
+
+    # re-status
+    first.status = DONE
+    third.status = TODO
+    db.commit()
+    _assert_counters_match(db, owner, member)
+
+    # reassign, through the loaded collection and through the creator alone
+    second.assignees = [owner]
+    first.assignees.append(member)
+    third.creator_id = member.id
+    db.commit()
+    _assert_counters_match(db, owner, member)
+    assert _stored(db, member) == (2, 1, 0)
+
+    # deactivate, reactivate and delete
+    second.is_active = False
+    db.commit()
+    _assert_counters_match(db, owner, member)
+    second.is_active = True
+    second.status = DONE
+    db.commit()
+    _assert_counters_match(db, owner, member)
+    db.delete(third)
+    db.commit()
+    _assert_counters_match(db, owner, member)
+    assert _stored(db, owner) == (2, 2, 0)
+
+
+def test_rolled_back_flush_leaves_counters_alone(db, owner, project):
+    db.add(Task(title="Kept", project_id=project.id, creator_id=owner.id))
+    db.commit()
+
+    db.add(Task(title="Dropped", project_id=project.id, creator_id=owner.id, status=DONE))
+    db.flush()
+    db.rollback()
+    db.add(Task(title="Next", project_id=project.id, creator_id=owner.id))
+    db.commit()
+
+    _assert_counters_match(db, owner)
+    assert _stored(db, owner) == (2, 0, 0)
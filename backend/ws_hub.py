@@ -0,0 +1,37 @@
+# backend/ws_hub.py
+"""
+Run the Unix socket hub for WS_BACKPLANE=socket.
+
+Lets several workers on one host share WebSocket rooms without Redis, e.g.
+for local multi-worker runs and tests. Start it before the workers:
+
+    python ws_hub.py
+    WS_BACKPLANE=socket uvicorn app.main:app --workers 4
+"""
+
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import logging
+from app.core.config import settings
+from app.services.realtime import SocketHub
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+async def run_hub(path):
+    hub = SocketHub(path)
+    await hub.start()
+    logger.info(f"WebSocket backplane hub listening on {path}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await hub.stop()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(run_hub(settings.WS_BACKPLANE_SOCKET))
+    except KeyboardInterrupt:
+        pass
@@ -128,6 +128,16 @@ export function useRealTimeUpdates(projectId, onTaskUpdate) {
         if (onTaskUpdate) onTaskUpdate('updated', data);
         break;
       
+      case 'tasks_created':
+        addNotification(`${data.task_ids.length} tasks created`, 'info');
+        if (onTaskUpdate) onTaskUpdate('bulk_created', data);
+        break;
+      
+      case 'tasks_changed':
+        // Several updates merged server-side; refetch each listed task once
+        if (onTaskUpdate) onTaskUpdate('changed', data);
+        break;
+      
       case 'task_moved':
         addNotification('Task moved', 'info');
         if (onTaskUpdate) onTaskUpdate('moved', data);
@@ -143,6 +153,16 @@ export function useRealTimeUpdates(projectId, onTaskUpdate) {
         if (onTaskUpdate) onTaskUpdate('deleted', data);
         break;
       
+      case 'tasks_deleted':
+        addNotification(`${data.task_ids.length} tasks deleted`, 'info');
+        if (onTaskUpdate) onTaskUpdate('bulk_deleted', data);
+        break;
+      
+      case 'resync':
+        // Updates were dropped while this client lagged behind; refetch everything
+        if (onTaskUpdate) onTaskUpdate('resync', data);
+        break;
+      
       default:
         console.log('Unknown message type:', type);
     }
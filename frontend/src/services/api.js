@@ -36,6 +36,18 @@ apiClient.interceptors.response.use(
   }
 );
 
+// Follow next_cursor until a paginated listing is exhausted
+async function fetchAllPages(url, params = {}) {
+  const items = [];
+  let cursor = null;
+  do {
+    const response = await apiClient.get(url, { params: cursor ? { ...params, cursor } : params });
+    items.push(...response.data.items);
+    cursor = response.data.next_cursor;
+  } while (cursor);
+  return items;
+}
+
 const apiService = {
   // Auth methods
   async login(email, password) {
@@ -105,7 +117,12 @@ const apiService = {
   },
 
   async getTasks(filters = {}) {
-    const response = await apiClient.get('/api/v1/tasks/', { params: filters });
+    return fetchAllPages('/api/v1/tasks/', filters);
+  },
+
+  async getTasksPage(filters = {}, cursor = null) {
+    const params = cursor ? { ...filters, cursor } : filters;
+    const response = await apiClient.get('/api/v1/tasks/', { params });
     return response.data;
   },
 
@@ -139,8 +156,7 @@ const apiService = {
   },
 
   async getTimeEntries(filters = {}) {
-    const response = await apiClient.get('/api/v1/time-entries/', { params: filters });
-    return response.data;
+    return fetchAllPages('/api/v1/time-entries/', filters);
   },
 
   // Comment methods
@@ -150,10 +166,7 @@ const apiService = {
   },
 
   async getComments(taskId) {
-    const response = await apiClient.get('/api/v1/comments/', {
-      params: { task_id: taskId },
-    });
-    return response.data;
+    return fetchAllPages('/api/v1/comments/', { task_id: taskId });
   },
 
   // Notification methods
@@ -194,10 +207,30 @@ const apiService = {
   },
 
   async getAttachments(taskId) {
-    const response = await apiClient.get(`/api/v1/tasks/${taskId}/attachments/`);
+    return fetchAllPages(`/api/v1/tasks/${taskId}/attachments/`);
+  },
+
+  async downloadAttachment(attachmentId) {
+    const response = await apiClient.get(`/api/v1/attachments/${attachmentId}/download`, {
+      responseType: 'blob',
+    });
     return response.data;
   },
 
+  // Resolves to null while the thumbnail is still being rendered
+  async getAttachmentThumbnail(attachmentId, size = 256) {
+    try {
+      const response = await apiClient.get(`/api/v1/attachments/${attachmentId}/thumbnail`, {
+        params: { size },
+        responseType: 'blob',
+      });
+      return response.data;
+    } catch (error) {
+      if (error.response?.status === 404) return null;
+      throw error;
+    }
+  },
+
   // User settings
   async updateUser(userData) {
     const response = await apiClient.put('/api/v1/users/me', userData);